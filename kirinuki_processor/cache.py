@@ -0,0 +1,97 @@
+"""
+Whisper字幕のキャッシュ
+
+切り抜き動画の内容（バイト列）とモデル設定からフィンガープリントを作り、
+生成済みのSRTを ~/.cache/kirinuki/whisper/{fingerprint}.srt に保存する。
+タイトルやチャット設定だけを変えて prepare をやり直した場合など、
+同じ音声に対するWhisperの再実行を省略できる。
+"""
+
+import hashlib
+import os
+import shutil
+from typing import Optional
+
+
+WHISPER_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "kirinuki", "whisper")
+
+# ファイルを読み込む単位（1 MiB）
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _whisper_backend_version() -> str:
+    """使用中のWhisperバックエンドとバージョンを返す（キャッシュキー用）"""
+    from importlib import metadata
+
+    for package in ("faster-whisper", "openai-whisper"):
+        try:
+            return f"{package}-{metadata.version(package)}"
+        except metadata.PackageNotFoundError:
+            continue
+    return "unknown"
+
+
+def audio_fingerprint(path: str, model_size: str, language: str, settings: str = "") -> str:
+    """
+    動画ファイルの内容と文字起こし設定からフィンガープリントを計算
+
+    Args:
+        path: 動画（音声）ファイルのパス
+        model_size: Whisperモデルのサイズ
+        language: 言語コード
+        settings: その他の文字起こし設定（transcription_settings_key() の戻り値）
+
+    Returns:
+        16進数のフィンガープリント文字列
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            h.update(chunk)
+    h.update(f"|{model_size}|{language}|{_whisper_backend_version()}|{settings}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def cached_transcript_path(fingerprint: str) -> str:
+    """フィンガープリントに対応するキャッシュSRTのパスを返す"""
+    return os.path.join(WHISPER_CACHE_DIR, f"{fingerprint}.srt")
+
+
+def load_cached_transcript(fingerprint: str, output_path: str) -> bool:
+    """
+    キャッシュ済みのSRTがあれば出力先にコピー
+
+    Args:
+        fingerprint: audio_fingerprint() の戻り値
+        output_path: コピー先のSRTパス
+
+    Returns:
+        bool: キャッシュが見つかりコピーできたかどうか
+    """
+    cached = cached_transcript_path(fingerprint)
+    if not os.path.exists(cached):
+        return False
+    # copyfileはLinuxではsendfileでカーネル内コピーになる（パーミッションのコピーは不要）
+    shutil.copyfile(cached, output_path)
+    return True
+
+
+def store_transcript(fingerprint: str, srt_path: str) -> Optional[str]:
+    """
+    生成したSRTをキャッシュに保存
+
+    Args:
+        fingerprint: audio_fingerprint() の戻り値
+        srt_path: 保存するSRTのパス
+
+    Returns:
+        保存先のパス。保存に失敗した場合はNone
+    """
+    try:
+        os.makedirs(WHISPER_CACHE_DIR, exist_ok=True)
+        cached = cached_transcript_path(fingerprint)
+        shutil.copyfile(srt_path, cached)
+        return cached
+    except OSError as e:
+        print(f"  Warning: Failed to store transcript cache: {e}")
+        return None
@@ -15,6 +15,13 @@ DEFAULT_CROP_CRF = 30
 # VP9ビットレート設定（0はVBRモード、CRFを優先）
 DEFAULT_CROP_BITRATE = 0
 
+# VP9エンコード速度
+# クロップ後の動画は合成時にもう一度エンコードされるため、realtime（cpu-used=8）のような
+# 低画質設定にすると劣化が最終出力まで残る。deadline=good と cpu-used=4 で画質を保ちつつ、
+# row-mt（行単位のマルチスレッド）と合わせて既定（cpu-used=1）より速くする
+DEFAULT_CROP_DEADLINE = "good"
+DEFAULT_CROP_CPU_USED = 4
+
 # 動画長さ取得失敗時のフォールバック値（秒）
 DEFAULT_VIDEO_DURATION_FALLBACK = 90
 
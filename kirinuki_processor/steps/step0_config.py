@@ -9,9 +9,11 @@
 """
 
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 
 @dataclass
@@ -25,6 +27,7 @@ class ClipConfig:
     output_dir: str = "data/output"
     temp_dir: str = "data/temp"
     auto_download: bool = True  # 動画を自動ダウンロードするか
+    segment_mode: bool = True  # 切り抜き区間のセグメントだけをダウンロードするか
     crop_top_percent: float = 0.0
     crop_bottom_percent: float = 0.0
     crop_left_percent: float = 0.0
@@ -33,6 +36,7 @@ class ClipConfig:
     chat_dedup_window_seconds: float = 0.0  # 同一コメント連投を除外する時間窓（秒）
     chat_dedup_by_author: bool = False  # 投稿者も考慮して重複判定するか
     subtitle_style: str = "normal"  # 字幕スタイル（normal|bold）
+    whisper_model: Optional[str] = None  # Whisperモデルサイズ（未指定ならGPUメモリに合わせて自動選択）
     next_config: Optional[str] = None  # 次の設定ファイルパス（連鎖処理用）
 
     def validate(self) -> None:
@@ -61,6 +65,109 @@ class ClipConfig:
             )
 
 
+# TEMP_DIR=auto で使うRAMディスク上のディレクトリと、使用に必要な空きメモリ
+_TMPFS_TEMP_DIR = "/dev/shm/kirinuki"
+_TMPFS_MIN_AVAILABLE = 4 * 1024 ** 3
+_DEFAULT_TEMP_DIR = "data/temp"
+
+
+def _available_memory() -> int:
+    """利用可能な物理メモリ（バイト）を返す。取得できない場合は0"""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+def _pick_temp_dir(temp_dir: str) -> str:
+    """
+    TEMP_DIR=auto の場合に一時ディレクトリを決める
+
+    Linuxで空きメモリが十分ならtmpfs（/dev/shm）を使い、中間ファイルの読み書きをメモリ上で行う。
+    prepare と compose は別プロセスで実行されるため、既にtmpfs側にディレクトリがあれば
+    空きメモリに関係なくそちらを使い続ける。
+
+    Args:
+        temp_dir: 設定ファイルのTEMP_DIR
+
+    Returns:
+        実際に使う一時ディレクトリ
+    """
+    if temp_dir != "auto":
+        return temp_dir
+    if sys.platform != "linux" or not os.path.isdir("/dev/shm"):
+        return _DEFAULT_TEMP_DIR
+    if os.path.isdir(_TMPFS_TEMP_DIR) or _available_memory() > _TMPFS_MIN_AVAILABLE:
+        return _TMPFS_TEMP_DIR
+    return _DEFAULT_TEMP_DIR
+
+
+@dataclass(frozen=True)
+class PipelinePaths:
+    """1クリップ分の中間ファイルのパス（一時ディレクトリ内）"""
+    clip_video: str
+    clip_video_raw: str
+    subs_clip: str
+    subs_clip_ass: str
+    chat_full: str
+    chat_clip: str
+    chat_overlay: str
+
+    @classmethod
+    def from_config(cls, config: ClipConfig, clip_index: int = 0) -> "PipelinePaths":
+        """
+        設定とクリップ番号からパスを組み立てる（同じ組み合わせは使い回す）
+
+        Args:
+            config: 切り抜き設定
+            clip_index: クリップ番号（0始まり、2つ目以降は "_1" などの接尾辞が付く）
+
+        Returns:
+            PipelinePaths
+        """
+        return _pipeline_paths(config.temp_dir, clip_index)
+
+
+@lru_cache(maxsize=16)
+def _pipeline_paths(temp_dir: str, clip_index: int) -> PipelinePaths:
+    suffix = "" if clip_index == 0 else f"_{clip_index}"
+    return PipelinePaths(
+        clip_video=os.path.join(temp_dir, f"clip{suffix}.webm"),
+        clip_video_raw=os.path.join(temp_dir, f"clip{suffix}_raw.webm"),
+        subs_clip=os.path.join(temp_dir, f"subs_clip{suffix}.srt"),
+        subs_clip_ass=os.path.join(temp_dir, f"subs_clip{suffix}.ass"),
+        chat_full=os.path.join(temp_dir, f"chat_full{suffix}.json"),
+        chat_clip=os.path.join(temp_dir, f"chat_clip{suffix}.json"),
+        chat_overlay=os.path.join(temp_dir, f"chat_overlay{suffix}.ass"),
+    )
+
+
+def load_config_cached(config_path: str) -> ClipConfig:
+    """
+    設定ファイルを読み込む（更新されていなければ前回の結果を再利用）
+
+    Args:
+        config_path: 設定ファイルのパス
+
+    Returns:
+        ClipConfig: 読み込んだ設定（呼び出し側で変更しても影響しないようコピーを返す）
+
+    Raises:
+        FileNotFoundError: 設定ファイルが見つからない
+        ValueError: 設定が不正
+    """
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+    return replace(_load_config_mt(config_path, st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=4)
+def _load_config_mt(config_path: str, mtime_ns: int, size: int) -> ClipConfig:
+    return load_config_from_file(config_path)
+
+
 def load_config_from_file(config_path: str) -> ClipConfig:
     """
     設定ファイルから設定を読み込む
@@ -86,31 +193,33 @@ def load_config_from_file(config_path: str) -> ClipConfig:
 
     config_dict: Dict[str, str] = {}
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
+    with open(config_path, "rb") as f:
+        data = f.read().decode("utf-8")
 
-            # 空行やコメント行をスキップ
-            if not line or line.startswith("#"):
-                continue
+    for line_num, line in enumerate(data.splitlines(), 1):
+        line = line.strip()
 
-            # key=value 形式で分割
-            if "=" not in line:
-                raise ValueError(
-                    f"Invalid format at line {line_num}: {line}. "
-                    "Expected 'KEY=VALUE' format"
-                )
+        # 空行やコメント行をスキップ
+        if not line or line[0] == "#":
+            continue
 
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip()
+        # key=value 形式で分割（partitionで1回だけ走査する）
+        key, sep, value = line.partition("=")
+        if not sep:
+            raise ValueError(
+                f"Invalid format at line {line_num}: {line}. "
+                "Expected 'KEY=VALUE' format"
+            )
+
+        key = key.strip()
+        value = value.strip()
 
-            if not key or not value:
-                raise ValueError(
-                    f"Empty key or value at line {line_num}: {line}"
-                )
+        if not key or not value:
+            raise ValueError(
+                f"Empty key or value at line {line_num}: {line}"
+            )
 
-            config_dict[key] = value
+        config_dict[key] = value
 
     # 必須項目のチェック（WEBM_PATHは任意に変更）
     required_keys = ["VIDEO_URL", "START_TIME"]
@@ -123,6 +232,11 @@ def load_config_from_file(config_path: str) -> ClipConfig:
     if "AUTO_DOWNLOAD" in config_dict:
         auto_download = config_dict["AUTO_DOWNLOAD"].lower() in ["true", "yes", "1"]
 
+    # SEGMENT_MODEのパース
+    segment_mode = True
+    if "SEGMENT_MODE" in config_dict:
+        segment_mode = config_dict["SEGMENT_MODE"].lower() in ["true", "yes", "1"]
+
     # クロップ値を取得（単一指定CROP_PERCENTがあれば優先）
     crop_top = float(config_dict.get("CROP_TOP_PERCENT", 0.0))
     crop_bottom = float(config_dict.get("CROP_BOTTOM_PERCENT", 0.0))
@@ -146,6 +260,11 @@ def load_config_from_file(config_path: str) -> ClipConfig:
     if subtitle_style not in ("normal", "bold"):
         raise ValueError("SUBTITLE_STYLE must be 'normal' or 'bold'")
 
+    # Whisperモデルサイズを取得
+    whisper_model = config_dict.get("WHISPER_MODEL")
+    if whisper_model and whisper_model.lower() == "auto":
+        whisper_model = None
+
     # 次の設定ファイルパスを取得
     next_config = config_dict.get("NEXT_CONFIG")
 
@@ -157,8 +276,9 @@ def load_config_from_file(config_path: str) -> ClipConfig:
         title=config_dict.get("TITLE"),  # 任意
         webm_path=config_dict.get("WEBM_PATH"),  # 任意
         output_dir=config_dict.get("OUTPUT_DIR", "data/output"),
-        temp_dir=config_dict.get("TEMP_DIR", "data/temp"),
+        temp_dir=_pick_temp_dir(config_dict.get("TEMP_DIR", _DEFAULT_TEMP_DIR)),
         auto_download=auto_download,
+        segment_mode=segment_mode,
         crop_top_percent=crop_top,
         crop_bottom_percent=crop_bottom,
         crop_left_percent=crop_left,
@@ -167,6 +287,7 @@ def load_config_from_file(config_path: str) -> ClipConfig:
         chat_dedup_window_seconds=chat_dedup_window,
         chat_dedup_by_author=chat_dedup_by_author,
         subtitle_style=subtitle_style,
+        whisper_model=whisper_model,
         next_config=next_config,
     )
 
@@ -203,6 +324,10 @@ END_TIME=00:10:45
 # false の場合、WEBM_PATH で指定した既存ファイルを使用します
 AUTO_DOWNLOAD=true
 
+# 切り抜き区間のセグメントだけをダウンロードするか（任意、デフォルト: true）
+# false の場合は動画全体をダウンロードしてから切り抜きます（時間はかかるがより確実）
+# SEGMENT_MODE=true
+
 # 切り抜き済みwebmファイルのパス（任意、AUTO_DOWNLOAD=false の場合に必要）
 # AUTO_DOWNLOAD=true の場合、この設定は無視されます
 # WEBM_PATH=data/input/clip.webm
@@ -211,6 +336,7 @@ AUTO_DOWNLOAD=true
 OUTPUT_DIR=data/output
 
 # 一時ファイル用ディレクトリ（任意、デフォルト: data/temp）
+# auto にするとLinuxで空きメモリが4GB以上ある場合に /dev/shm/kirinuki（RAMディスク）を使います
 TEMP_DIR=data/temp
 
 # 画面の周囲を上下左右それぞれパーセンテージでクロップ（任意）
@@ -235,6 +361,10 @@ CHAT_DEDUP_BY_AUTHOR=true
 # 字幕スタイル（normal または bold）
 # SUBTITLE_STYLE=normal
 
+# Whisperモデルサイズ（tiny, base, small, medium, large）
+# 未指定（auto）の場合はGPUメモリに合わせて自動選択します（GPUなし: medium）
+# WHISPER_MODEL=large
+
 # 次の設定ファイル（任意、複数の切り抜きを連結する場合に指定）
 # 指定した場合、このクリップの後に次の設定ファイルで定義されたクリップが連結されます
 # 次の設定ファイルにもNEXT_CONFIGを指定することで、さらに連鎖できます
@@ -5,10 +5,12 @@ YouTube動画IDと時刻を指定して、該当区間を直接ダウンロー
 KirinukiDBは不要。
 """
 
+import glob
 import os
 import subprocess
 from typing import Optional, Tuple
 from pathlib import Path
+from kirinuki_processor.utils.fs_utils import ensure_parent_dir, remove_if_exists
 
 
 def download_and_clip_video(
@@ -34,9 +36,7 @@ def download_and_clip_video(
         bool: 成功したかどうか
     """
     # 出力ディレクトリを作成
-    output_dir = os.path.dirname(output_path)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+    ensure_parent_dir(output_path)
 
     print(f"Downloading and clipping video...")
     print(f"  URL: {video_url}")
@@ -66,6 +66,40 @@ def download_and_clip_video(
         )
 
 
+def _mux_pieces(pieces: list, output_path: str) -> bool:
+    """
+    yt-dlpが結合せずに残したフォーマット別のファイル（映像・音声）を1ファイルにまとめる
+
+    Args:
+        pieces: 分割されたファイルのパスのリスト
+        output_path: 出力パス
+
+    Returns:
+        成功したかどうか
+    """
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error"]
+    for piece in pieces:
+        cmd.extend(["-i", piece])
+    for i in range(len(pieces)):
+        cmd.extend(["-map", str(i)])
+    cmd.extend(["-c", "copy", output_path])
+
+    try:
+        subprocess.run(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"  ✗ Failed to merge downloaded pieces: {e.stderr.decode(errors='replace') if e.stderr else str(e)}")
+        return False
+
+    for piece in pieces:
+        try:
+            os.remove(piece)
+        except OSError:
+            pass
+    return True
+
+
 def _download_full_then_clip(
     video_url: str,
     start_time: str,
@@ -122,8 +156,7 @@ def _download_full_then_clip(
 
     finally:
         # 一時ファイルを削除
-        if os.path.exists(temp_video):
-            os.remove(temp_video)
+        remove_if_exists(temp_video)
         try:
             os.rmdir(temp_dir)
         except:
@@ -164,6 +197,7 @@ def _download_with_sections(
         output_path,
         f"{base_path}.webm",
         f"{base_path}.mp4",
+        f"{base_path}.mkv",
     ]
     for file_path in possible_files:
         if os.path.exists(file_path):
@@ -189,6 +223,14 @@ def _download_with_sections(
                 found_file = file_path
                 break
 
+        # 映像・音声が別ファイルのまま残った場合（例: clip_raw.f248.webm, clip_raw.f251.webm）はまとめる
+        if not found_file:
+            pieces = sorted(glob.glob(f"{glob.escape(base_path)}.f*.*"))
+            if pieces:
+                print(f"  Merging {len(pieces)} downloaded pieces...")
+                if _mux_pieces(pieces, output_path):
+                    found_file = output_path
+
         if found_file:
             # 指定されたパスにリネーム
             if found_file != output_path:
@@ -243,6 +285,7 @@ def _clip_video_with_ffmpeg(
     cmd = [
         "ffmpeg",
         "-y",  # 上書き確認なし
+        "-hide_banner", "-loglevel", "error",  # 進捗表示は出さない
         "-ss", start_time,  # 開始時刻
     ]
 
@@ -257,10 +300,11 @@ def _clip_video_with_ffmpeg(
     ])
 
     try:
-        result = subprocess.run(
+        subprocess.run(
             cmd,
-            capture_output=True,
-            text=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             check=True
         )
 
@@ -272,7 +316,7 @@ def _clip_video_with_ffmpeg(
             return False
 
     except subprocess.CalledProcessError as e:
-        print(f"  ✗ FFmpeg error: {e.stderr if e.stderr else str(e)}")
+        print(f"  ✗ FFmpeg error: {e.stderr.decode(errors='replace') if e.stderr else str(e)}")
         return False
 
 
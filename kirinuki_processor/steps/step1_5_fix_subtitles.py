@@ -12,6 +12,16 @@ import re
 from typing import List, Tuple, Optional
 
 
+# SRTの時刻範囲（開始 --> 終了）
+_TIME_RANGE_RE = re.compile(r'(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})')
+
+# 日本語の文字（ひらがな・カタカナ・漢字）の間にある空白
+_JA_INNER_SPACE_RE = re.compile(r'([\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF])\s+([\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF])')
+
+# 連続する空白
+_SPACES_RE = re.compile(r'\s+')
+
+
 def parse_srt(srt_path: str) -> List[Tuple[int, str, str, str]]:
     """
     SRTファイルをパースして字幕エントリのリストを返す
@@ -40,7 +50,7 @@ def parse_srt(srt_path: str) -> List[Tuple[int, str, str, str]]:
             text = '\n'.join(lines[2:])
 
             # 時刻範囲を分割
-            match = re.match(r'(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})', time_range)
+            match = _TIME_RANGE_RE.match(time_range)
             if match:
                 start_time = match.group(1)
                 end_time = match.group(2)
@@ -83,10 +93,10 @@ def fix_subtitle_text_rule_based(text: str) -> str:
     # 「答え が」→「答えが」
     # 「幸せに なる」→「幸せになる」
     # ひらがな・カタカナ・漢字の間の空白を削除
-    text = re.sub(r'([\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF])\s+([\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF])', r'\1\2', text)
+    text = _JA_INNER_SPACE_RE.sub(r'\1\2', text)
 
     # 2. 連続する空白を1つに
-    text = re.sub(r'\s+', ' ', text)
+    text = _SPACES_RE.sub(' ', text)
 
     # 3. 行頭・行末の空白を削除
     text = text.strip()
@@ -11,6 +11,13 @@ from groq import Groq
 from dotenv import load_dotenv
 
 
+# SRTの時刻範囲（開始 --> 終了）
+_TIME_RANGE_RE = re.compile(r'(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})')
+
+# AIの応答行「番号. [開始時刻 --> 終了時刻] テキスト」
+_RESPONSE_LINE_RE = re.compile(r'^\d+\.\s*\[(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})\]\s*(.+)$')
+
+
 def parse_srt(srt_path: str) -> List[Tuple[int, str, str, str]]:
     """
     SRTファイルをパースして字幕エントリのリストを返す
@@ -39,7 +46,7 @@ def parse_srt(srt_path: str) -> List[Tuple[int, str, str, str]]:
             text = '\n'.join(lines[2:])
 
             # 時刻範囲を分割
-            match = re.match(r'(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})', time_range)
+            match = _TIME_RANGE_RE.match(time_range)
             if match:
                 start_time = match.group(1)
                 end_time = match.group(2)
@@ -168,7 +175,7 @@ def fix_subtitles_with_ai(
         for line in response.strip().split('\n'):
             line = line.strip()
             # 「番号. [開始時刻 --> 終了時刻] テキスト」の形式を解析
-            match = re.match(r'^\d+\.\s*\[(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})\]\s*(.+)$', line)
+            match = _RESPONSE_LINE_RE.match(line)
             if match:
                 start = match.group(1)
                 end = match.group(2)
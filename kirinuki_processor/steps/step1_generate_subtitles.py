@@ -5,12 +5,25 @@
 SRT形式の字幕ファイルを生成する。
 """
 
+import hashlib
 import os
 import subprocess
 import tempfile
+import threading
 from pathlib import Path
-from typing import Optional
-import whisper
+from typing import List, Optional, Tuple
+
+try:
+    # CTranslate2ベースの高速実装（int8量子化・バッチデコード対応）
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+try:
+    # VADで区切った区間をまとめてデコードするパイプライン（faster-whisper 1.1以降）
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:
+    BatchedInferencePipeline = None
 
 from kirinuki_processor.constants import (
     SUBTITLE_FONT_NAME,
@@ -41,6 +54,7 @@ def extract_audio_from_video(video_path: str, audio_path: str) -> bool:
     """
     cmd = [
         "ffmpeg",
+        "-hide_banner", "-loglevel", "error",
         "-i", video_path,
         "-vn",  # 動画ストリームを無視
         "-acodec", "pcm_s16le",  # PCM 16-bit
@@ -51,16 +65,17 @@ def extract_audio_from_video(video_path: str, audio_path: str) -> bool:
     ]
 
     try:
-        result = subprocess.run(
+        subprocess.run(
             cmd,
-            capture_output=True,
-            text=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             check=True
         )
         print(f"✓ Audio extracted: {audio_path}")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"✗ Failed to extract audio: {e.stderr}")
+        print(f"✗ Failed to extract audio: {e.stderr.decode(errors='replace')}")
         return False
 
 
@@ -163,26 +178,47 @@ def parse_srt_timestamp(timestamp: str) -> float:
     return int(hh) * 3600 + int(mm) * 60 + int(ss) + int(ms) / 1000.0
 
 
+# ASSヘッダーに埋め込む元SRTのハッシュ（例: "; src-blake2b: 0123456789abcdef"）
+SRT_HASH_PREFIX = "; src-blake2b: "
+
+
+def srt_content_hash(data: bytes) -> str:
+    """
+    SRTの内容からハッシュを計算（ASSの再生成が必要か判定するため）
+
+    Args:
+        data: SRTファイルのバイト列
+
+    Returns:
+        16桁の16進数文字列
+    """
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
 def convert_srt_to_ass(input_srt: str, output_ass: str) -> None:
     """
     編集済みSRTをASSスタイルに変換
+
+    生成したASSのヘッダーには元SRTのハッシュを記録する（SRT_HASH_PREFIX）。
     """
     if not os.path.exists(input_srt):
         raise FileNotFoundError(f"SRT file not found: {input_srt}")
 
+    with open(input_srt, "rb") as f:
+        data = f.read()
+
     segments = []
-    with open(input_srt, "r", encoding="utf-8") as f:
-        block = []
-        for line in f:
-            stripped = line.rstrip("\n")
-            if stripped == "":
-                if block:
-                    segments.append(_parse_srt_block(block))
-                    block = []
-            else:
-                block.append(stripped)
-        if block:
-            segments.append(_parse_srt_block(block))
+    block = []
+    text = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    for line in text.split("\n"):
+        if line == "":
+            if block:
+                segments.append(_parse_srt_block(block))
+                block = []
+        else:
+            block.append(line)
+    if block:
+        segments.append(_parse_srt_block(block))
 
     segments = [seg for seg in segments if seg]
     if not segments:
@@ -197,7 +233,8 @@ def convert_srt_to_ass(input_srt: str, output_ass: str) -> None:
         outline_width=SUBTITLE_BOLD_OUTLINE_WIDTH,
         shadow_offset=SUBTITLE_BOLD_SHADOW_OFFSET,
         outline_color=SUBTITLE_BOLD_OUTLINE_COLOR,
-        bottom_margin=SUBTITLE_BOLD_BOTTOM_MARGIN
+        bottom_margin=SUBTITLE_BOLD_BOTTOM_MARGIN,
+        source_hash=srt_content_hash(data)
     )
 
 
@@ -293,10 +330,13 @@ def generate_ass_from_segments_with_style(
     outline_width: int,
     shadow_offset: int,
     outline_color: str,
-    bottom_margin: int
+    bottom_margin: int,
+    source_hash: Optional[str] = None
 ) -> None:
     """
     スタイルを指定してASS字幕ファイルを生成（カスタム用）
+
+    source_hashを指定すると [Script Info] の直後にコメントとして記録する。
     """
     header = _build_ass_header(
         font_name=font_name,
@@ -306,6 +346,8 @@ def generate_ass_from_segments_with_style(
         outline_color=outline_color,
         bottom_margin=bottom_margin
     )
+    if source_hash:
+        header = header.replace("[Script Info]\n", f"[Script Info]\n{SRT_HASH_PREFIX}{source_hash}\n", 1)
 
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(header)
@@ -356,12 +398,242 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
 
 
+# faster-whisperでのモデル名（"large"は最新のlarge-v3を使う）
+_FASTER_WHISPER_MODEL_NAMES = {
+    "large": "large-v3",
+}
+
+
+# 読み込み済みモデルのキャッシュ（キー: (バックエンド, モデル名, compute_type)）
+# 常駐サーバー（whisper_server）では2件目以降のジョブでモデル読み込みを省略できる
+_MODEL_CACHE: dict = {}
+
+# GPUでまとめてデコードする区間数
+_BATCH_SIZE = 8
+
+# faster-whisperのビームサーチ幅
+_BEAM_SIZE = 5
+
+# faster-whisperのVAD（Silero）設定。既定では2秒以上の無音でしか区切らないため、
+# 配信の切り抜きに多い短い間も無音として飛ばし、Whisperに渡す音声を減らす
+_VAD_PARAMETERS = {"min_silence_duration_ms": 500, "speech_pad_ms": 200}
+
+# バックグラウンドの先読みと文字起こしが同じモデルを二重に読み込まないようにするロック
+_MODEL_LOCK = threading.Lock()
+
+
+def _has_cuda() -> bool:
+    """CTranslate2からCUDAデバイスが使えるかどうか"""
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        return False
+
+
+def _default_compute_type() -> str:
+    """実行環境に合わせたfaster-whisperの既定compute_typeを返す"""
+    return "int8_float16" if _has_cuda() else "int8"
+
+
+def _use_batched_pipeline() -> bool:
+    """faster-whisperでBatchedInferencePipelineを使うかどうか"""
+    return BatchedInferencePipeline is not None and _has_cuda()
+
+
+def transcription_settings_key(compute_type: Optional[str] = None) -> str:
+    """
+    文字起こし結果に影響する設定を文字列にまとめる（字幕キャッシュのキー用）
+
+    モデルサイズ・言語以外で結果が変わる設定（compute_type、VAD、バッチ推論など）を含める。
+
+    Args:
+        compute_type: faster-whisperのcompute_type（Noneの場合は環境に合わせて自動選択）
+
+    Returns:
+        設定を表す文字列
+    """
+    if WhisperModel is None:
+        return "openai-whisper|fp16=False"
+    vad = ",".join(f"{k}={v}" for k, v in sorted(_VAD_PARAMETERS.items()))
+    batch = _BATCH_SIZE if _use_batched_pipeline() else 0
+    return (
+        f"faster-whisper|compute={compute_type or _default_compute_type()}"
+        f"|vad={vad}|beam={_BEAM_SIZE}|batch={batch}"
+    )
+
+
+def _cuda_memory_gb() -> Optional[float]:
+    """GPU（0番）のメモリ容量をGBで返す（torchが無いなどで取得できない場合はNone）"""
+    try:
+        import torch
+        return torch.cuda.get_device_properties(0).total_memory / 1024 ** 3
+    except Exception:
+        return None
+
+
+def pick_whisper_model(default: str = "large") -> str:
+    """
+    GPUメモリに合わせてWhisperモデルサイズを選ぶ
+
+    VRAMが足りずにCPUへフォールバックすると large は medium の数倍遅くなるため、
+    メモリが少ない環境では小さいモデルを使う。faster-whisper（int8）は
+    openai-whisperより少ないメモリで動くため、しきい値を下げている。
+    GPUが無い場合は常に medium を使う。
+
+    Args:
+        default: GPUはあるがメモリ容量を判定できない場合に使うモデルサイズ
+
+    Returns:
+        モデルサイズ
+    """
+    if WhisperModel is not None:
+        # faster-whisperはtorchを使わないので、読み込み時と同じくCTranslate2でGPUを判定する
+        if not _has_cuda():
+            return "medium"
+        large_gb, medium_gb = 4, 2
+    else:
+        try:
+            import torch
+            if not torch.cuda.is_available():
+                return "medium"
+        except Exception:
+            return default
+        large_gb, medium_gb = 10, 5
+
+    total_gb = _cuda_memory_gb()
+    if total_gb is None:
+        return default
+    if total_gb >= large_gb:
+        return "large"
+    if total_gb >= medium_gb:
+        return "medium"
+    return "small"
+
+
+def _load_model(model_size: str, compute_type: Optional[str] = None) -> Tuple[str, object]:
+    """
+    Whisperモデルを読み込む（読み込み済みならキャッシュを返す）
+
+    Args:
+        model_size: Whisperモデルのサイズ
+        compute_type: faster-whisperのcompute_type（Noneの場合は環境に合わせて自動選択）
+
+    Returns:
+        (バックエンド名, モデル)
+    """
+    with _MODEL_LOCK:
+        if WhisperModel is not None:
+            model_name = _FASTER_WHISPER_MODEL_NAMES.get(model_size, model_size)
+            compute_type = compute_type or _default_compute_type()
+            key = ("faster-whisper", model_name, compute_type)
+            model = _MODEL_CACHE.get(key)
+            if model is None:
+                print(f"Loading Whisper model: {model_name} (faster-whisper, {compute_type})")
+                model = WhisperModel(model_name, device="auto", compute_type=compute_type)
+                _MODEL_CACHE[key] = model
+            return "faster-whisper", model
+
+        import whisper
+
+        key = ("openai-whisper", model_size, None)
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            print(f"Loading Whisper model: {model_size}")
+            model = whisper.load_model(model_size)
+            _MODEL_CACHE[key] = model
+        return "openai-whisper", model
+
+
+def preload_whisper_model(model_size: str = "large", compute_type: Optional[str] = None) -> bool:
+    """
+    Whisperモデルを先に読み込んでおく（動画のダウンロード中などに呼ぶ）
+
+    Args:
+        model_size: Whisperモデルのサイズ
+        compute_type: faster-whisperのcompute_type（Noneの場合は環境に合わせて自動選択）
+
+    Returns:
+        bool: 読み込みに成功したかどうか
+    """
+    try:
+        _load_model(model_size, compute_type)
+        return True
+    except Exception as e:
+        print(f"  Warning: Failed to preload Whisper model: {e}")
+        return False
+
+
+def _transcribe(
+    audio_path: str,
+    model_size: str,
+    language: str,
+    verbose: bool,
+    compute_type: Optional[str] = None
+) -> Tuple[List[dict], str]:
+    """
+    音声（または動画）を文字起こしし、セグメントのリストを返す
+
+    faster-whisperがインストールされていればそちらを使い、
+    なければopenai-whisperにフォールバックする。
+
+    Args:
+        audio_path: 入力ファイルのパス
+        model_size: Whisperモデルのサイズ
+        language: 言語コード
+        verbose: 詳細な出力を表示するか
+        compute_type: faster-whisperのcompute_type（Noneの場合は環境に合わせて自動選択）
+
+    Returns:
+        (セグメントのリスト[{"start", "end", "text"}], 検出言語)
+    """
+    backend, model = _load_model(model_size, compute_type)
+
+    if backend == "faster-whisper":
+        print(f"Transcribing audio with Whisper (this may take a while)...")
+        if _use_batched_pipeline():
+            # GPUではVADで区切った複数の区間を1回の推論でまとめて処理し、GPUの空き時間を減らす
+            segments_iter, info = BatchedInferencePipeline(model=model).transcribe(
+                audio_path,
+                language=language,
+                vad_filter=True,
+                vad_parameters=_VAD_PARAMETERS,
+                beam_size=_BEAM_SIZE,
+                batch_size=_BATCH_SIZE
+            )
+        else:
+            segments_iter, info = model.transcribe(
+                audio_path,
+                language=language,
+                vad_filter=True,
+                vad_parameters=_VAD_PARAMETERS,
+                beam_size=_BEAM_SIZE
+            )
+        segments = []
+        for segment in segments_iter:
+            if verbose:
+                print(f"[{format_timestamp_srt(segment.start)} --> {format_timestamp_srt(segment.end)}] {segment.text}")
+            segments.append({"start": segment.start, "end": segment.end, "text": segment.text})
+        return segments, info.language
+
+    print(f"Transcribing audio with Whisper (this may take a while)...")
+    result = model.transcribe(
+        audio_path,
+        language=language,
+        verbose=verbose,
+        fp16=False  # CPU環境でも動作するようにFP16を無効化
+    )
+    return result["segments"], result.get("language", "unknown")
+
+
 def generate_subtitles_with_whisper(
     video_path: str,
     output_path: str,
     model_size: str = "large",
     language: str = "ja",
-    verbose: bool = True
+    verbose: bool = True,
+    compute_type: Optional[str] = None,
+    use_server: bool = True
 ) -> bool:
     """
     Whisperを使って動画から字幕を生成
@@ -372,6 +644,8 @@ def generate_subtitles_with_whisper(
         model_size: Whisperモデルのサイズ（"tiny", "base", "small", "medium", "large"）
         language: 言語コード（デフォルト: "ja"）
         verbose: 詳細な出力を表示するか
+        compute_type: faster-whisperのcompute_type（"int8", "int8_float16", "float16"など。Noneで自動）
+        use_server: 常駐Whisperサーバーが起動していればそちらに処理を依頼するか
 
     Returns:
         bool: 字幕生成に成功したかどうか
@@ -380,57 +654,73 @@ def generate_subtitles_with_whisper(
         print(f"✗ Video file not found: {video_path}")
         return False
 
+    if use_server:
+        from kirinuki_processor.whisper_server import request_transcription
+        result = request_transcription(
+            video_path,
+            output_path,
+            model_size=model_size,
+            language=language,
+            compute_type=compute_type
+        )
+        if result is not None:
+            return result
+
     # 出力ディレクトリを作成
     output_dir = os.path.dirname(output_path)
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
-    # 一時的な音声ファイルを作成
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_audio:
-        temp_audio_path = temp_audio.name
-
+    temp_audio_path = None
     try:
-        # 動画から音声を抽出
-        print(f"Extracting audio from video...")
-        if not extract_audio_from_video(video_path, temp_audio_path):
-            return False
-
-        # Whisperモデルを読み込み
-        print(f"Loading Whisper model: {model_size}")
-        model = whisper.load_model(model_size)
-
-        # 音声認識を実行
-        print(f"Transcribing audio with Whisper (this may take a while)...")
-        result = model.transcribe(
-            temp_audio_path,
-            language=language,
-            verbose=verbose,
-            fp16=False  # CPU環境でも動作するようにFP16を無効化
+        if WhisperModel is not None:
+            # faster-whisperは動画から直接16kHzモノラルにデコードできるので、WAVの書き出しを省く
+            audio_source = video_path
+        else:
+            # 一時的な音声ファイルを作成し、動画から音声を抽出
+            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_audio:
+                temp_audio_path = temp_audio.name
+            print(f"Extracting audio from video...")
+            if not extract_audio_from_video(video_path, temp_audio_path):
+                return False
+            audio_source = temp_audio_path
+
+        # Whisperモデルを読み込み、音声認識を実行
+        segments, detected_language = _transcribe(
+            audio_source,
+            model_size,
+            language,
+            verbose,
+            compute_type=compute_type
         )
 
         # SRTファイルを生成
         print(f"Generating SRT file...")
-        generate_srt_from_segments(result["segments"], output_path)
+        generate_srt_from_segments(segments, output_path)
+        # 書き出したSRTのハッシュをASSに記録し、SRTが未編集なら後段でASSを再生成しないようにする
+        with open(output_path, "rb") as f:
+            srt_hash = srt_content_hash(f.read())
 
         # ASSファイルも生成（スタイル付き字幕用）
         ass_output_path = output_path.replace(".srt", ".ass")
         print(f"Generating ASS file (styled subtitles)...")
         generate_ass_from_segments_with_style(
-            result["segments"],
+            segments,
             ass_output_path,
             font_name=SUBTITLE_FONT_NAME,
             font_size=SUBTITLE_BOLD_FONT_SIZE,
             outline_width=SUBTITLE_BOLD_OUTLINE_WIDTH,
             shadow_offset=SUBTITLE_BOLD_SHADOW_OFFSET,
             outline_color=SUBTITLE_BOLD_OUTLINE_COLOR,
-            bottom_margin=SUBTITLE_BOLD_BOTTOM_MARGIN
+            bottom_margin=SUBTITLE_BOLD_BOTTOM_MARGIN,
+            source_hash=srt_hash
         )
 
         print(f"✓ Subtitles generated:")
         print(f"  SRT: {output_path}")
         print(f"  ASS: {ass_output_path}")
-        print(f"  Detected language: {result.get('language', 'unknown')}")
-        print(f"  Number of segments: {len(result['segments'])}")
+        print(f"  Detected language: {detected_language}")
+        print(f"  Number of segments: {len(segments)}")
 
         return True
 
@@ -440,7 +730,7 @@ def generate_subtitles_with_whisper(
 
     finally:
         # 一時ファイルを削除
-        if os.path.exists(temp_audio_path):
+        if temp_audio_path and os.path.exists(temp_audio_path):
             os.remove(temp_audio_path)
 
 
@@ -472,26 +762,16 @@ def generate_subtitles_with_whisper_direct(
         os.makedirs(output_dir, exist_ok=True)
 
     try:
-        # Whisperモデルを読み込み
-        print(f"Loading Whisper model: {model_size}")
-        model = whisper.load_model(model_size)
-
-        # 音声認識を実行（動画ファイルを直接指定）
-        print(f"Transcribing video with Whisper (this may take a while)...")
-        result = model.transcribe(
-            video_path,
-            language=language,
-            verbose=True,
-            fp16=False
-        )
+        # Whisperモデルを読み込み、音声認識を実行（動画ファイルを直接指定）
+        segments, detected_language = _transcribe(video_path, model_size, language, True)
 
         # SRTファイルを生成
         print(f"Generating SRT file...")
-        generate_srt_from_segments(result["segments"], output_path)
+        generate_srt_from_segments(segments, output_path)
 
         print(f"✓ Subtitles generated: {output_path}")
-        print(f"  Detected language: {result.get('language', 'unknown')}")
-        print(f"  Number of segments: {len(result['segments'])}")
+        print(f"  Detected language: {detected_language}")
+        print(f"  Number of segments: {len(segments)}")
 
         return True
 
@@ -9,6 +9,7 @@ import os
 import subprocess
 import json
 from typing import List, Dict, Any, Optional
+from kirinuki_processor.utils.fs_utils import ensure_parent_dir
 
 
 def fetch_chat(
@@ -31,9 +32,7 @@ def fetch_chat(
         RuntimeError: yt-dlpの実行に失敗した場合
     """
     # 出力ディレクトリを作成
-    output_dir = os.path.dirname(output_path)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+    ensure_parent_dir(output_path)
 
     # 出力パスから拡張子を除いたベース名を取得
     base_name = os.path.splitext(output_path)[0]
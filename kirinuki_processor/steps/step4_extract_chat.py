@@ -5,12 +5,28 @@
 切り抜き0秒基準に時間を調整する。
 """
 
+import itertools
 import json
-from typing import List, Dict, Any, Optional
+import mmap
+import os
+from typing import Iterable, Iterator, List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 
 from kirinuki_processor.utils.time_utils import parse_time
 
+try:
+    import orjson  # 高速なJSONパーサ（任意依存）
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# 区間の開始位置を探すとき、多少の順序の乱れを吸収するために手前に取る余裕（秒）
+_SEEK_MARGIN_SECONDS = 60.0
+
+# 二分探索を打ち切って先頭から順に読む範囲（バイト）
+_SEEK_LINEAR_BYTES = 64 * 1024
+
 
 @dataclass
 class ChatMessage:
@@ -26,7 +42,7 @@ class ChatMessage:
 
 
 def extract_chat_messages(
-    messages: List[Dict[str, Any]],
+    messages: Iterable[Dict[str, Any]],
     start_offset: float,
     end_time: Optional[float] = None,
     delay_seconds: float = 0.0
@@ -35,7 +51,7 @@ def extract_chat_messages(
     チャットメッセージから必要な区間を抽出し、時間を調整
 
     Args:
-        messages: 元のチャットメッセージリスト（chat-downloader形式）
+        messages: 元のチャットメッセージ（chat-downloader形式、時刻順のイテラブル）
         start_offset: 開始オフセット（秒）。この時間を0秒とする
         end_time: 終了時刻（秒）。指定された場合、これ以降のメッセージを削除
         delay_seconds: チャット表示のオフセット（秒）。正の値でチャットを早く、負の値でチャットを遅く表示
@@ -131,6 +147,95 @@ def deduplicate_messages(
     return filtered
 
 
+def _line_time(line: bytes) -> Optional[float]:
+    """1行分のメッセージから time_in_seconds を取り出す（無ければNone）"""
+    try:
+        value = _loads(line).get("time_in_seconds")
+    except (ValueError, AttributeError):
+        return None
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def _seek_window_start(buf: mmap.mmap, min_time: float) -> int:
+    """
+    min_time より前のメッセージを読み飛ばせる位置を二分探索で求める
+
+    チャットは時刻順に並んでいる前提。時刻を判定できない行に当たった場合は
+    そこより手前から読むように倒す（取りこぼさないことを優先する）。
+
+    Args:
+        buf: チャットファイルのmmap
+        min_time: 必要な最初のメッセージの時刻（秒）
+
+    Returns:
+        読み始める行頭のバイトオフセット
+    """
+    lo, hi = 0, len(buf)
+    while hi - lo > _SEEK_LINEAR_BYTES:
+        mid = (lo + hi) // 2
+        line_start = buf.find(b"\n", mid) + 1
+        if line_start <= 0 or line_start >= hi:
+            hi = mid
+            continue
+        line_end = buf.find(b"\n", line_start)
+        if line_end < 0:
+            line_end = len(buf)
+        time_seconds = _line_time(buf[line_start:line_end])
+        if time_seconds is not None and time_seconds < min_time:
+            lo = line_start
+        else:
+            hi = mid
+    return lo
+
+
+def iter_chat_file(input_path: str, min_time: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """
+    JSON Lines形式のチャットファイルを1行ずつ読み込む
+
+    ファイルはmmapで読み、全体をメモリに載せないため長時間配信のチャットでも使用メモリは一定。
+    min_timeを指定すると、それより前の部分は二分探索で読み飛ばす。
+    解析できない行はスキップする。
+
+    Args:
+        input_path: チャットJSONファイルのパス
+        min_time: 必要な最初のメッセージの時刻（秒、任意）
+
+    Yields:
+        チャットメッセージの辞書
+    """
+    if os.path.getsize(input_path) == 0:
+        return
+
+    with open(input_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        pos = 0
+        if min_time is not None:
+            pos = _seek_window_start(buf, min_time - _SEEK_MARGIN_SECONDS)
+        size = len(buf)
+        while pos < size:
+            end = buf.find(b"\n", pos)
+            if end < 0:
+                end = size
+            line = buf[pos:end].strip()
+            pos = end + 1
+            if not line:
+                continue
+            try:
+                yield _loads(line)
+            except ValueError:
+                continue
+
+
+def _dump_messages(messages: List[ChatMessage], output_path: str) -> None:
+    """抽出したメッセージを整形済みJSONで保存"""
+    data = [msg.to_dict() for msg in messages]
+    if orjson is not None:
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
 def load_and_extract_chat(
     input_path: str,
     output_path: str,
@@ -157,23 +262,6 @@ def load_and_extract_chat(
         FileNotFoundError: 入力ファイルが見つからない
         ValueError: 時間フォーマットが不正
     """
-    # チャットファイルを読み込み
-    messages = []
-    with open(input_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                msg = json.loads(line)
-                messages.append(msg)
-            except json.JSONDecodeError:
-                continue
-
-    if not messages:
-        print(f"Warning: No chat messages found in {input_path}")
-        return 0
-
     # 時間を秒数に変換
     start_offset = parse_time(start_time)
     # end_timeは動画全体のタイムスタンプなので、クリップ長に変換する
@@ -182,19 +270,23 @@ def load_and_extract_chat(
         # クリップ長が負になるのは不正なので無効化
         end_offset = None
 
-    # 区間抽出
-    extracted = extract_chat_messages(messages, start_offset, end_offset, delay_seconds)
+    # 区間抽出（ファイルを先頭から読み進め、区間の終わりに達したら読み込みを打ち切る）
+    messages = iter_chat_file(input_path, min_time=start_offset + delay_seconds)
+    try:
+        first = next(messages, None)
+        if first is None:
+            print(f"Warning: No chat messages found in {input_path}")
+            return 0
+        extracted = extract_chat_messages(
+            itertools.chain((first,), messages), start_offset, end_offset, delay_seconds
+        )
+    finally:
+        messages.close()
     # 重複コメントの抑制
     extracted = deduplicate_messages(extracted, window_seconds=dedup_window_seconds, by_author=dedup_by_author)
 
     # JSON形式で保存（整形して読みやすく）
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(
-            [msg.to_dict() for msg in extracted],
-            f,
-            ensure_ascii=False,
-            indent=2
-        )
+    _dump_messages(extracted, output_path)
 
     print(f"✓ Extracted {len(extracted)} chat messages")
     print(f"  Input: {input_path}")
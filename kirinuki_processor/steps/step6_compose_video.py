@@ -5,27 +5,127 @@
 FFmpegを使用して再エンコード。
 """
 
+import hashlib
 import os
 import subprocess
+import threading
+from collections import deque
+from functools import lru_cache
 from typing import Optional, List
+from kirinuki_processor.utils.fs_utils import ensure_parent_dir, remove_if_exists
+
+
+# 優先順に試すハードウェアH.264エンコーダ
+_HW_ENCODERS = ("h264_nvenc", "h264_videotoolbox", "h264_qsv")
+
+# ハードウェアエンコーダでCRFの代わりに使う品質オプション
+_HW_QUALITY_FLAGS = {
+    "h264_nvenc": "-cq",
+    "h264_qsv": "-global_quality",
+}
+
+# 品質指定が無いエンコーダ（VideoToolbox）で使うビットレート
+_HW_DEFAULT_BITRATE = "8M"
+
+# 失敗時の診断用に保持するFFmpegのstderrの行数
+_STDERR_TAIL_LINES = 200
+
+# 合成に使った入力と設定のキーを保存するサイドカーの拡張子（出力ファイル名に付ける）
+_COMPOSE_KEY_SUFFIX = ".composekey"
+
+
+@lru_cache(maxsize=1)
+def detect_hw_encoder() -> str:
+    """
+    使用可能なハードウェアH.264エンコーダを検出する（プロセス内で1回だけ実行）
+
+    ffmpegに組み込まれていても、GPUやドライバが無ければ使えないため、
+    1フレームだけ試しにエンコードして確認する。
+    環境変数 KIRINUKI_HWENC でエンコーダを固定できる（例: libx264 で無効化）。
+
+    Returns:
+        エンコーダ名。使えるものが無ければ "libx264"
+    """
+    forced = os.environ.get("KIRINUKI_HWENC")
+    if forced:
+        return forced
+
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True
+        )
+    except OSError:
+        return "libx264"
+
+    for encoder in _HW_ENCODERS:
+        if encoder not in result.stdout:
+            continue
+        probe = subprocess.run(
+            [
+                "ffmpeg", "-hide_banner", "-loglevel", "error",
+                "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+                "-frames:v", "1", "-c:v", encoder, "-f", "null", "-"
+            ],
+            capture_output=True
+        )
+        if probe.returncode == 0:
+            return encoder
+    return "libx264"
+
+
+def _build_encoder_args(video_codec: str, preset: str, crf: int) -> List[str]:
+    """
+    エンコーダに合わせてプリセット・品質オプションを組み立てる
+
+    ハードウェアエンコーダは -crf を受け付けないため、対応する品質オプションに置き換える。
+
+    Args:
+        video_codec: 動画コーデック
+        preset: エンコードプリセット（libx264基準）
+        crf: 品質設定（libx264基準）
+
+    Returns:
+        -c:v 以降のエンコードオプション
+    """
+    if video_codec not in _HW_ENCODERS:
+        return ["-c:v", video_codec, "-preset", preset, "-crf", str(crf)]
+
+    args = ["-c:v", video_codec]
+    if video_codec != "h264_videotoolbox":
+        # NVENC / QSV は medium などのx264互換プリセット名を受け付ける
+        args.extend(["-preset", preset])
+
+    quality_flag = _HW_QUALITY_FLAGS.get(video_codec)
+    if quality_flag:
+        args.extend([quality_flag, str(crf)])
+        if video_codec == "h264_nvenc":
+            # NVENCは -b:v 0 を指定しないと既定ビットレートで品質が頭打ちになる
+            args.extend(["-b:v", "0"])
+    else:
+        # 品質指定が無いエンコーダは目標ビットレートで代用する
+        args.extend(["-b:v", _HW_DEFAULT_BITRATE])
+    return args
 
 
 def compose_video(
     video_path: str,
     output_path: str,
-    subtitle_path: Optional[str] = None,
-    overlay_path: Optional[str] = None,
-    title_overlay_path: Optional[str] = None,
+    overlays: Optional[List[str]] = None,
     logo_path: Optional[str] = None,
     crop_top_percent: float = 0.0,
     crop_bottom_percent: float = 0.0,
     crop_left_percent: float = 0.0,
     crop_right_percent: float = 0.0,
+    crop_scale: Optional[tuple] = None,
     video_codec: str = "libx264",
     audio_codec: str = "aac",
     preset: str = "medium",
     crf: int = 23,
-    extra_args: Optional[List[str]] = None
+    extra_args: Optional[List[str]] = None,
+    hwenc: Optional[str] = None,
+    quiet: bool = False
 ) -> bool:
     """
     動画に字幕とオーバーレイを合成
@@ -33,13 +133,20 @@ def compose_video(
     Args:
         video_path: 入力動画のパス
         output_path: 出力動画のパス
-        subtitle_path: 字幕ファイルのパス（SRT、任意）
-        overlay_path: オーバーレイファイルのパス（ASS、任意）
+        overlays: 焼き込む字幕・オーバーレイのパス（SRT/ASS、任意）
+            リストの順に重ねる（例: [字幕, チャット, タイトルバー]）。存在しないパスは無視する
+        crop_scale: クロップ後にスケールする解像度 (width, height)（任意）
+            Step0のクロップ（crop_video）を合成と同じエンコードで行う場合に指定する
         video_codec: 動画コーデック（デフォルト: libx264）
+            "copy" / "auto" を指定すると、合成要素が無い場合は再エンコードせずコピーする
+            （"auto" は入力コーデックが出力コンテナに対応している場合のみコピー）
         audio_codec: 音声コーデック（デフォルト: aac）
         preset: エンコードプリセット（デフォルト: medium）
         crf: 品質設定（デフォルト: 23、低いほど高品質）
         extra_args: 追加のFFmpegオプション
+        hwenc: 再エンコードに使うハードウェアエンコーダ（例: "h264_nvenc"、detect_hw_encoder() の結果）
+            video_codec が libx264 の場合のみ置き換え、失敗した場合はlibx264でやり直す
+        quiet: Trueの場合はFFmpegの進捗を表示しない（失敗時のみ末尾を表示）
 
     Returns:
         bool: 合成に成功したかどうか
@@ -48,9 +155,7 @@ def compose_video(
         RuntimeError: FFmpegの実行に失敗した場合
     """
     # 出力ディレクトリを作成
-    output_dir = os.path.dirname(output_path)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
+    ensure_parent_dir(output_path)
 
     # FFmpegコマンドを構築
     cmd = [
@@ -60,6 +165,39 @@ def compose_video(
 
     # ロゴ画像を入力として追加
     has_logo = logo_path and os.path.exists(logo_path)
+
+    # 焼き込む要素もクロップも無い場合は再エンコードせずストリームコピーで済ませる
+    overlays = [path for path in (overlays or []) if path and os.path.exists(path)]
+    has_overlays = bool(overlays)
+    has_crop = any(
+        param > 0
+        for param in (crop_top_percent, crop_bottom_percent, crop_left_percent, crop_right_percent)
+    )
+    if video_codec in ("copy", "auto"):
+        if not (has_logo or has_overlays or has_crop) and (
+            video_codec == "copy" or _can_stream_copy(video_path, output_path)
+        ):
+            copy_cmd = [
+                "ffmpeg",
+                "-i", video_path,
+                "-y",
+                "-map", "0:v:0",
+                "-map", "0:a:0?",
+                "-c", "copy",
+            ]
+            if extra_args:
+                copy_cmd.extend(extra_args)
+            copy_cmd.append(output_path)
+
+            print(f"Starting video composition (stream copy, no re-encode)...")
+            print(f"  Input: {video_path}")
+            print(f"  Output: {output_path}")
+            print(f"  Command: {' '.join(copy_cmd)}")
+            return _run_compose_command(copy_cmd, output_path, quiet=quiet)
+
+        # フィルターが必要、またはコンテナが非対応の場合は通常のエンコードに切り替える
+        video_codec = "libx264"
+
     if has_logo:
         cmd.extend(["-i", logo_path])
 
@@ -76,10 +214,12 @@ def compose_video(
 
     # 入力解像度（スケールは基本せず、クロップ後の高さを基準に16:9へ切り出す）
     target_width = target_height = None
+    resolution_probed = False
     if os.path.exists(video_path):
         res = get_video_resolution(video_path)
         if res:
             target_width, target_height = res
+            resolution_probed = True
     if not target_width:
         target_width = 1920
     if not target_height:
@@ -126,14 +266,25 @@ def compose_video(
         if final_width_factor <= 0 or final_height_factor <= 0:
             raise ValueError("Invalid crop ratios after aspect adjustment. Please check crop settings.")
 
-        crop_expr = (
-            "crop="
-            f"iw*{final_width_factor:.6f}:"
-            f"ih*{final_height_factor:.6f}:"
-            f"iw*{left_frac:.6f}:"
-            f"ih*{top_frac:.6f}"
-        )
+        if resolution_probed:
+            # 解像度が分かっている場合は整数座標に解決する
+            # yuv420pの制約に合わせて偶数に丸め、フレーム毎の式評価も不要にする
+            crop_w = (int(target_width * final_width_factor) // 2) * 2
+            crop_h = (int(target_height * final_height_factor) // 2) * 2
+            crop_x = (int(target_width * left_frac) // 2) * 2
+            crop_y = (int(target_height * top_frac) // 2) * 2
+            crop_expr = f"crop={crop_w}:{crop_h}:{crop_x}:{crop_y}"
+        else:
+            crop_expr = (
+                "crop="
+                f"iw*{final_width_factor:.6f}:"
+                f"ih*{final_height_factor:.6f}:"
+                f"iw*{left_frac:.6f}:"
+                f"ih*{top_frac:.6f}"
+            )
         video_filters.append(crop_expr)
+        if crop_scale:
+            video_filters.append(f"scale={crop_scale[0]}:{crop_scale[1]}")
         crop_applied = True
 
     # スケールは行わず、元解像度ベースのまま出力する
@@ -141,20 +292,13 @@ def compose_video(
     video_filters.append("setsar=1")
 
     # 字幕、チャット、タイトルバーはクロップ/スケール後の映像に適用
-    if subtitle_path and os.path.exists(subtitle_path):
-        subtitle_path_escaped = subtitle_path.replace("\\", "/").replace(":", "\\:")
-        if subtitle_path.endswith(".ass"):
-            video_filters.append(f"ass={subtitle_path_escaped}")
+    # すべて同じフィルターチェーンに並べ、1回のデコード・エンコードで焼き込む
+    for path in overlays:
+        path_escaped = path.replace("\\", "/").replace(":", "\\:")
+        if path.endswith(".ass"):
+            video_filters.append(f"ass={path_escaped}")
         else:
-            video_filters.append(f"subtitles={subtitle_path_escaped}")
-
-    if overlay_path and os.path.exists(overlay_path):
-        overlay_path_escaped = overlay_path.replace("\\", "/").replace(":", "\\:")
-        video_filters.append(f"ass={overlay_path_escaped}")
-
-    if title_overlay_path and os.path.exists(title_overlay_path):
-        title_overlay_path_escaped = title_overlay_path.replace("\\", "/").replace(":", "\\:")
-        video_filters.append(f"ass={title_overlay_path_escaped}")
+            video_filters.append(f"subtitles={path_escaped}")
 
     if video_filters:
         filters.append(",".join(video_filters))
@@ -174,88 +318,230 @@ def compose_video(
             f"g='if(lte(hypot(X-W/2,Y-H/2),W/2-{border_width}),g(X,Y),255)':"
             f"b='if(lte(hypot(X-W/2,Y-H/2),W/2-{border_width}),b(X,Y),255)':"
             f"a='if(lte(hypot(X-W/2,Y-H/2),W/2),255,0)'[logo]",
-            f"[{base_stream}][logo]overlay={logo_x}:{logo_y}"
+            f"[{base_stream}][logo]overlay={logo_x}:{logo_y}[v_out]"
         ])
         cmd.extend(["-filter_complex", ";".join(filter_parts)])
+        video_map = "[v_out]"
     else:
         if filters:
             cmd.extend(["-vf", ",".join(filters)])
+        video_map = "0:v:0"
+
+    # ストリームを明示的に選択（余分な音声・データストリームを再エンコードしない）
+    # 音声は「?」付きで任意扱い（音声なしの入力でも失敗しない）
+    cmd.extend(["-map", video_map, "-map", "0:a:0?"])
+
+    use_hwenc = bool(hwenc) and hwenc != video_codec and video_codec == "libx264"
+    base_cmd = cmd
+
+    def with_encoder(codec: str) -> List[str]:
+        # エンコード設定・追加オプション・出力ファイルを付け足す
+        full = base_cmd + _build_encoder_args(codec, preset, crf)
+        full.extend(["-c:a", audio_codec])
+        if extra_args:
+            full.extend(extra_args)
+        full.append(output_path)
+        return full
+
+    cmd = with_encoder(hwenc if use_hwenc else video_codec)
+
+    print(f"Starting video composition...")
+    print(f"  Input: {video_path}")
+    if logo_path:
+        print(f"  Logo: {logo_path}")
+    for path in overlays:
+        print(f"  Overlay: {path}")
+    print(f"  Output: {output_path}")
+    print(f"  Command: {' '.join(cmd)}")
+
+    # 入力・字幕・設定がすべて前回と同じなら再エンコードしない
+    key_path = output_path + _COMPOSE_KEY_SUFFIX
+    inputs = [video_path] + ([logo_path] if has_logo else [])
+    cache_key = _compose_cache_key(cmd, inputs, overlays)
+    if os.path.exists(output_path) and _read_text_or_none(key_path) == cache_key:
+        print("✓ Output is up to date (same inputs and settings), skipping re-encode")
+        return True
+    remove_if_exists(key_path)
+
+    success = _run_compose_command(cmd, output_path, quiet=quiet)
+    if not success and use_hwenc:
+        print(f"  Hardware encoder {hwenc} failed, retrying with {video_codec}...")
+        success = _run_compose_command(with_encoder(video_codec), output_path, quiet=quiet)
+
+    if success:
+        with open(key_path, "w", encoding="utf-8") as f:
+            f.write(cache_key)
+    return success
+
+
+def _compose_cache_key(cmd: List[str], inputs: List[str], overlays: List[str]) -> str:
+    """
+    合成結果を再利用できるか判定するためのキーを計算
 
-    # エンコード設定
-    cmd.extend([
-        "-c:v", video_codec,
-        "-preset", preset,
-        "-crf", str(crf),
-        "-c:a", audio_codec,
-    ])
+    動画・ロゴは大きいのでパス・サイズ・更新時刻で、字幕やオーバーレイは
+    毎回作り直される（タイトルバーなど）ため内容のハッシュで比較する。
 
-    # 追加オプション
-    if extra_args:
-        cmd.extend(extra_args)
+    Args:
+        cmd: 実行するFFmpegコマンド（フィルターやエンコード設定を含む）
+        inputs: 動画・画像の入力ファイル
+        overlays: 焼き込む字幕・オーバーレイのファイル
 
-    # 出力ファイル
-    cmd.append(output_path)
+    Returns:
+        16進数のキー文字列
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\0".join(cmd).encode("utf-8"))
+    for path in inputs:
+        st = os.stat(path)
+        h.update(f"|{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode("utf-8"))
+    for path in overlays:
+        with open(path, "rb") as f:
+            h.update(b"|" + hashlib.blake2b(f.read(), digest_size=16).digest())
+    return h.hexdigest()
+
+
+def _read_text_or_none(path: str) -> Optional[str]:
+    """テキストファイルを読み込む（存在しなければNone）"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _run_compose_command(cmd: List[str], output_path: str, quiet: bool = False) -> bool:
+    """
+    構築済みのFFmpegコマンドを実行し、出力ファイルを確認する
+
+    stderrは別スレッドで読み続け、末尾の行だけを保持する。
+    長時間のエンコードでも進捗ログがメモリに溜まらず、パイプが詰まって止まることもない。
+
+    Args:
+        cmd: FFmpegコマンド
+        output_path: 出力動画のパス
+        quiet: Trueの場合は進捗を表示しない
+
+    Returns:
+        bool: 合成に成功したかどうか
+
+    Raises:
+        RuntimeError: 予期しないエラーが発生した場合
+    """
+    tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+
+    def drain(stream) -> None:
+        for line in stream:
+            tail.append(line)
+            if not quiet:
+                print(line, end="", flush=True)
 
     try:
-        print(f"Starting video composition...")
-        print(f"  Input: {video_path}")
-        if logo_path:
-            print(f"  Logo: {logo_path}")
-        if subtitle_path:
-            print(f"  Subtitle: {subtitle_path}")
-        if overlay_path:
-            print(f"  Chat overlay: {overlay_path}")
-        if title_overlay_path:
-            print(f"  Title overlay: {title_overlay_path}")
-        print(f"  Output: {output_path}")
-        print(f"  Command: {' '.join(cmd)}")
-
-        # FFmpegを実行
-        result = subprocess.run(
+        # FFmpegを実行（Pythonのfdは継承不可なので close_fds=False で起動時のfdクローズを省く）
+        process = subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False,
             text=True,
-            check=True
+            errors="replace",
+            bufsize=1
         )
+    except FileNotFoundError:
+        # FFmpegが見つからない場合のエラーメッセージ
+        print("✗ ffmpeg is not installed.")
+        print("  Please install it: https://ffmpeg.org/download.html")
+        return False
+    except Exception as e:
+        raise RuntimeError(f"Unexpected error while composing video: {e}")
 
-        # 出力ファイルが存在するか確認
-        if os.path.exists(output_path):
-            file_size = os.path.getsize(output_path)
-            file_size_mb = file_size / (1024 * 1024)
-            print(f"✓ Video composition completed")
-            print(f"  Output file: {output_path}")
-            print(f"  File size: {file_size_mb:.2f} MB")
-            return True
-        else:
-            print(f"✗ Output file not created")
-            return False
+    reader = threading.Thread(target=drain, args=(process.stderr,), daemon=True)
+    reader.start()
+    returncode = process.wait()
+    reader.join()
+    process.stderr.close()
 
-    except subprocess.CalledProcessError as e:
-        error_msg = e.stderr if e.stderr else str(e)
+    if returncode != 0:
+        print(f"✗ Failed to compose video (ffmpeg exit code {returncode}):")
+        print("".join(tail), end="")
+        return False
 
-        # FFmpegが見つからない場合のエラーメッセージ
-        if "not found" in error_msg or "command not found" in error_msg:
-            print("✗ ffmpeg is not installed.")
-            print("  Please install it: https://ffmpeg.org/download.html")
-            return False
+    # 出力ファイルが存在するか確認
+    if os.path.exists(output_path):
+        file_size = os.path.getsize(output_path)
+        file_size_mb = file_size / (1024 * 1024)
+        print(f"✓ Video composition completed")
+        print(f"  Output file: {output_path}")
+        print(f"  File size: {file_size_mb:.2f} MB")
+        return True
 
-        print(f"✗ Failed to compose video: {error_msg}")
+    print(f"✗ Output file not created")
+    return False
+
+
+# 出力コンテナごとにストリームコピー可能なコーデック（None は制限なし）
+_STREAM_COPY_CODECS = {
+    ".mp4": ({"h264", "hevc", "av1", "mpeg4"}, {"aac", "mp3", "alac"}),
+    ".m4v": ({"h264", "hevc", "av1", "mpeg4"}, {"aac", "mp3", "alac"}),
+    ".mov": ({"h264", "hevc", "mpeg4", "prores"}, {"aac", "mp3", "alac", "pcm_s16le"}),
+    ".webm": ({"vp8", "vp9", "av1"}, {"vorbis", "opus"}),
+    ".mkv": (None, None),
+}
+
+
+def _can_stream_copy(video_path: str, output_path: str) -> bool:
+    """
+    入力動画のコーデックが出力コンテナにそのまま格納できるか判定
+
+    Args:
+        video_path: 入力動画のパス
+        output_path: 出力動画のパス（拡張子でコンテナを判定）
+
+    Returns:
+        bool: ストリームコピー可能な場合True
+    """
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext not in _STREAM_COPY_CODECS:
         return False
+    video_codecs, audio_codecs = _STREAM_COPY_CODECS[ext]
 
-    except Exception as e:
-        raise RuntimeError(f"Unexpected error while composing video: {e}")
+    info = get_video_info(video_path)
+    streams = info.get("streams", [])
+    video_streams = [st for st in streams if st.get("codec_type") == "video"]
+    audio_streams = [st for st in streams if st.get("codec_type") == "audio"]
+    if not video_streams:
+        return False
+
+    if video_codecs is not None and video_streams[0].get("codec_name") not in video_codecs:
+        return False
+    if audio_streams and audio_codecs is not None and audio_streams[0].get("codec_name") not in audio_codecs:
+        return False
+    return True
 
 
 def get_video_info(video_path: str) -> dict:
     """
     動画の情報を取得（FFprobe使用）
 
+    同じファイル（パス・更新時刻・サイズが一致）の結果はキャッシュを返す。
+
     Args:
         video_path: 動画ファイルのパス
 
     Returns:
         動画情報の辞書
     """
+    try:
+        st = os.stat(video_path)
+        return _probe_video_info(os.path.abspath(video_path), st.st_mtime_ns, st.st_size)
+    except Exception as e:
+        print(f"Warning: Failed to get video info: {e}")
+        return {}
+
+
+@lru_cache(maxsize=32)
+def _probe_video_info(video_path: str, mtime_ns: int, size: int) -> dict:
+    """ffprobeの実行本体（mtime_ns/sizeはキャッシュキー用）"""
     cmd = [
         "ffprobe",
         "-v", "quiet",
@@ -264,22 +550,15 @@ def get_video_info(video_path: str) -> dict:
         "-show_streams",
         video_path
     ]
-
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        import json
-        info = json.loads(result.stdout)
-        return info
-
-    except Exception as e:
-        print(f"Warning: Failed to get video info: {e}")
-        return {}
+    result = subprocess.run(
+        cmd,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    import json
+    return json.loads(result.stdout)
 
 
 def get_video_duration(video_path: str) -> Optional[float]:
@@ -12,6 +12,11 @@ from groq import Groq
 from dotenv import load_dotenv
 
 
+# Groqクライアントはプロセス内で1つだけ生成し、HTTP接続プールを使い回す
+_GROQ_CLIENT: Optional[Groq] = None
+_GROQ_CLIENT_API_KEY: Optional[str] = None
+
+
 def extract_transcript_from_srt(srt_path: str) -> str:
     """
     SRTファイルからトランスクリプトテキストを抽出
@@ -77,6 +82,39 @@ def load_prompt_template(template_path: str) -> str:
     return template
 
 
+def _get_groq_client(api_key: Optional[str] = None) -> Groq:
+    """
+    Groqクライアントを取得（モジュール内でキャッシュして再利用）
+
+    Args:
+        api_key: Groq APIキー（Noneの場合は環境変数から取得）
+
+    Returns:
+        Groqクライアント
+
+    Raises:
+        ValueError: APIキーが設定されていない場合
+    """
+    global _GROQ_CLIENT, _GROQ_CLIENT_API_KEY
+
+    if api_key is None:
+        api_key = os.environ.get("GROQ_API_KEY")
+        if not api_key:
+            # 環境変数に無い場合のみ.env.localを読み込む
+            load_dotenv(dotenv_path=".env.local")
+            api_key = os.environ.get("GROQ_API_KEY")
+
+    if not api_key:
+        raise ValueError("GROQ_API_KEY is not set. Please set it in .env.local")
+
+    # 同じAPIキーであれば既存のクライアント（接続プール）を再利用
+    if _GROQ_CLIENT is None or _GROQ_CLIENT_API_KEY != api_key:
+        _GROQ_CLIENT = Groq(api_key=api_key)
+        _GROQ_CLIENT_API_KEY = api_key
+
+    return _GROQ_CLIENT
+
+
 def generate_description_with_groq(
     transcript: str,
     prompt_template: str,
@@ -95,17 +133,8 @@ def generate_description_with_groq(
     Returns:
         生成されたYouTube説明欄の文章
     """
-    # APIキーの取得
-    if api_key is None:
-        # .env.localから環境変数を読み込み
-        load_dotenv(dotenv_path=".env.local")
-        api_key = os.getenv("GROQ_API_KEY")
-    
-    if not api_key:
-        raise ValueError("GROQ_API_KEY is not set. Please set it in .env.local")
-    
-    # Groqクライアントを初期化
-    client = Groq(api_key=api_key)
+    # Groqクライアントを取得（初回のみ初期化）
+    client = _get_groq_client(api_key)
     
     # プロンプトを構築
     full_prompt = prompt_template.replace("（ここに文字起こしを貼る）", transcript)
@@ -122,10 +151,18 @@ def generate_description_with_groq(
             model=model,
             temperature=0.7,
             max_tokens=2048,
+            stream=True,
         )
         
-        # 生成されたテキストを取得
-        description = chat_completion.choices[0].message.content
+        # ストリーミングで受信したテキストを順次連結
+        chunks = []
+        for chunk in chat_completion:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                chunks.append(content)
+        description = "".join(chunks)
         return description
     
     except Exception as e:
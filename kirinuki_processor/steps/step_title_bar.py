@@ -4,7 +4,9 @@
 動画の上部にスライドインアニメーション付きのタイトルバーを生成する。
 """
 
-from typing import Optional
+import string
+from pathlib import Path
+from typing import List, NamedTuple, Optional
 from kirinuki_processor.utils.time_utils import ass_time_format
 from kirinuki_processor.constants import (
     TITLE_BAR_HEIGHT,
@@ -15,6 +17,112 @@ from kirinuki_processor.constants import (
     LOGO_HEIGHT
 )
 
+# ASSテキスト用のエスケープ表（\ { } を1パスで置換）
+_ASS_ESCAPE = str.maketrans({"\\": "\\\\", "{": "\\{", "}": "\\}"})
+_ASS_META = frozenset("\\{}")
+
+# タイトルバーの配置（constants.pyから取得）
+_BAR_HEIGHT = TITLE_BAR_HEIGHT
+_BAR_Y = TITLE_BAR_MARGIN_TOP
+_BAR_Y_BOTTOM = _BAR_Y + _BAR_HEIGHT
+
+# チャンネル名はより視認性の高い太字フォントとする
+_CHANNEL_FONT_NAME = "Hiragino Sans W9"
+# チャンネル名の1文字あたりの概算幅（px）
+_CHANNEL_FONT_SIZE = 45
+
+# 半角扱いする文字（ASCII印字可能文字）。それ以外は全角幅とみなす
+_NARROW_CHARS = frozenset(string.printable)
+
+# 色設定（ASS形式: &HAABBGGRR、BGRの順）
+_TEXT_COLOR = "&H00000000"  # 黒（黄色背景に対して）
+_OUTLINE_COLOR = "&H00FFFFFF"  # 白アウトライン
+_CHANNEL_OUTLINE_COLOR = "&H00404040"  # チャンネル名は濃いめの縁取りで視認性アップ
+_BAR_BG_COLOR = TITLE_BAR_BG_COLOR  # 黄色（constants.pyから取得）
+# 青色 RGB(0, 120, 215) → BGR(215, 120, 0) = D77800
+_CHANNEL_BG_COLOR = "&H00D77800"  # 青色（完全不透明、AA=00）
+
+# ロゴの中心位置
+_LOGO_X = 15
+_LOGO_CENTER_X = _LOGO_X + 180 // 2  # 105px
+
+# タイトル・チャンネル名テキストの最終X位置（ロゴX15px + 幅180px + マージン15px）
+_TEXT_END_X = 210
+# タイトルテキストのY座標（バーの中央）
+_TEXT_Y = _BAR_Y + _BAR_HEIGHT // 2
+
+# チャンネル名領域（タイトルバー下、ロゴとの差分空間に表示）
+# タイトルバー下端: _BAR_Y + _BAR_HEIGHT
+# ロゴ下端: _BAR_Y + LOGO_HEIGHT
+# チャンネル名のY位置: タイトルバー下端とロゴ下端の中間
+_CHANNEL_AREA_HEIGHT = LOGO_HEIGHT - _BAR_HEIGHT
+_CHANNEL_Y_TOP = _BAR_Y + _BAR_HEIGHT  # 130
+_CHANNEL_Y = _CHANNEL_Y_TOP + _CHANNEL_AREA_HEIGHT // 2  # 160
+_CHANNEL_Y_BOTTOM = _CHANNEL_Y_TOP + _CHANNEL_AREA_HEIGHT
+
+# 表示終了時刻の既定値（9:59:59.99 = 実質無限）
+_DEFAULT_TOTAL_END = 9*3600 + 59*60 + 59.99
+
+# ASSヘッダー（解像度以外は固定なので読み込み時に組み立てておく）
+_HEADER_TPL = f"""[Script Info]
+Title: Title Bar
+ScriptType: v4.00+
+WrapStyle: 0
+PlayResX: {{video_width}}
+PlayResY: {{video_height}}
+ScaledBorderAndShadow: yes
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: TitleText,{TITLE_BAR_FONT_NAME},{TITLE_BAR_FONT_SIZE},{_TEXT_COLOR},&H000000FF,{_OUTLINE_COLOR},&H00000000,-1,0,0,0,100,100,0,0,1,5,3,7,30,30,0,1
+Style: TitleBar,Arial,20,{_BAR_BG_COLOR},&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,0,0,7,0,0,0,1
+Style: ChannelName,{_CHANNEL_FONT_NAME},48,&H00FFFFFF,&H000000FF,{_CHANNEL_OUTLINE_COLOR},&H00000000,-1,0,0,0,100,100,0,0,1,4,2,7,30,30,0,1
+Style: ChannelBg,Arial,20,{_CHANNEL_BG_COLOR},&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,0,0,7,0,0,0,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+# タイトルバーの各要素（背景・テキスト）は同じ形の2行で構成される
+# スライドイン中: ロゴ中心から1pxのクリップ（ほぼ見えない）から、
+#                 要素全体が見える範囲までクリップを広げて左から右に伸ばす
+# 静止中: クリップなしでそのまま表示
+_MOVING_TPL = "Dialogue: {layer},{slide_start},{slide_end},{style},,0,0,0,,{{{an}\\pos({x},{y})\\clip({logo_center_x},{clip_top},{logo_clip_x},{clip_bottom})\\t(0,{slide_ms},\\clip({logo_center_x},{clip_top},{clip_end},{clip_bottom})){p}}}{body}\\N\n"
+_STATIC_TPL = "Dialogue: {layer},{slide_end},{total_end},{style},,0,0,0,,{{{an}\\pos({x},{y}){p}}}{body}\\N\n"
+
+
+class _Element(NamedTuple):
+    """タイトルバーを構成する1要素（1レイヤー）"""
+    style: str
+    x: int
+    y: int
+    clip_top: int
+    clip_bottom: int
+    clip_end: int
+    body: str
+    is_drawing: bool
+
+def _escape_ass(text: str) -> str:
+    """ASSの特殊文字をエスケープ（該当文字がなければそのまま返す）"""
+    if not any(c in _ASS_META for c in text):
+        return text
+    return text.translate(_ASS_ESCAPE)
+
+
+def _ass_text_width(text: str, font_size: int) -> int:
+    """
+    テキストの概算描画幅（px）を計算
+
+    Args:
+        text: 対象テキスト
+        font_size: フォントサイズ（全角1文字の幅）
+
+    Returns:
+        半角文字をfont_size//2、それ以外をfont_sizeとして合計した幅
+    """
+    half = font_size // 2
+    return sum(half if c in _NARROW_CHARS else font_size for c in text)
+
 
 def generate_title_bar(
     title: str,
@@ -39,133 +147,73 @@ def generate_title_bar(
     Returns:
         bool: 生成に成功したかどうか
     """
-    # タイトルバーの設定（constants.pyから取得）
-    bar_height = TITLE_BAR_HEIGHT
-    bar_y_position = TITLE_BAR_MARGIN_TOP
-
-    # フォント設定
-    font_name = TITLE_BAR_FONT_NAME
-    # チャンネル名はより視認性の高い太字フォントとする
-    channel_font_name = "Hiragino Sans W9"
-    font_size = TITLE_BAR_FONT_SIZE
-
-    # 色設定（ASS形式: &HAABBGGRR、BGRの順）
-    text_color = "&H00000000"  # 黒（黄色背景に対して）
-    outline_color = "&H00FFFFFF"  # 白アウトライン
-    channel_outline_color = "&H00404040"  # チャンネル名は濃いめの縁取りで視認性アップ
-    bar_bg_color = TITLE_BAR_BG_COLOR  # 黄色（constants.pyから取得）
-    # 青色 RGB(0, 120, 215) → BGR(215, 120, 0) = D77800
-    channel_bg_color = "&H00D77800"  # 青色（完全不透明、AA=00）
-
-    # タイトルバーの開始・終了位置（左から右にスライド）
-    start_y = bar_y_position  # Y位置は固定
-    end_y = bar_y_position  # Y位置は固定
-
-    # ロゴの中心位置
-    logo_x = 15
-    logo_center_x = logo_x + 180 // 2  # 105px
-
     # タイムスタンプ
     slide_start = 0.0
     slide_end = slide_duration
-    # 表示終了時刻（Noneの場合は9:59:59.99 = 実質無限）
-    total_end = display_duration + slide_duration if display_duration else 9*3600 + 59*60 + 59.99
-
-    # ASSヘッダー
-    header = f"""[Script Info]
-Title: Title Bar
-ScriptType: v4.00+
-WrapStyle: 0
-PlayResX: {video_width}
-PlayResY: {video_height}
-ScaledBorderAndShadow: yes
-
-[V4+ Styles]
-Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-Style: TitleText,{font_name},{font_size},{text_color},&H000000FF,{outline_color},&H00000000,-1,0,0,0,100,100,0,0,1,5,3,7,30,30,0,1
-Style: TitleBar,Arial,20,{bar_bg_color},&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,0,0,7,0,0,0,1
-Style: ChannelName,{channel_font_name},48,&H00FFFFFF,&H000000FF,{channel_outline_color},&H00000000,-1,0,0,0,100,100,0,0,1,4,2,7,30,30,0,1
-Style: ChannelBg,Arial,20,{channel_bg_color},&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,0,0,7,0,0,0,1
-
-[Events]
-Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-"""
-
-    # タイトルテキストのエスケープ処理
-    title_escaped = title.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}")
+    slide_ms = int(slide_duration * 1000)  # \t() アニメーション用（ミリ秒）
+    # 表示終了時刻（Noneの場合は実質無限）
+    total_end = display_duration + slide_duration if display_duration else _DEFAULT_TOTAL_END
 
     # タイトルバーの背景（矩形）をロゴ中心から右端まで描画
     # 背景の幅: ロゴ中心から画面右端まで
-    bar_bg_width = video_width - logo_center_x
-    drawing = f"m 0 0 l {bar_bg_width} 0 l {bar_bg_width} {bar_height} l 0 {bar_height}"
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(header)
-
-        # Layer 0: タイトルバー背景（スライドインアニメーション：左から右）
-        # クリップを使って右に伸びていく効果
-        # 初期状態: ロゴ中心から1px（ほぼ見えない）
-        # 終了状態: 画面右端まで表示
-        f.write(f"Dialogue: 0,{ass_time_format(slide_start)},{ass_time_format(slide_end)},TitleBar,,0,0,0,,{{\\pos({logo_center_x},{start_y})\\clip({logo_center_x},{bar_y_position},{logo_center_x + 1},{bar_y_position + bar_height})\\t(0,{int(slide_duration*1000)},\\clip({logo_center_x},{bar_y_position},{video_width},{bar_y_position + bar_height}))\\p1}}{drawing}\\N\n")
-        # 背景（静止）
-        f.write(f"Dialogue: 0,{ass_time_format(slide_end)},{ass_time_format(total_end)},TitleBar,,0,0,0,,{{\\pos({logo_center_x},{end_y})\\p1}}{drawing}\\N\n")
-
-        # Layer 1: タイトルテキスト
-        # テキストの中央配置（Y座標はバーの中央）
-        text_y = bar_y_position + bar_height // 2
-
-        # タイトルテキスト（スライドインアニメーション：左から右）
-        text_end_x = 210  # 最終位置（ロゴX15px + 幅180px + マージン15px）
-
-        # タイトル文字の概算幅
-        title_text_width = len(title) * font_size
-
-        # スライドイン中（左揃えで表示、左から右に移動）
-        # 初期状態: ロゴ中心から1pxのクリップ（ほぼ見えない）
-        # 終了状態: ロゴ中心から文字全体が見える範囲までクリップ
-        f.write(f"Dialogue: 1,{ass_time_format(slide_start)},{ass_time_format(slide_end)},TitleText,,0,0,0,,{{\\an4\\pos({text_end_x},{text_y})\\clip({logo_center_x},{bar_y_position},{logo_center_x + 1},{bar_y_position + bar_height})\\t(0,{int(slide_duration*1000)},\\clip({logo_center_x},{bar_y_position},{text_end_x + title_text_width},{bar_y_position + bar_height}))}}{title_escaped}\\N\n")
-
-        # 静止中（左揃えで表示）
-        f.write(f"Dialogue: 1,{ass_time_format(slide_end)},{ass_time_format(total_end)},TitleText,,0,0,0,,{{\\an4\\pos({text_end_x},{text_y})}}{title_escaped}\\N\n")
-
-        # Layer 2: チャンネル名背景と文字（タイトルバー下、ロゴとの差分空間に表示）
-        # タイトルバー下端: bar_y_position + bar_height
-        # ロゴ下端: bar_y_position + LOGO_HEIGHT
-        # チャンネル名のY位置: タイトルバー下端とロゴ下端の中間
-        channel_area_height = LOGO_HEIGHT - bar_height
-        channel_y_top = bar_y_position + bar_height  # 130
-        channel_y = channel_y_top + channel_area_height // 2  # 160
-
-        # チャンネル名の背景矩形（ロゴ中心から文字の終わりまで）
-        # 文字幅を概算：「ひろゆきのつぶやき」= 10文字 × 45px ≈ 450px
-        channel_text_width = len(channel_name) * 45
-        channel_bg_x_start = logo_center_x  # ロゴの中心から開始
-        channel_bg_x_end = text_end_x + channel_text_width + 30  # 文字の終わり + マージン
-        channel_bg_width = channel_bg_x_end - channel_bg_x_start
-
-        # 背景矩形の描画（相対座標で描画）
-        channel_bg_drawing = f"m 0 0 l {channel_bg_width} 0 l {channel_bg_width} {channel_area_height} l 0 {channel_area_height}"
-
-        # チャンネル名背景（スライドインアニメーション：左から右、Y位置固定）
-        # クリップを使って右に伸びていく効果
-        # 初期状態: ロゴ中心から1px（ほぼ見えない）
-        # 終了状態: 背景の右端まで表示
-        f.write(f"Dialogue: 2,{ass_time_format(slide_start)},{ass_time_format(slide_end)},ChannelBg,,0,0,0,,{{\\pos({channel_bg_x_start},{channel_y_top})\\clip({logo_center_x},{channel_y_top},{logo_center_x + 1},{channel_y_top + channel_area_height})\\t(0,{int(slide_duration*1000)},\\clip({logo_center_x},{channel_y_top},{channel_bg_x_end},{channel_y_top + channel_area_height}))\\p1}}{channel_bg_drawing}\\N\n")
-        # 背景（静止）
-        f.write(f"Dialogue: 2,{ass_time_format(slide_end)},{ass_time_format(total_end)},ChannelBg,,0,0,0,,{{\\pos({channel_bg_x_start},{channel_y_top})\\p1}}{channel_bg_drawing}\\N\n")
-
-        # チャンネル名のエスケープ処理
-        channel_escaped = channel_name.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}")
-
-        # チャンネル名テキスト（スライドイン中、左揃えで表示、左から右に移動）
-        # 初期状態: ロゴ中心から1pxのクリップ（ほぼ見えない）
-        # 終了状態: ロゴ中心から文字全体が見える範囲までクリップ
-        channel_font_size = 45
-        channel_full_width = len(channel_name) * channel_font_size
-        f.write(f"Dialogue: 3,{ass_time_format(slide_start)},{ass_time_format(slide_end)},ChannelName,,0,0,0,,{{\\an4\\pos({text_end_x},{channel_y})\\clip({logo_center_x},{channel_y_top},{logo_center_x + 1},{channel_y_top + channel_area_height})\\t(0,{int(slide_duration*1000)},\\clip({logo_center_x},{channel_y_top},{text_end_x + channel_full_width},{channel_y_top + channel_area_height}))}}{channel_escaped}\\N\n")
-
-        # 静止中（左揃えで表示）
-        f.write(f"Dialogue: 3,{ass_time_format(slide_end)},{ass_time_format(total_end)},ChannelName,,0,0,0,,{{\\an4\\pos({text_end_x},{channel_y})}}{channel_escaped}\\N\n")
+    bar_bg_width = video_width - _LOGO_CENTER_X
+    drawing = f"m 0 0 l {bar_bg_width} 0 l {bar_bg_width} {_BAR_HEIGHT} l 0 {_BAR_HEIGHT}"
+
+    # タイトル文字の概算幅
+    title_text_width = _ass_text_width(title, TITLE_BAR_FONT_SIZE)
+
+    # チャンネル名の背景矩形（ロゴ中心から文字の終わりまで）
+    # 文字幅を概算：「ひろゆきのつぶやき」= 9文字 × 45px ≈ 405px（半角は半分）
+    channel_text_width = _ass_text_width(channel_name, _CHANNEL_FONT_SIZE)
+    channel_bg_x_end = _TEXT_END_X + channel_text_width + 30  # 文字の終わり + マージン
+    channel_bg_width = channel_bg_x_end - _LOGO_CENTER_X
+
+    # 背景矩形の描画（相対座標で描画）
+    channel_bg_drawing = f"m 0 0 l {channel_bg_width} 0 l {channel_bg_width} {_CHANNEL_AREA_HEIGHT} l 0 {_CHANNEL_AREA_HEIGHT}"
+
+    # レイヤー順の要素一覧
+    elements = (
+        # Layer 0: タイトルバー背景（画面右端まで伸びる）
+        _Element("TitleBar", _LOGO_CENTER_X, _BAR_Y, _BAR_Y, _BAR_Y_BOTTOM,
+                 video_width, drawing, True),
+        # Layer 1: タイトルテキスト（左揃え、バーの中央）
+        _Element("TitleText", _TEXT_END_X, _TEXT_Y, _BAR_Y, _BAR_Y_BOTTOM,
+                 _TEXT_END_X + title_text_width, _escape_ass(title), False),
+        # Layer 2: チャンネル名背景（ロゴ中心から文字の終わりまで）
+        _Element("ChannelBg", _LOGO_CENTER_X, _CHANNEL_Y_TOP, _CHANNEL_Y_TOP, _CHANNEL_Y_BOTTOM,
+                 channel_bg_x_end, channel_bg_drawing, True),
+        # Layer 3: チャンネル名テキスト（左揃え）
+        _Element("ChannelName", _TEXT_END_X, _CHANNEL_Y, _CHANNEL_Y_TOP, _CHANNEL_Y_BOTTOM,
+                 _TEXT_END_X + channel_text_width, _escape_ass(channel_name), False),
+    )
+
+    # 全要素に共通の値
+    common = {
+        "slide_start": ass_time_format(slide_start),
+        "slide_end": ass_time_format(slide_end),
+        "total_end": ass_time_format(total_end),
+        "slide_ms": slide_ms,
+        "logo_center_x": _LOGO_CENTER_X,
+        "logo_clip_x": _LOGO_CENTER_X + 1,
+    }
+
+    def _fields(layer: int, elt: _Element) -> dict:
+        return {
+            **common,
+            **elt._asdict(),
+            "layer": layer,
+            "an": "" if elt.is_drawing else "\\an4",
+            "p": "\\p1" if elt.is_drawing else "",
+        }
+
+    # ASS文書は1回の走査で組み立て、最後に1回だけエンコードしてバイナリで書き出す
+    parts: List[str] = [_HEADER_TPL.format(video_width=video_width, video_height=video_height)]
+    for layer, elt in enumerate(elements):
+        fields = _fields(layer, elt)
+        parts.append(_MOVING_TPL.format_map(fields))
+        parts.append(_STATIC_TPL.format_map(fields))
+
+    Path(output_path).write_bytes("".join(parts).encode("utf-8"))
 
     print(f"✓ Generated title bar ASS file")
     print(f"  Title: {title}")
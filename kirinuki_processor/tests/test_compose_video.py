@@ -0,0 +1,58 @@
+"""動画合成のテスト"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from kirinuki_processor.steps import step6_compose_video
+
+
+class TestComposeVideoAutoCodec(unittest.TestCase):
+    """video_codec="auto" のテストケース"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.input_path = self._touch("clip.mp4", "dummy")
+
+    def _touch(self, name: str, content: str) -> str:
+        """一時ディレクトリにファイルを作る"""
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def _compose(self, overlays=None, can_copy=True) -> list:
+        """FFmpegを実行せずに組み立てたコマンドを返す"""
+        with mock.patch.object(step6_compose_video, "_can_stream_copy", return_value=can_copy), \
+                mock.patch.object(step6_compose_video, "get_video_resolution", return_value=(1920, 1080)), \
+                mock.patch.object(step6_compose_video, "_run_compose_command", return_value=True) as run:
+            self.assertTrue(step6_compose_video.compose_video(
+                self.input_path,
+                os.path.join(self.tmp.name, "out.mp4"),
+                overlays=overlays,
+                video_codec="auto",
+                quiet=True
+            ))
+        return run.call_args[0][0]
+
+    def test_stream_copy_without_overlays(self):
+        """合成要素が無くコンテナが対応していればストリームコピー"""
+        cmd = self._compose()
+        self.assertIn("copy", cmd)
+        self.assertNotIn("libx264", cmd)
+
+    def test_reencode_when_container_differs(self):
+        """コンテナが対応していなければlibx264で再エンコード"""
+        cmd = self._compose(can_copy=False)
+        self.assertIn("libx264", cmd)
+
+    def test_reencode_with_overlay(self):
+        """字幕を焼き込む場合はストリームコピーしない"""
+        cmd = self._compose(overlays=[self._touch("subs.ass", "[Script Info]\n")])
+        self.assertIn("libx264", cmd)
+        self.assertNotIn("copy", cmd)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""動画連結のテスト"""
+import subprocess
+import unittest
+from unittest import mock
+
+import main
+
+
+class TestConcatenateWithReencode(unittest.TestCase):
+    """再エンコード連結のテストケース"""
+
+    def _run(self, output_path: str) -> list:
+        """subprocess.run を差し替えて組み立てたコマンドを返す"""
+        signature = (
+            ("video", "vp9", 1920, 1080, "yuv420p", "30/1", None, None),
+            ("audio", "opus", None, None, None, "0/0", "48000", 2),
+        )
+        completed = subprocess.CompletedProcess(args=[], returncode=0, stderr=b"")
+        with mock.patch.object(main.subprocess, "run", return_value=completed) as run:
+            self.assertTrue(main._concatenate_with_reencode(
+                ["a.webm", "b.webm"], output_path, [signature, signature]
+            ))
+        return run.call_args[0][0]
+
+    def test_webm_args_are_strings(self):
+        """webm出力のコマンド引数がすべて文字列"""
+        cmd = self._run("out.webm")
+        self.assertTrue(all(isinstance(arg, str) for arg in cmd), cmd)
+        self.assertIn("libvpx-vp9", cmd)
+
+    def test_mp4_args_are_strings(self):
+        """mp4出力のコマンド引数がすべて文字列"""
+        cmd = self._run("out.mp4")
+        self.assertTrue(all(isinstance(arg, str) for arg in cmd), cmd)
+        self.assertIn("libx264", cmd)
+
+
+if __name__ == '__main__':
+    unittest.main()
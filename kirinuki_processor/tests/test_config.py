@@ -4,6 +4,7 @@ import tempfile
 import os
 from kirinuki_processor.steps.step0_config import (
     load_config_from_file,
+    load_config_cached,
     ClipConfig
 )
 
@@ -61,6 +62,25 @@ WEBM_PATH=/tmp/test.webm
             )
             config.validate()
 
+    def test_load_config_cached_reloads_on_change(self):
+        """キャッシュ読み込みはファイル更新後に読み直す"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            f.write("VIDEO_URL=https://www.youtube.com/watch?v=test123\nSTART_TIME=00:05:30\n")
+            config_path = f.name
+
+        try:
+            first = load_config_cached(config_path)
+            self.assertEqual(first.start_time, "00:05:30")
+            # 返り値はコピーなので変更しても次回に影響しない
+            first.start_time = "00:00:00"
+            self.assertEqual(load_config_cached(config_path).start_time, "00:05:30")
+
+            with open(config_path, 'w') as f:
+                f.write("VIDEO_URL=https://www.youtube.com/watch?v=test123\nSTART_TIME=01:00:00\nEND_TIME=01:10:00\n")
+            self.assertEqual(load_config_cached(config_path).start_time, "01:00:00")
+        finally:
+            os.remove(config_path)
+
 
 if __name__ == "__main__":
     unittest.main()
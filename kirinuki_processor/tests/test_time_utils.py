@@ -3,6 +3,8 @@ import unittest
 from kirinuki_processor.utils.time_utils import (
     parse_time,
     format_time,
+    format_time_s,
+    format_time_ms,
     srt_time_format,
     ass_time_format
 )
@@ -23,6 +25,18 @@ class TestTimeUtils(unittest.TestCase):
         self.assertEqual(parse_time("00:00"), 0.0)
         self.assertEqual(parse_time("05:30"), 330.0)
 
+    def test_parse_time_seconds_over_59(self):
+        """秒が60以上の書式も従来どおり受け付ける"""
+        self.assertEqual(parse_time("1:120"), 180.0)
+        self.assertEqual(parse_time("10:075"), 675.0)
+        self.assertEqual(parse_time("00:01:90.5"), 150.5)
+
+    def test_parse_time_invalid(self):
+        """不正な形式はValueError"""
+        for value in ("", "45", "1:2:3:4", "ab:cd", "01:23:4x"):
+            with self.assertRaises(ValueError):
+                parse_time(value)
+
     def test_format_time(self):
         """秒数から時間文字列への変換"""
         self.assertEqual(format_time(5025.5, include_ms=False), "01:23:45")
@@ -34,6 +48,12 @@ class TestTimeUtils(unittest.TestCase):
         result = format_time(5025.5, include_ms=True)
         self.assertTrue(result.startswith("01:23:45."))
 
+    def test_format_time_specialized(self):
+        """ミリ秒あり・なしの専用関数がformat_timeと一致する"""
+        for value in (0, 59.25, 3661, 5025.5):
+            self.assertEqual(format_time_s(value), format_time(value, include_ms=False))
+            self.assertEqual(format_time_ms(value), format_time(value, include_ms=True))
+
     def test_srt_time_format(self):
         """SRT形式の時間文字列"""
         result = srt_time_format(5025.5)
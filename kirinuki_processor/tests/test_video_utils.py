@@ -0,0 +1,65 @@
+"""動画ユーティリティのテスト"""
+import os
+import struct
+import tempfile
+import unittest
+from kirinuki_processor.utils.video_utils import read_matroska_duration
+
+
+def _element(element_id: bytes, payload: bytes) -> bytes:
+    """1バイトのサイズ表記でEBML要素を作る（テスト用）"""
+    return element_id + bytes([0x80 | len(payload)]) + payload
+
+
+def _webm(info_payload: bytes, segment_size: bytes = None) -> bytes:
+    """EBMLヘッダー + Segment(SeekHead, Info) の最小構成を作る"""
+    ebml_header = _element(b"\x1a\x45\xdf\xa3", _element(b"\x42\x82", b"webm"))
+    seek_head = _element(b"\x11\x4d\x9b\x74", b"\x00" * 4)
+    info = _element(b"\x15\x49\xa9\x66", info_payload)
+    children = seek_head + info
+    size = segment_size if segment_size is not None else bytes([0x80 | len(children)])
+    return ebml_header + b"\x18\x53\x80\x67" + size + children
+
+
+class TestReadMatroskaDuration(unittest.TestCase):
+    """Matroskaヘッダーからの長さ取得のテストケース"""
+
+    def _read(self, data: bytes):
+        fd, path = tempfile.mkstemp(suffix=".webm")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return read_matroska_duration(path)
+        finally:
+            os.remove(path)
+
+    def test_double_duration_default_scale(self):
+        """8バイトのDuration（既定のTimecodeScale=1ms）"""
+        info = _element(b"\x44\x89", struct.pack(">d", 12345.0))
+        self.assertAlmostEqual(self._read(_webm(info)), 12.345)
+
+    def test_float_duration_custom_scale(self):
+        """4バイトのDurationとTimecodeScaleの指定"""
+        info = (
+            _element(b"\x2a\xd7\xb1", (1_000_000_000).to_bytes(4, "big"))
+            + _element(b"\x44\x89", struct.pack(">f", 90.5))
+        )
+        self.assertAlmostEqual(self._read(_webm(info)), 90.5)
+
+    def test_unknown_segment_size(self):
+        """Segmentのサイズが不明（ライブ書き出し）でもInfoを読める"""
+        info = _element(b"\x44\x89", struct.pack(">d", 2000.0))
+        self.assertAlmostEqual(self._read(_webm(info, segment_size=b"\x01" + b"\xff" * 7)), 2.0)
+
+    def test_missing_duration(self):
+        """Durationが無ければNone"""
+        info = _element(b"\x2a\xd7\xb1", (1_000_000).to_bytes(3, "big"))
+        self.assertIsNone(self._read(_webm(info)))
+
+    def test_not_matroska(self):
+        """Matroska以外のファイルはNone"""
+        self.assertIsNone(self._read(b"\x00\x00\x00\x18ftypmp42"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+ファイルシステム関連のユーティリティ関数
+
+ディレクトリ作成やファイル削除で、余計な存在確認（stat）を省くための補助
+"""
+
+import os
+
+# このプロセスで作成（存在確認）済みのディレクトリ（絶対パス）
+_ensured_dirs: set = set()
+
+
+def ensure_dir(path: str) -> None:
+    """
+    ディレクトリが無ければ作成する（同じパスはプロセス内で1回だけ確認）
+
+    パイプラインの実行中にディレクトリが消されないことを前提にしている。
+    常駐プロセス（Whisperサーバーなど）から呼ばれる処理では os.makedirs を直接使うこと。
+
+    Args:
+        path: ディレクトリのパス（空文字列の場合は何もしない）
+    """
+    if not path:
+        return
+    key = os.path.abspath(path)
+    if key in _ensured_dirs:
+        return
+    os.makedirs(key, exist_ok=True)
+    _ensured_dirs.add(key)
+
+
+def ensure_parent_dir(file_path: str) -> None:
+    """
+    ファイルの親ディレクトリが無ければ作成する
+
+    Args:
+        file_path: 作成するファイルのパス
+    """
+    ensure_dir(os.path.dirname(file_path))
+
+
+def remove_if_exists(path: str) -> bool:
+    """
+    ファイル（シンボリックリンクを含む）を削除する。無ければ何もしない
+
+    存在確認と削除を分けず、unlinkの1回で済ませる。
+
+    Args:
+        path: 削除するファイルのパス
+
+    Returns:
+        bool: 削除したかどうか（元から無かった場合はFalse）
+    """
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
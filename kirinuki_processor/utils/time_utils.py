@@ -1,6 +1,15 @@
-"""時間変換ユーティリティ"""
-from datetime import timedelta
-from typing import Union
+"""
+時間変換ユーティリティ
+
+字幕・オーバーレイ生成で字幕行ごとに呼ばれるため、全関数に具体的な型注釈を付け、
+そのまま mypyc でコンパイルできる形に保っている（例: mypyc kirinuki_processor/utils/time_utils.py）。
+"""
+import re
+from functools import lru_cache
+from typing import Final, Pattern, Tuple
+
+# "hh:mm:ss" / "mm:ss"（秒は小数可）にマッチする時間文字列パターン
+_TIME_RE: Final[Pattern[str]] = re.compile(r"^\s*(?:(\d+):)?(\d+):(\d{1,2}(?:\.\d+)?)\s*$")
 
 
 def parse_time(time_str: str) -> float:
@@ -19,15 +28,47 @@ def parse_time(time_str: str) -> float:
         >>> parse_time("23:45")
         1425.0
     """
+    m = _TIME_RE.match(time_str)
+    if m is None:
+        # "1:120" のように秒が60以上の書式なども、従来どおり ":" で区切って解釈する
+        return _parse_time_split(time_str)
+
+    hours = int(m.group(1) or 0)
+    return float(hours * 3600 + int(m.group(2)) * 60) + float(m.group(3))
+
+
+def _parse_time_split(time_str: str) -> float:
+    """
+    時間文字列を ":" で区切って秒数に変換（正規表現に合わない書式用）
+
+    Args:
+        time_str: "hh:mm:ss" または "mm:ss" 形式の時間文字列
+
+    Returns:
+        秒数（float）
+    """
     parts = time_str.strip().split(":")
     if len(parts) == 3:
-        hours, minutes, seconds = parts
-        return float(hours) * 3600 + float(minutes) * 60 + float(seconds)
-    elif len(parts) == 2:
-        minutes, seconds = parts
-        return float(minutes) * 60 + float(seconds)
-    else:
-        raise ValueError(f"Invalid time format: {time_str}")
+        return float(parts[0]) * 3600 + float(parts[1]) * 60 + float(parts[2])
+    if len(parts) == 2:
+        return float(parts[0]) * 60 + float(parts[1])
+    raise ValueError(f"Invalid time format: {time_str}")
+
+
+def _hms(seconds: float) -> Tuple[int, int, int, float]:
+    """
+    秒数を時・分・秒・小数部に分解
+
+    Args:
+        seconds: 秒数
+
+    Returns:
+        (時, 分, 秒, 1秒未満の端数) のタプル
+    """
+    int_s = int(seconds)
+    hours, rem = divmod(int_s, 3600)
+    minutes, secs = divmod(rem, 60)
+    return hours, minutes, secs, seconds - int_s
 
 
 def format_time(seconds: float, include_ms: bool = True) -> str:
@@ -47,17 +88,45 @@ def format_time(seconds: float, include_ms: bool = True) -> str:
         >>> format_time(5025.5, include_ms=False)
         '01:23:45'
     """
-    td = timedelta(seconds=seconds)
-    total_seconds = int(td.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
-
     if include_ms:
-        ms = int((seconds - int(seconds)) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{ms:03d}"
-    else:
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        return format_time_ms(seconds)
+    return format_time_s(seconds)
+
+
+def format_time_s(seconds: float) -> str:
+    """
+    秒数を "hh:mm:ss" 形式に変換（ミリ秒なし）
+
+    Args:
+        seconds: 秒数
+
+    Returns:
+        "hh:mm:ss" 形式の文字列
+
+    Examples:
+        >>> format_time_s(5025.5)
+        '01:23:45'
+    """
+    hours, minutes, secs, _ = _hms(seconds)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def format_time_ms(seconds: float) -> str:
+    """
+    秒数を "hh:mm:ss.mmm" 形式に変換（ミリ秒付き）
+
+    Args:
+        seconds: 秒数
+
+    Returns:
+        "hh:mm:ss.mmm" 形式の文字列
+
+    Examples:
+        >>> format_time_ms(5025.5)
+        '01:23:45.500'
+    """
+    hours, minutes, secs, frac = _hms(seconds)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{int(frac * 1000):03d}"
 
 
 def srt_time_format(seconds: float) -> str:
@@ -74,8 +143,14 @@ def srt_time_format(seconds: float) -> str:
         >>> srt_time_format(5025.5)
         '01:23:45,500'
     """
-    time_str = format_time(seconds, include_ms=True)
-    return time_str.replace(".", ",")
+    # SRTはミリ秒精度なので、そこで丸めた値をキャッシュキーにする
+    return _srt_time_format_cached(round(seconds, 3))
+
+
+@lru_cache(maxsize=4096)
+def _srt_time_format_cached(seconds: float) -> str:
+    hours, minutes, secs, frac = _hms(seconds)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{round(frac * 1000):03d}"
 
 
 def ass_time_format(seconds: float) -> str:
@@ -92,11 +167,13 @@ def ass_time_format(seconds: float) -> str:
         >>> ass_time_format(5025.5)
         '1:23:45.50'
     """
-    td = timedelta(seconds=seconds)
-    total_seconds = int(td.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
-    centisecs = int((seconds - int(seconds)) * 100)
+    # ASSは1/100秒精度なので、そこで丸めた値をキャッシュキーにする
+    return _ass_time_format_cached(round(seconds, 2))
+
+
+@lru_cache(maxsize=4096)
+def _ass_time_format_cached(seconds: float) -> str:
+    hours, minutes, secs, frac = _hms(seconds)
+    centisecs = round(frac * 100)
 
     return f"{hours}:{minutes:02d}:{secs:02d}.{centisecs:02d}"
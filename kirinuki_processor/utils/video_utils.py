@@ -4,9 +4,165 @@
 FFmpegを使用した動画情報取得、解像度取得などの共通処理を提供
 """
 
+import json
+import logging
+import os
+import struct
 import subprocess
+from functools import lru_cache
 from typing import Optional
 
+try:
+    import orjson as _json  # 高速なJSONパーサ（任意依存）
+except ImportError:
+    _json = json
+
+
+log = logging.getLogger(__name__)
+
+# Matroska/WebMのEBML要素ID
+_EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+_MKV_SEGMENT = 0x18538067
+_MKV_INFO = 0x1549A966
+_MKV_CLUSTER = 0x1F43B675
+_MKV_TIMECODE_SCALE = 0x2AD7B1
+_MKV_DURATION = 0x4489
+
+# 長さを探すために読み込むファイル先頭の大きさ（Infoは通常先頭数KB以内にある）
+_MKV_HEADER_READ_SIZE = 256 * 1024
+
+
+def _read_ebml_vint(data: bytes, pos: int, keep_marker: bool) -> tuple:
+    """
+    EBMLの可変長整数を読む
+
+    Args:
+        data: バイト列
+        pos: 読み始める位置
+        keep_marker: 先頭の長さビットを残すか（要素IDはTrue、サイズはFalse）
+
+    Returns:
+        (値, 次の位置)。サイズが「不明」（全ビット1）の場合の値はNone
+    """
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        length += 1
+        mask >>= 1
+    if length > 8 or pos + length > len(data):
+        raise ValueError("invalid EBML variable-length integer")
+
+    value = first if keep_marker else first & (mask - 1)
+    for b in data[pos + 1:pos + length]:
+        value = (value << 8) | b
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return None, pos + length
+    return value, pos + length
+
+
+def read_matroska_duration(video_path: str) -> Optional[float]:
+    """
+    Matroska/WebMのヘッダー（Segment/Info/Duration）から動画の長さを読む
+
+    ffprobeを起動せず、ファイル先頭を読むだけで長さが分かる。
+    Matroskaでない場合やDurationが書かれていない場合（ライブ録画など）はNone。
+
+    Args:
+        video_path: 動画ファイルのパス
+
+    Returns:
+        動画の長さ（秒）。読み取れない場合はNone
+    """
+    try:
+        with open(video_path, "rb") as f:
+            data = f.read(_MKV_HEADER_READ_SIZE)
+    except OSError:
+        return None
+    if not data.startswith(_EBML_MAGIC):
+        return None
+
+    try:
+        # EBMLヘッダーを読み飛ばしてSegmentへ
+        pos = 0
+        element_id, pos = _read_ebml_vint(data, pos, keep_marker=True)
+        size, pos = _read_ebml_vint(data, pos, keep_marker=False)
+        pos += size
+        element_id, pos = _read_ebml_vint(data, pos, keep_marker=True)
+        if element_id != _MKV_SEGMENT:
+            return None
+        _, pos = _read_ebml_vint(data, pos, keep_marker=False)
+
+        # Segment直下の要素からInfoを探す（Clusterまで来たら諦める）
+        while pos < len(data):
+            element_id, pos = _read_ebml_vint(data, pos, keep_marker=True)
+            size, pos = _read_ebml_vint(data, pos, keep_marker=False)
+            if element_id == _MKV_CLUSTER or size is None:
+                return None
+            if element_id != _MKV_INFO:
+                pos += size
+                continue
+
+            timecode_scale = 1_000_000  # 既定値（ナノ秒単位、1ms）
+            duration = None
+            end = min(pos + size, len(data))
+            while pos < end:
+                child_id, pos = _read_ebml_vint(data, pos, keep_marker=True)
+                child_size, pos = _read_ebml_vint(data, pos, keep_marker=False)
+                payload = data[pos:pos + child_size]
+                if child_id == _MKV_TIMECODE_SCALE:
+                    timecode_scale = int.from_bytes(payload, "big")
+                elif child_id == _MKV_DURATION:
+                    if child_size == 4:
+                        duration = struct.unpack(">f", payload)[0]
+                    elif child_size == 8:
+                        duration = struct.unpack(">d", payload)[0]
+                pos += child_size
+            if duration is None or duration <= 0:
+                return None
+            return duration * timecode_scale / 1e9
+    except (IndexError, ValueError, TypeError, struct.error):
+        return None
+    return None
+
+
+def _ffprobe_json(video_path: str) -> dict:
+    """
+    ffprobeを1回だけ実行し、解像度と長さをまとめて取得
+
+    同じファイル（パス・更新時刻・サイズが一致）の結果はキャッシュを返す。
+
+    Args:
+        video_path: 動画ファイルのパス
+
+    Returns:
+        ffprobeのJSON出力（streams / format）
+
+    Raises:
+        FileNotFoundError: 動画ファイルが存在しない場合
+        subprocess.CalledProcessError: ffprobeが失敗した場合
+        ValueError: 出力がJSONとして解釈できない場合
+    """
+    st = os.stat(video_path)
+    # 相対パス・絶対パスの違いで同じファイルを二重にprobeしないよう絶対パスをキーにする
+    return _probe(os.path.abspath(video_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=32)
+def _probe(video_path: str, mtime_ns: int, size: int) -> dict:
+    """ffprobeの実行本体（mtime_ns/sizeはキャッシュキー用）"""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height:format=duration',
+        '-of', 'json',
+        video_path
+    ]
+    # orjsonはbytesをそのまま受け取れるのでデコードは不要
+    result = subprocess.run(cmd, capture_output=True, check=True)
+    return _json.loads(result.stdout)
+
 
 def get_video_duration(video_path: str) -> float:
     """
@@ -21,24 +177,22 @@ def get_video_duration(video_path: str) -> float:
     Raises:
         FileNotFoundError: 動画ファイルが存在しない場合
     """
+    # WebM/MKVはヘッダーに長さが書かれているので、ffprobeを起動せずに済む
+    duration = read_matroska_duration(video_path)
+    if duration is not None:
+        return duration
+
     try:
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return float(result.stdout.strip())
+        data = _ffprobe_json(video_path)
+        return float(data['format']['duration'])
     except subprocess.CalledProcessError as e:
-        print(f"Warning: FFprobe error for {video_path}: {e.stderr}")
+        log.warning("FFprobe error for %s: %s", video_path, e.stderr.decode(errors="replace"))
         return 0.0
     except FileNotFoundError:
-        print(f"Warning: Video file not found: {video_path}")
+        log.warning("Video file not found: %s", video_path)
         return 0.0
-    except ValueError as e:
-        print(f"Warning: Invalid duration value for {video_path}: {e}")
+    except (KeyError, ValueError) as e:
+        log.warning("Invalid duration value for %s: %s", video_path, e)
         return 0.0
 
 
@@ -56,22 +210,13 @@ def get_video_resolution(video_path: str) -> Optional[tuple]:
         FileNotFoundError: 動画ファイルが存在しない場合
     """
     try:
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-select_streams', 'v:0',
-            '-show_entries', 'stream=width,height',
-            '-of', 'csv=p=0',
-            video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        width, height = map(int, result.stdout.strip().split(','))
-        return (width, height)
+        stream = _ffprobe_json(video_path)['streams'][0]
+        return (int(stream['width']), int(stream['height']))
     except subprocess.CalledProcessError as e:
-        print(f"Warning: FFprobe error for {video_path}: {e.stderr}")
+        log.warning("FFprobe error for %s: %s", video_path, e.stderr.decode(errors="replace"))
         return None
-    except (ValueError, FileNotFoundError) as e:
-        print(f"Warning: Failed to get resolution for {video_path}: {e}")
+    except (KeyError, IndexError, ValueError, FileNotFoundError) as e:
+        log.warning("Failed to get resolution for %s: %s", video_path, e)
         return None
 
 
@@ -88,6 +233,7 @@ def get_video_info(video_path: str) -> dict:
     """
     info = {}
 
+    # 解像度・長さは同じffprobe結果（キャッシュ）から取り出す
     # 解像度取得
     resolution = get_video_resolution(video_path)
     if resolution:
@@ -0,0 +1,292 @@
+"""
+常駐Whisperサーバー
+
+Whisperモデルをメモリに載せたままUNIXドメインソケットで待ち受け、
+字幕生成ジョブを順番に処理する。prepare / step1 を繰り返し実行しても
+モデルの読み込み（数秒〜と数GBのメモリ確保）は初回の1回だけで済む。
+
+プロトコル: 1接続につき1行のJSONリクエストを受け取り、1行のJSONで応答する。
+    {"video": "...", "out": "...", "model_size": "large", "language": "ja", "compute_type": null}
+    → {"ok": true}
+    {"cmd": "preload", "model_size": "large", "compute_type": null}
+    → {"ok": true}
+    {"cmd": "shutdown"}
+    → {"ok": true}
+
+起動: python -m kirinuki_processor.whisper_server
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from kirinuki_processor.utils.fs_utils import remove_if_exists
+
+
+SOCKET_PATH = os.path.join(tempfile.gettempdir(), "kirinuki-whisper.sock")
+LOG_PATH = os.path.join(tempfile.gettempdir(), "kirinuki-whisper.log")
+
+# 一定時間ジョブが来なければ終了する（秒）
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+
+def _send(request: dict, timeout: Optional[float] = None) -> Optional[dict]:
+    """
+    サーバーにリクエストを送り、応答を返す
+
+    Args:
+        request: 送信するリクエスト
+        timeout: ソケットのタイムアウト（秒、Noneで無制限）
+
+    Returns:
+        応答の辞書。サーバーに接続できない場合はNone
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(SOCKET_PATH):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(SOCKET_PATH)
+            with sock.makefile("rw", encoding="utf-8") as stream:
+                stream.write(json.dumps(request, ensure_ascii=False) + "\n")
+                stream.flush()
+                line = stream.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+
+
+def is_running() -> bool:
+    """サーバーが起動して応答するかどうか"""
+    return _send({"cmd": "ping"}, timeout=2.0) is not None
+
+
+def ensure_whisper_server(wait_seconds: float = 30.0) -> bool:
+    """
+    サーバーが起動していなければバックグラウンドで起動し、待ち受け開始まで待つ
+
+    Args:
+        wait_seconds: 起動を待つ最大時間（秒）
+
+    Returns:
+        bool: サーバーが利用可能になったかどうか
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    if is_running():
+        return True
+
+    # 応答しない古いソケットファイルは削除しておく
+    remove_if_exists(SOCKET_PATH)
+
+    print(f"Starting Whisper server (log: {LOG_PATH})...")
+    with open(LOG_PATH, "a", encoding="utf-8") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "kirinuki_processor.whisper_server"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            # -m でパッケージを解決できるようにリポジトリ直下で起動する
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            start_new_session=True
+        )
+
+    deadline = time.monotonic() + wait_seconds
+    while time.monotonic() < deadline:
+        if is_running():
+            print("✓ Whisper server is ready")
+            return True
+        time.sleep(0.2)
+
+    print("  Warning: Whisper server did not start, transcribing in-process")
+    return False
+
+
+def shutdown_whisper_server() -> bool:
+    """
+    起動中のサーバーを停止する
+
+    Returns:
+        bool: 停止要求を送れたかどうか（起動していない場合はFalse）
+    """
+    return _send({"cmd": "shutdown"}, timeout=5.0) is not None
+
+
+def preload_model(model_size: str = "large", compute_type: Optional[str] = None) -> Optional[bool]:
+    """
+    サーバーにモデルの先読みを依頼する（読み込みが終わるまで戻らない）
+
+    Args:
+        model_size: Whisperモデルのサイズ
+        compute_type: faster-whisperのcompute_type
+
+    Returns:
+        読み込みに成功したかどうか。サーバーが起動していない場合はNone
+    """
+    response = _send({"cmd": "preload", "model_size": model_size, "compute_type": compute_type})
+    if response is None:
+        return None
+    return bool(response.get("ok"))
+
+
+def request_transcription(
+    video_path: str,
+    output_path: str,
+    model_size: str = "large",
+    language: str = "ja",
+    compute_type: Optional[str] = None
+) -> Optional[bool]:
+    """
+    サーバーに字幕生成を依頼する
+
+    Args:
+        video_path: 動画ファイルのパス
+        output_path: 出力するSRTファイルのパス
+        model_size: Whisperモデルのサイズ
+        language: 言語コード
+        compute_type: faster-whisperのcompute_type
+
+    Returns:
+        生成に成功したかどうか。サーバーが起動していない場合はNone
+    """
+    if not os.path.exists(SOCKET_PATH):
+        return None
+
+    print(f"Transcribing with Whisper server (progress: {LOG_PATH})...")
+    response = _send({
+        # サーバーは別のカレントディレクトリで動いている可能性があるため絶対パスで渡す
+        "video": os.path.abspath(video_path),
+        "out": os.path.abspath(output_path),
+        "model_size": model_size,
+        "language": language,
+        "compute_type": compute_type,
+    })
+    if response is None:
+        return None
+    return bool(response.get("ok"))
+
+
+def _handle(request: dict) -> dict:
+    """1件のリクエストを処理して応答を返す"""
+    from kirinuki_processor.steps.step1_generate_subtitles import (
+        generate_subtitles_with_whisper,
+        preload_whisper_model
+    )
+
+    if request.get("cmd") == "preload":
+        success = preload_whisper_model(
+            request.get("model_size", "large"),
+            compute_type=request.get("compute_type")
+        )
+        return {"ok": success}
+
+    success = generate_subtitles_with_whisper(
+        request["video"],
+        request["out"],
+        model_size=request.get("model_size", "large"),
+        language=request.get("language", "ja"),
+        compute_type=request.get("compute_type"),
+        use_server=False
+    )
+    return {"ok": success}
+
+
+def _serve_connection(conn: socket.socket) -> bool:
+    """
+    1つの接続のリクエストを処理して応答する
+
+    Args:
+        conn: 受け付けた接続
+
+    Returns:
+        終了が要求された場合True
+
+    Raises:
+        OSError: クライアントが切断していて応答を書き込めない場合など
+    """
+    with conn.makefile("rw", encoding="utf-8") as stream:
+        line = stream.readline()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            stream.write(json.dumps({"ok": False, "error": "invalid request"}) + "\n")
+            return False
+
+        cmd = request.get("cmd")
+        if cmd == "ping":
+            stream.write(json.dumps({"ok": True}) + "\n")
+            return False
+        if cmd == "shutdown":
+            stream.write(json.dumps({"ok": True}) + "\n")
+            print("Shutdown requested", flush=True)
+            return True
+
+        try:
+            response = _handle(request)
+        except Exception as e:
+            print(f"✗ Job failed: {e}", flush=True)
+            response = {"ok": False, "error": str(e)}
+        stream.write(json.dumps(response, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    return False
+
+
+def serve(idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """
+    ソケットで待ち受け、ジョブを1件ずつ処理する
+
+    Args:
+        idle_timeout: ジョブが来ないまま経過したら終了する時間（秒）
+    """
+    remove_if_exists(SOCKET_PATH)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(SOCKET_PATH)
+    server.listen()
+    server.settimeout(idle_timeout)
+    print(f"✓ Whisper server listening on {SOCKET_PATH}", flush=True)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                print("Idle timeout reached, shutting down", flush=True)
+                break
+
+            # ジョブ中にクライアントが切断しても、読み込んだモデルを保ったまま待ち受けを続ける
+            try:
+                with conn:
+                    shutdown = _serve_connection(conn)
+            except OSError as e:
+                print(f"✗ Client connection lost: {e}", flush=True)
+                continue
+            if shutdown:
+                break
+    finally:
+        server.close()
+        remove_if_exists(SOCKET_PATH)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="KIRINUKI resident Whisper server")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help=f"Exit after this many idle seconds (default: {DEFAULT_IDLE_TIMEOUT})"
+    )
+    args = parser.parse_args()
+    serve(idle_timeout=args.idle_timeout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
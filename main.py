@@ -9,96 +9,263 @@ import os
 import sys
 import argparse
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, List, Optional
 
 # モジュールパスを追加
 sys.path.insert(0, str(Path(__file__).parent))
 
 from kirinuki_processor.steps.step0_config import (
-    load_config_from_file,
+    load_config_cached,
     create_sample_config,
-    ClipConfig
+    ClipConfig,
+    PipelinePaths
 )
 from kirinuki_processor.steps.step0_download_clip import download_and_clip_video
-from kirinuki_processor.steps.step1_generate_subtitles import (
-    generate_subtitles_with_whisper,
-    convert_srt_to_ass
-)
-from kirinuki_processor.steps.step1_5_fix_subtitles import fix_subtitle_file
-from kirinuki_processor.steps.step3_fetch_chat import fetch_chat
-from kirinuki_processor.steps.step4_extract_chat import load_and_extract_chat
-from kirinuki_processor.steps.step5_generate_overlay import (
-    generate_overlay_from_file,
-    OverlayConfig
-)
-from kirinuki_processor.steps.step6_compose_video import compose_video
-from kirinuki_processor.steps.step_title_bar import generate_title_bar
-from kirinuki_processor.steps.step7_generate_description import generate_youtube_description
 from kirinuki_processor.utils.video_utils import get_video_duration
+from kirinuki_processor.utils.fs_utils import ensure_dir, ensure_parent_dir, remove_if_exists
+from kirinuki_processor.whisper_server import ensure_whisper_server, shutdown_whisper_server, preload_model
+from kirinuki_processor.cache import audio_fingerprint, load_cached_transcript, store_transcript
 from kirinuki_processor.constants import (
     DEFAULT_CROP_CRF,
     DEFAULT_CROP_BITRATE,
+    DEFAULT_CROP_DEADLINE,
+    DEFAULT_CROP_CPU_USED,
     DEFAULT_VIDEO_DURATION_FALLBACK
 )
 import subprocess
 import re
-import glob
+import fnmatch
 import shutil
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+# 各ステップのモジュール（Whisper・Groqなど重い依存を含む）は使う関数の中でimportする。
+# init や --help の起動を速くするため、ここでは軽いモジュールだけを読み込む。
+
+# prepare で同時に処理するクリップ数の上限
+_MAX_PARALLEL_CLIPS = 4
+
+# Whisperは1つずつ実行する（GPUメモリにモデルを複数載せないため）。
+# ダウンロードやチャット取得は他のクリップのWhisperと並行して進む。
+_WHISPER_LOCK = threading.Lock()
+
+# 連鎖したクリップ間で同じURLのチャット取得を1回にまとめるためのロック
+_SHARED_CHAT_LOCK = threading.Lock()
+
+# NEXT_CONFIGで連結できる設定ファイルの最大数
+_MAX_CONFIG_CHAIN = 32
+
+# 字幕ファイルを読み込むときのバッファサイズ（大きなチャットオーバーレイ向け）
+_READ_BUFFER_SIZE = 1 << 20
+
+# これ以上のサイズのファイルはcopy_file_rangeでコピーする（16 MiB）
+_FAST_COPY_THRESHOLD = 16 << 20
+
+# タイトルからフォルダ名を作るときに置き換える文字
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# 複数のショート設定を同時に生成する数の上限
+_MAX_PARALLEL_SHORTS = 2
 
-# ショート動画生成モジュール（独立モジュール）
-from shorts import generate_short_video
+# NVENCの同時セッション数の上限（一般向けGPUでは3〜5に制限されている）
+# generate_shorts_multi は出力（シーン）ごとに1セッションを使う
+_MAX_NVENC_SESSIONS = 3
 
+# ショート設定の行ごとの文字色（TOP_TEXT_LINE2_COLOR → (TOP, 2)）
+# 行番号は1始まり。LINE0 や LINE01 のような0始まりの番号は無視する
+_LINE_COLOR_KEY_RE = re.compile(r'^(TOP|BOTTOM)_TEXT_LINE([1-9]\d*)_COLOR$')
 
-def concatenate_videos(video_paths: list, output_path: str) -> bool:
+# ショート設定のシーンキー（SCENE1_START → (1, START)）
+# SCENE01 のような0埋めの番号は無視する（SCENE1 と衝突させない）
+_SCENE_KEY_RE = re.compile(r'^SCENE(0|[1-9]\d*)_(START|END)$')
+
+
+# concatデマルチプレクサで連結できるか判定するときに比べるストリームの属性
+_CONCAT_STREAM_KEYS = (
+    "codec_type", "codec_name", "width", "height", "pix_fmt",
+    "r_frame_rate", "sample_rate", "channels"
+)
+
+
+def _stream_signature(video_path: str) -> Optional[tuple]:
     """
-    複数の動画を連結する
+    ストリーム構成（コーデック・解像度・fpsなど）を比較用のタプルで返す
+
+    Args:
+        video_path: 動画ファイルのパス
+
+    Returns:
+        ストリームごとの属性のタプル。取得できない場合はNone
+    """
+    from kirinuki_processor.steps.step6_compose_video import get_video_info
+
+    streams = get_video_info(video_path).get("streams")
+    if not streams:
+        return None
+    return tuple(
+        tuple(stream.get(key) for key in _CONCAT_STREAM_KEYS)
+        for stream in streams
+        if stream.get("codec_type") in ("video", "audio")
+    )
+
+
+def _concatenate_with_reencode(video_paths: list, output_path: str, signatures: list) -> bool:
+    """
+    ストリーム構成が揃っていない動画をconcatフィルタで再エンコードして連結する
 
     Args:
         video_paths: 動画ファイルのパスリスト
         output_path: 出力ファイルのパス
+        signatures: 各動画の _stream_signature() の戻り値
 
     Returns:
         成功した場合True
     """
+    # 解像度・fpsは先頭の動画に揃える
+    first_video = next((s for s in signatures[0] if s[0] == "video"), None)
+    if first_video is None:
+        print("FFmpeg error: first input has no video stream")
+        return False
+    width, height = first_video[2], first_video[3]
+    fps = first_video[5] or "30"
+    # 全入力に音声がある場合だけ音声も連結する
+    with_audio = all(any(s[0] == "audio" for s in sig) for sig in signatures)
+
+    cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error']
+    for video_path in video_paths:
+        cmd.extend(['-i', video_path])
+
+    filters = []
+    concat_inputs = []
+    for i in range(len(video_paths)):
+        filters.append(
+            f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps}[v{i}]"
+        )
+        concat_inputs.append(f"[v{i}]")
+        if with_audio:
+            filters.append(f"[{i}:a]aresample=48000[a{i}]")
+            concat_inputs.append(f"[a{i}]")
+    audio_count = 1 if with_audio else 0
+    filters.append(
+        f"{''.join(concat_inputs)}concat=n={len(video_paths)}:v=1:a={audio_count}[v]"
+        + ("[a]" if with_audio else "")
+    )
+    cmd.extend(['-filter_complex', ";".join(filters), '-map', '[v]'])
+    if with_audio:
+        cmd.extend(['-map', '[a]'])
+
+    if output_path.lower().endswith(".webm"):
+        cmd.extend([
+            '-c:v', 'libvpx-vp9',
+            '-crf', str(DEFAULT_CROP_CRF),
+            '-b:v', str(DEFAULT_CROP_BITRATE),
+            '-deadline', DEFAULT_CROP_DEADLINE,
+            '-cpu-used', str(DEFAULT_CROP_CPU_USED),
+            '-row-mt', '1',
+            '-c:a', 'libopus'
+        ])
+    else:
+        cmd.extend(['-c:v', 'libx264', '-preset', 'medium', '-crf', '23', '-c:a', 'aac', '-b:a', '128k'])
+    cmd.append(output_path)
+
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        print(f"FFmpeg error: {result.stderr.decode(errors='replace')}")
+        return False
+    return True
+
+
+def concatenate_videos(video_paths: Iterable[str], output_path: str) -> bool:
+    """
+    複数の動画を連結する
+
+    ストリーム構成が全入力で一致していればconcatデマルチプレクサで
+    再エンコードせずに連結し、異なる場合だけ再エンコードで連結する。
+    連結リストは一時ファイルを作らずFFmpegの標準入力に渡す。
+
+    Args:
+        video_paths: 動画ファイルのパス（リスト以外のイテラブルも可）
+        output_path: 出力ファイルのパス
+
+    Returns:
+        成功した場合True
+    """
+    video_paths = list(video_paths)
+    if not video_paths:
+        print("Error concatenating videos: no input files")
+        return False
     if len(video_paths) == 1:
-        # 1つだけの場合はコピー
-        shutil.copy2(video_paths[0], output_path)
+        # 1つだけの場合はリンク（作れなければコピー）
+        link_or_copy(video_paths[0], output_path)
         return True
 
-    # FFmpegの連結リストファイルを作成
-    concat_list_path = output_path + ".concat_list.txt"
+    # 出力先が前回のリンクのままだとリンク先の動画を上書きしてしまうので外しておく
+    remove_if_exists(output_path)
+
+    # 入力ごとに1回だけffprobeし、構成が揃っていなければストリームコピーできない
+    signatures = [_stream_signature(p) for p in video_paths]
+    if all(signatures) and len(set(signatures)) > 1:
+        print("  Input streams differ, re-encoding while concatenating...")
+        try:
+            return _concatenate_with_reencode(video_paths, output_path, signatures)
+        except Exception as e:
+            print(f"Error concatenating videos: {e}")
+            return False
+
+    # FFmpegの連結リストは一時ファイルに書かず、標準入力から渡す
+    # （絶対パスで指定するので、リストの場所からの相対解決は起きない）
+    # パスにシングルクォートやスペースがある場合のエスケープ処理
+    concat_list = "".join(
+        "file '{}'\n".format(os.path.abspath(video_path).replace("'", "'\\''"))
+        for video_path in video_paths
+    ).encode("utf-8")
+
     try:
-        with open(concat_list_path, 'w', encoding='utf-8') as f:
-            for video_path in video_paths:
-                # 絶対パスに変換
-                abs_path = os.path.abspath(video_path)
-                # パスにシングルクォートやスペースがある場合のエスケープ処理
-                escaped_path = abs_path.replace("'", "'\\''")
-                f.write(f"file '{escaped_path}'\n")
-
-        # FFmpegで連結
         cmd = [
             'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'error',
             '-f', 'concat',
             '-safe', '0',
-            '-i', concat_list_path,
+            '-protocol_whitelist', 'file,pipe',
+            '-i', 'pipe:0',
             '-c', 'copy',
             output_path
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # 進捗表示は捨て、エラー出力だけを受け取る
+        result = subprocess.run(cmd, input=concat_list, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         if result.returncode != 0:
-            print(f"FFmpeg error: {result.stderr}")
+            print(f"FFmpeg error: {result.stderr.decode(errors='replace')}")
             return False
 
         return True
     except Exception as e:
         print(f"Error concatenating videos: {e}")
         return False
-    finally:
-        # 一時ファイルを削除
-        if os.path.exists(concat_list_path):
-            os.remove(concat_list_path)
+
+
+def _iter_srt_entries(lines: Iterable[str]) -> Iterator[tuple]:
+    """
+    SRTの行を順に読み、(開始時刻, 終了時刻, テキスト) を1エントリずつ返す
+
+    番号行 → 時刻行 → 空行までのテキスト行 の順に読むだけなので正規表現は使わない。
+    時刻行の形式が合わないエントリは読み飛ばす。
+    """
+    it = iter(lines)
+    for line in it:
+        if not line.strip().isdigit():
+            continue
+        start, sep, end = next(it, '').strip().partition(' --> ')
+        text_lines = []
+        for text_line in it:
+            if not text_line.strip():
+                break
+            text_lines.append(text_line.rstrip('\n'))
+        if sep:
+            yield start, end, '\n'.join(text_lines)
 
 
 def merge_subtitle_files(subtitle_paths: list, output_path: str) -> bool:
@@ -113,39 +280,28 @@ def merge_subtitle_files(subtitle_paths: list, output_path: str) -> bool:
         成功した場合True
     """
     try:
-        merged_subtitles = []
+        out = []
         subtitle_index = 1
-        time_offset = 0.0
+        # 浮動小数の誤差が積み重ならないよう、オフセットは整数ミリ秒で持つ
+        time_offset_ms = 0
 
         for i, srt_path in enumerate(subtitle_paths):
-            if not os.path.exists(srt_path):
+            # SRTファイルを1エントリずつ読み込み（テキストモードなので改行コードは\nに揃う。BOMは読み飛ばす）
+            # 存在確認は呼び出し側のディレクトリ走査で済んでいるので、ここでは開けなければ飛ばすだけにする
+            try:
+                f = open(srt_path, 'r', encoding='utf-8-sig', buffering=_READ_BUFFER_SIZE)
+            except FileNotFoundError:
                 print(f"Warning: Subtitle file not found: {srt_path}")
                 continue
-
-            # SRTファイルを読み込み
-            with open(srt_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # SRT形式のエントリを解析
-            # パターン: 番号\n時刻 --> 時刻\n字幕テキスト
-            pattern = r'(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n((?:.*\n)*?)(?:\n|$)'
-            matches = re.findall(pattern, content)
-
-            for match in matches:
-                _, start_time, end_time, text = match
-
-                # 時刻をパース
-                start_ms = parse_srt_time(start_time) + time_offset * 1000
-                end_ms = parse_srt_time(end_time) + time_offset * 1000
-
-                # 新しい字幕エントリを追加
-                merged_subtitles.append({
-                    'index': subtitle_index,
-                    'start': format_srt_time(start_ms),
-                    'end': format_srt_time(end_ms),
-                    'text': text.strip()
-                })
-                subtitle_index += 1
+            with f:
+                for start_time, end_time, text in _iter_srt_entries(f):
+                    try:
+                        start = format_srt_time(parse_srt_time(start_time) + time_offset_ms)
+                        end = format_srt_time(parse_srt_time(end_time) + time_offset_ms)
+                    except ValueError:
+                        continue
+                    out.append(f"{subtitle_index}\n{start} --> {end}\n{text.strip()}\n\n")
+                    subtitle_index += 1
 
             # 次のクリップのためのオフセットを更新
             # 対応する動画の長さを取得
@@ -153,18 +309,15 @@ def merge_subtitle_files(subtitle_paths: list, output_path: str) -> bool:
             video_path = srt_path.replace('subs_clip', 'clip').replace('.srt', '.webm')
             if os.path.exists(video_path):
                 duration = get_video_duration(video_path)
-                time_offset += duration
             else:
                 print(f"Warning: Could not find video file for subtitle: {video_path}")
                 # デフォルト値を使用（動画長さ取得失敗時のフォールバック）
-                time_offset += DEFAULT_VIDEO_DURATION_FALLBACK
+                duration = DEFAULT_VIDEO_DURATION_FALLBACK
+            time_offset_ms += round(duration * 1000)
 
-        # マージした字幕をファイルに書き込み
+        # マージした字幕をまとめて1回で書き込み
         with open(output_path, 'w', encoding='utf-8') as f:
-            for sub in merged_subtitles:
-                f.write(f"{sub['index']}\n")
-                f.write(f"{sub['start']} --> {sub['end']}\n")
-                f.write(f"{sub['text']}\n\n")
+            f.write(''.join(out))
 
         return True
     except Exception as e:
@@ -172,7 +325,7 @@ def merge_subtitle_files(subtitle_paths: list, output_path: str) -> bool:
         return False
 
 
-def parse_srt_time(time_str: str) -> float:
+def parse_srt_time(time_str: str) -> int:
     """SRT時刻文字列をミリ秒に変換"""
     # 00:00:00,000
     h, m, s_ms = time_str.split(':')
@@ -197,7 +350,7 @@ def merge_ass_overlays(overlay_paths: list, output_path: str, video_paths: list)
     複数のASS字幕オーバーレイを時間オフセットを考慮してマージ
 
     Args:
-        overlay_paths: オーバーレイファイルのパスリスト
+        overlay_paths: オーバーレイファイルのパスリスト（video_pathsと同じ並び。無いクリップはNone）
         output_path: 出力ファイルのパス
         video_paths: 対応する動画ファイルのパスリスト（時間オフセット計算用）
 
@@ -205,52 +358,53 @@ def merge_ass_overlays(overlay_paths: list, output_path: str, video_paths: list)
         成功した場合True
     """
     try:
-        # ASSファイルのヘッダーとイベントを分離してマージ
-        header = None
-        all_events = []
+        # ヘッダーは最初のファイルのものを使い、イベント行は1行ずつ読みながら書き出す
+        header_written = False
+        format_written = False
         time_offset = 0.0
 
-        for i, ass_path in enumerate(overlay_paths):
-            if not os.path.exists(ass_path):
-                print(f"Warning: Overlay file not found: {ass_path}")
-                continue
-
-            with open(ass_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # [Events]セクションを探す
-            parts = content.split('[Events]')
-            if len(parts) != 2:
-                continue
-
-            # 最初のファイルからヘッダーを取得
-            if header is None:
-                header = parts[0] + '[Events]'
-
-            # イベント行を取得
-            events_section = parts[1]
-            event_lines = events_section.strip().split('\n')
-
-            for line in event_lines:
-                if line.startswith('Dialogue:'):
-                    # Dialogue行のタイムスタンプを調整
-                    adjusted_line = adjust_ass_dialogue_time(line, time_offset)
-                    all_events.append(adjusted_line)
-                elif line.startswith('Format:'):
-                    # Formatは最初の1回だけ
-                    if i == 0:
-                        all_events.insert(0, line)
-
-            # 次のクリップのためのオフセットを更新
-            duration = get_video_duration(video_paths[i])
-            time_offset += duration
-
-        # マージしたASSファイルを書き込み
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(header)
-            f.write('\n')
-            for event in all_events:
-                f.write(event + '\n')
+        with open(output_path, 'w', encoding='utf-8') as out:
+            for ass_path, video_path in zip(overlay_paths, video_paths):
+                # オフセットはファイル単位で一定なので、センチ秒への変換は1回だけ行う
+                offset_cs = round(time_offset * 100)
+                # 次のクリップのためのオフセットは、オーバーレイの有無に関わらず動画の長さだけ進める
+                # （WebMはヘッダーから長さを読むのでffprobeは起動しない）
+                time_offset += get_video_duration(video_path)
+                if not ass_path:
+                    continue
+
+                try:
+                    f = open(ass_path, 'r', encoding='utf-8', buffering=_READ_BUFFER_SIZE)
+                except FileNotFoundError:
+                    print(f"Warning: Overlay file not found: {ass_path}")
+                    continue
+
+                in_events = False
+                header = []
+                with f:
+                    for line in f:
+                        if not in_events:
+                            header.append(line)
+                            if line.startswith('[Events]'):
+                                in_events = True
+                                if not header_written:
+                                    out.writelines(header)
+                                    header_written = True
+                            continue
+
+                        if line.startswith('Dialogue:'):
+                            # Dialogue行のタイムスタンプを調整（最初のクリップはずらす必要がない）
+                            if offset_cs:
+                                line = _shift_dialogue_line(line.rstrip('\n'), offset_cs) + '\n'
+                            out.write(line if line.endswith('\n') else line + '\n')
+                        elif line.startswith('Format:') and not format_written:
+                            # Formatは最初の1回だけ
+                            out.write(line.rstrip('\n') + '\n')
+                            format_written = True
+
+        if not header_written:
+            print("Error merging ASS overlays: no [Events] section found")
+            return False
 
         return True
     except Exception as e:
@@ -269,22 +423,24 @@ def adjust_ass_dialogue_time(dialogue_line: str, offset_seconds: float) -> str:
     Returns:
         調整後のDialogue行
     """
+    return _shift_dialogue_line(dialogue_line, round(offset_seconds * 100))
+
+
+def _shift_dialogue_line(dialogue_line: str, offset_cs: int) -> str:
+    """Dialogue行のStart・Endをセンチ秒単位のオフセットだけずらす（マージのループ用）"""
     # Dialogue: Layer,Start,End,Style,Name,MarginL,MarginR,MarginV,Effect,Text
-    parts = dialogue_line.split(',', 9)
-    if len(parts) < 10:
+    if dialogue_line.count(',') < 9:
         return dialogue_line
 
-    # Start時刻とEnd時刻を調整
-    start_time = parts[1]
-    end_time = parts[2]
-
-    adjusted_start = adjust_ass_time(start_time, offset_seconds)
-    adjusted_end = adjust_ass_time(end_time, offset_seconds)
+    # Start・End は1〜3番目のカンマの間にあるので、分割せずに位置だけ探す
+    c1 = dialogue_line.find(',')
+    c2 = dialogue_line.find(',', c1 + 1)
+    c3 = dialogue_line.find(',', c2 + 1)
 
-    parts[1] = adjusted_start
-    parts[2] = adjusted_end
+    adjusted_start = _shift_ass_time(dialogue_line[c1 + 1:c2], offset_cs)
+    adjusted_end = _shift_ass_time(dialogue_line[c2 + 1:c3], offset_cs)
 
-    return ','.join(parts)
+    return f"{dialogue_line[:c1 + 1]}{adjusted_start},{adjusted_end}{dialogue_line[c3:]}"
 
 
 def adjust_ass_time(time_str: str, offset_seconds: float) -> str:
@@ -298,24 +454,29 @@ def adjust_ass_time(time_str: str, offset_seconds: float) -> str:
     Returns:
         調整後の時刻文字列
     """
-    # h:mm:ss.cc を解析
-    match = re.match(r'(\d+):(\d{2}):(\d{2})\.(\d{2})', time_str)
-    if not match:
+    return _shift_ass_time(time_str, round(offset_seconds * 100))
+
+
+def _shift_ass_time(time_str: str, offset_cs: int) -> str:
+    """ASS時刻文字列をセンチ秒単位のオフセットだけずらす"""
+    # h:mm:ss.cc を解析（浮動小数を介さず整数のセンチ秒で計算する）
+    try:
+        h, m, s_cs = time_str.split(':')
+        s, cs = s_cs.split('.')
+        total_cs = int(h) * 360000 + int(m) * 6000 + int(s) * 100 + int(cs)
+    except ValueError:
         return time_str
 
-    h, m, s, cs = map(int, match.groups())
-    total_seconds = h * 3600 + m * 60 + s + cs / 100.0
-    total_seconds += offset_seconds
+    total_cs += offset_cs
 
     # 負の値にならないようにする
-    if total_seconds < 0:
-        total_seconds = 0
+    if total_cs < 0:
+        total_cs = 0
 
     # 時刻文字列に戻す
-    new_h = int(total_seconds // 3600)
-    new_m = int((total_seconds % 3600) // 60)
-    new_s = int(total_seconds % 60)
-    new_cs = int((total_seconds % 1) * 100)
+    new_h, total_cs = divmod(total_cs, 360000)
+    new_m, total_cs = divmod(total_cs, 6000)
+    new_s, new_cs = divmod(total_cs, 100)
 
     return f"{new_h}:{new_m:02d}:{new_s:02d}.{new_cs:02d}"
 
@@ -337,12 +498,14 @@ def crop_video(input_path: str, output_path: str, crop_top: float, crop_bottom:
     Returns:
         成功した場合True
     """
-    # クロップ設定がすべて0の場合はコピーのみ
+    # クロップ設定がすべて0の場合はリンク（作れなければコピー）のみ
     if crop_top == 0 and crop_bottom == 0 and crop_left == 0 and crop_right == 0:
-        import shutil
-        shutil.copy2(input_path, output_path)
+        link_or_copy(input_path, output_path)
         return True
 
+    # 出力先が前回のリンクのままだと、FFmpegがリンク先（入力の元動画）を上書きしてしまうので外しておく
+    remove_if_exists(output_path)
+
     try:
         # 動画の解像度を取得
         cmd_probe = [
@@ -385,18 +548,25 @@ def crop_video(input_path: str, output_path: str, crop_top: float, crop_bottom:
 
         cmd = [
             'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'error',
             '-i', input_path,
             '-vf', ",".join(filters),
             '-c:v', 'libvpx-vp9',
             '-crf', str(DEFAULT_CROP_CRF),
             '-b:v', str(DEFAULT_CROP_BITRATE),
+            '-deadline', DEFAULT_CROP_DEADLINE,
+            '-cpu-used', str(DEFAULT_CROP_CPU_USED),
+            '-row-mt', '1',
             '-c:a', 'copy',
             output_path
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # 進捗表示は捨て、エラー出力だけを受け取る（デコードは失敗時のみ）
+        result = subprocess.run(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
         if result.returncode != 0:
-            print(f"FFmpeg crop error: {result.stderr}")
+            print(f"FFmpeg crop error: {result.stderr.decode(errors='replace')}")
             return False
 
         return True
@@ -411,14 +581,203 @@ def crop_video(input_path: str, output_path: str, crop_top: float, crop_bottom:
         return False
 
 
+def _banner(*lines: str, leading_blank: bool = False) -> None:
+    """
+    区切り線で囲んだ見出しを1回の書き込みで出力する
+
+    Args:
+        *lines: 区切り線の間に表示する行
+        leading_blank: Trueの場合は前に空行を入れる
+    """
+    rule = "=" * 60
+    text = "\n".join([rule, *lines, rule]) + "\n"
+    sys.stdout.write("\n" + text if leading_blank else text)
+
+
+def _mtime_or_none(path: str) -> Optional[float]:
+    """
+    ファイルの更新時刻を1回のstatで取得する（存在しなければNone）
+
+    Args:
+        path: ファイルパス
+
+    Returns:
+        更新時刻。ファイルが存在しない場合はNone
+    """
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _srt_hash_matches(srt_path: str, ass_path: str) -> bool:
+    """
+    ASSが現在のSRTの内容から生成されたものか判定する
+
+    更新時刻ではなく内容のハッシュで比較するため、touchやgit checkoutで
+    更新時刻だけが変わった場合は再生成しない。
+
+    Args:
+        srt_path: 元のSRTファイル
+        ass_path: 生成済みのASSファイル
+
+    Returns:
+        ASSのヘッダーに記録されたハッシュがSRTと一致すればTrue
+    """
+    from kirinuki_processor.steps.step1_generate_subtitles import SRT_HASH_PREFIX, srt_content_hash
+
+    try:
+        with open(srt_path, "rb") as f:
+            expected = SRT_HASH_PREFIX + srt_content_hash(f.read())
+        with open(ass_path, "r", encoding="utf-8") as f:
+            head = [f.readline().rstrip("\n") for _ in range(2)]
+    except OSError:
+        return False
+    return expected in head
+
+
+def _reusable_output(path: str, *inputs: str) -> bool:
+    """
+    以前の実行（prepareなど）で生成されたファイルをそのまま使えるか判定する
+
+    空でなく、入力（設定ファイルなど）のどれよりも新しければ再利用できるとみなす。
+
+    Args:
+        path: 生成済みファイルのパス
+        *inputs: 生成に使った入力ファイルのパス（存在しないものは無視）
+
+    Returns:
+        再利用できる場合True
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    if st.st_size == 0:
+        return False
+    for input_path in inputs:
+        m_input = _mtime_or_none(input_path)
+        if m_input is not None and st.st_mtime < m_input:
+            return False
+    return True
+
+
+def _ensure_styled_ass(srt_path: str, ass_path: str, style: Optional[str] = None) -> Optional[str]:
+    """
+    SRTから作ったスタイル付きASSを用意し、合成に使うパスを返す
+
+    ASSのヘッダーに記録されたハッシュがSRTと一致すれば変換を省略する。
+
+    Args:
+        srt_path: 元のSRTファイル（存在することが分かっているもの）
+        ass_path: 生成するASSファイル
+        style: 字幕スタイル（"bold"なら太字版があればそちらを使う）
+
+    Returns:
+        使用するASSのパス。ASSを用意できなかった場合はNone（呼び出し側でSRTを使う）
+    """
+    from kirinuki_processor.steps.step1_generate_subtitles import convert_srt_to_ass
+
+    try:
+        # ハッシュが一致した＝ASSを読めたので、存在確認を兼ねる
+        has_ass = _srt_hash_matches(srt_path, ass_path)
+        if not has_ass:
+            print("  Updating styled subtitles from edited SRT...")
+            convert_srt_to_ass(srt_path, ass_path)
+            has_ass = True
+    except Exception as e:
+        print(f"  Warning: Failed to regenerate ASS from SRT: {e}")
+        has_ass = _mtime_or_none(ass_path) is not None
+
+    if not has_ass:
+        return None
+    if style == "bold":
+        # 太字版は指定されたときだけ確認する
+        bold_variant = ass_path.replace(".ass", "_bold.ass")
+        if _mtime_or_none(bold_variant) is not None:
+            return bold_variant
+    return ass_path
+
+
+def _snapshot_dir(directory: str) -> set:
+    """
+    ディレクトリ内のファイル名を1回の走査でまとめて取得する
+
+    同じディレクトリに対してos.path.existsを何度も呼ぶ代わりに使う。
+
+    Args:
+        directory: 対象ディレクトリ
+
+    Returns:
+        ファイル名の集合（ディレクトリが無ければ空集合）
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def download_clip_for_config(config: Any, output_path: str) -> bool:
+    """
+    設定に従って切り抜き区間をダウンロードする
+
+    SEGMENT_MODE が有効なら yt-dlp の --download-sections で区間のセグメントだけを取得する
+    （--download-sections が使えない場合は自動で全体ダウンロードに切り替わる）。
+    無効なら全体をダウンロードしてからFFmpegで切り抜く。
+
+    Args:
+        config: ClipConfig
+        output_path: 出力ファイルパス
+
+    Returns:
+        成功したかどうか
+    """
+    return download_and_clip_video(
+        config.video_url,
+        config.start_time,
+        config.end_time,
+        output_path,
+        download_full=not getattr(config, "segment_mode", True)
+    )
+
+
+def link_or_copy(src: str, dst: str) -> None:
+    """
+    dstをsrcへのシンボリックリンクにする（作れなければコピー）
+
+    クロップなしのclip.webmのように中身が同じファイルを、数GBのコピーをせずに用意する。
+    既存のdstは先に削除する（リンク越しにsrcを書き換えないため）。
+    ハードリンクはsrcとinodeを共有し、後でdstを上書きするとsrcまで壊れるので使わない。
+
+    Args:
+        src: 元ファイルのパス
+        dst: 作成するファイルのパス
+    """
+    if os.path.abspath(src) == os.path.abspath(dst):
+        return
+    remove_if_exists(dst)
+    try:
+        os.symlink(os.path.abspath(src), dst)
+        return
+    except (OSError, NotImplementedError):
+        pass
+    # Windowsでシンボリックリンクの権限が無い場合など
+    shutil.copyfile(src, dst)
+
+
+def _has_crop(config: Any) -> bool:
+    """設定にクロップ指定があるかどうか"""
+    return (config.crop_top_percent != 0 or config.crop_bottom_percent != 0 or
+            config.crop_left_percent != 0 or config.crop_right_percent != 0)
+
+
 def apply_crop_or_copy(raw_video_path: str, cropped_path: str, config: Any) -> Optional[str]:
     """
     クロップ設定に応じてクロップを適用し、出力パスを返す（クロップなしならコピー）
     """
-    has_crop = (config.crop_top_percent != 0 or config.crop_bottom_percent != 0 or
-                config.crop_left_percent != 0 or config.crop_right_percent != 0)
     try:
-        if has_crop:
+        if _has_crop(config):
             print(f"\n[Crop] Applying crop settings...")
             print(f"  Top: {config.crop_top_percent}%, Bottom: {config.crop_bottom_percent}%")
             print(f"  Left: {config.crop_left_percent}%, Right: {config.crop_right_percent}%")
@@ -436,110 +795,186 @@ def apply_crop_or_copy(raw_video_path: str, cropped_path: str, config: Any) -> O
                 print("✗ Failed to crop video")
                 return None
         else:
-            import shutil
-            shutil.copy2(raw_video_path, cropped_path)
+            link_or_copy(raw_video_path, cropped_path)
         return cropped_path
     except Exception as e:
         print(f"✗ Error in cropping: {e}")
         return None
 
 
-def process_single_clip(config: Any, clip_index: int) -> tuple:
+def generate_subtitles_cached(
+    video_path: str,
+    subs_path: str,
+    model_size: str = "large",
+    language: str = "ja",
+    compute_type: Optional[str] = None
+) -> bool:
     """
-    単一のクリップを処理する（chained config用のヘルパー関数）
+    Whisper字幕を生成する（同じ音声・設定の結果がキャッシュにあれば再利用）
 
     Args:
-        config: ClipConfig オブジェクト
-        clip_index: クリップ番号（0始まり）
+        video_path: 切り抜き済み動画のパス
+        subs_path: 出力するSRTファイルのパス
+        model_size: Whisperモデルのサイズ
+        language: 言語コード
+        compute_type: faster-whisperのcompute_type
 
     Returns:
-        tuple: (video_path, subs_path, chat_overlay_path)
+        bool: 字幕を用意できたかどうか
     """
-    suffix = "" if clip_index == 0 else f"_{clip_index}"
+    from kirinuki_processor.steps.step1_generate_subtitles import (
+        generate_subtitles_with_whisper,
+        convert_srt_to_ass,
+        transcription_settings_key
+    )
 
-    # ファイルパスを定義
-    clip_video_path = os.path.join(config.temp_dir, f"clip{suffix}.webm")
-    clip_video_raw_path = os.path.join(config.temp_dir, f"clip{suffix}_raw.webm")
-    subs_clip_path = os.path.join(config.temp_dir, f"subs_clip{suffix}.srt")
-    chat_full_path = os.path.join(config.temp_dir, f"chat_full{suffix}.json")
-    chat_clip_path = os.path.join(config.temp_dir, f"chat_clip{suffix}.json")
-    chat_overlay_path = os.path.join(config.temp_dir, f"chat_overlay{suffix}.ass")
+    fingerprint = None
+    try:
+        fingerprint = audio_fingerprint(
+            video_path, model_size, language, settings=transcription_settings_key(compute_type)
+        )
+        if load_cached_transcript(fingerprint, subs_path):
+            print(f"✓ Reusing cached transcript ({fingerprint})")
+            # 同じ字幕から作ったASSが残っていれば作り直さない
+            subs_ass_path = subs_path.replace(".srt", ".ass")
+            if not _srt_hash_matches(subs_path, subs_ass_path):
+                convert_srt_to_ass(subs_path, subs_ass_path)
+            return True
+    except Exception as e:
+        print(f"  Warning: Transcript cache unavailable: {e}")
+
+    success = generate_subtitles_with_whisper(
+        video_path,
+        subs_path,
+        model_size=model_size,
+        language=language,
+        compute_type=compute_type
+    )
+    if success and fingerprint:
+        store_transcript(fingerprint, subs_path)
+    return success
 
-    print(f"\n{'='*60}")
-    print(f"Processing Clip {clip_index + 1}")
-    print(f"{'='*60}")
 
-    # 動画ファイルのパスを決定
-    if config.auto_download:
-        print(f"\n[Clip {clip_index + 1}] Downloading and clipping video from YouTube...")
+def _chat_source_path(chat_full_path: str) -> str:
+    """チャットの取得元（動画URL）を記録するファイルのパス"""
+    return chat_full_path + ".src"
+
+
+def _chat_fetched_from(chat_full_path: str, video_url: str) -> bool:
+    """
+    保存済みのチャットが同じ動画URLから取得したものか判定する
+
+    一時ディレクトリは設定ファイル間で共有されるため、更新時刻ではなく
+    取得時に記録したURLで判定する（チャットは動画全体なので区間は関係しない）。
+
+    Args:
+        chat_full_path: 取得済みチャットのパス
+        video_url: YouTube動画のURL
+
+    Returns:
+        再利用できる場合True
+    """
+    try:
+        if os.path.getsize(chat_full_path) == 0:
+            return False
+        with open(_chat_source_path(chat_full_path), "r", encoding="utf-8") as f:
+            return f.read() == video_url
+    except OSError:
+        return False
+
+
+def _record_chat_source(chat_full_path: str, video_url: str) -> None:
+    """取得したチャットの取得元（動画URL）を記録する"""
+    with open(_chat_source_path(chat_full_path), "w", encoding="utf-8") as f:
+        f.write(video_url)
+
+
+def _fetch_chat_shared(video_url: str, chat_full_path: str, shared_fetches: Optional[dict]) -> bool:
+    """
+    チャットを取得する。同じURLを既に別のクリップが取得している（または取得中の）場合はコピーする
+
+    Args:
+        video_url: YouTube動画のURL
+        chat_full_path: 取得したチャットの保存先
+        shared_fetches: URL→取得結果（保存先パスのFuture）の辞書。Noneの場合は常に取得する
+
+    Returns:
+        bool: チャットを用意できたかどうか
+    """
+    from kirinuki_processor.steps.step3_fetch_chat import fetch_chat
+
+    # 取得し直す間は前回の取得元の記録を消しておく（途中で失敗したファイルを再利用しないため）
+    remove_if_exists(_chat_source_path(chat_full_path))
+
+    if shared_fetches is None:
+        success = fetch_chat(video_url, chat_full_path)
+        if success:
+            _record_chat_source(chat_full_path, video_url)
+        return success
+
+    with _SHARED_CHAT_LOCK:
+        future = shared_fetches.get(video_url)
+        owner = future is None
+        if owner:
+            future = shared_fetches[video_url] = Future()
+
+    if owner:
         try:
-            success = download_and_clip_video(
-                config.video_url,
-                config.start_time,
-                config.end_time,
-                clip_video_raw_path,
-                download_full=False
-            )
-            if not success:
-                print(f"✗ Failed to download and clip video for clip {clip_index + 1}")
-                return None, None, None
-            raw_video_path = clip_video_raw_path
+            success = fetch_chat(video_url, chat_full_path)
         except Exception as e:
-            print(f"✗ Error downloading clip {clip_index + 1}: {e}")
-            return None, None, None
-    else:
-        print(f"\n[Clip {clip_index + 1}] Using existing video file")
-        if not config.webm_path:
-            print("✗ WEBM_PATH is required when AUTO_DOWNLOAD=false")
-            return None, None, None
-        raw_video_path = config.webm_path
+            future.set_exception(e)
+            raise
+        if success:
+            _record_chat_source(chat_full_path, video_url)
+        future.set_result(chat_full_path if success else None)
+        return success
 
-    # クロップ処理を適用
-    has_crop = (config.crop_top_percent != 0 or config.crop_bottom_percent != 0 or
-                config.crop_left_percent != 0 or config.crop_right_percent != 0)
+    fetched_path = future.result()
+    if fetched_path is None:
+        return False
+    print(f"  Reusing chat fetched for the same video: {os.path.basename(fetched_path)}")
+    shutil.copyfile(fetched_path, chat_full_path)
+    _record_chat_source(chat_full_path, video_url)
+    return True
 
-    if has_crop:
-        print(f"\n[Clip {clip_index + 1}] Applying crop settings...")
-        print(f"  Top: {config.crop_top_percent}%, Bottom: {config.crop_bottom_percent}%")
-        print(f"  Left: {config.crop_left_percent}%, Right: {config.crop_right_percent}%")
-        cropped = apply_crop_or_copy(raw_video_path, clip_video_path, config)
-        if not cropped:
-            print(f"✗ Failed to crop video for clip {clip_index + 1}")
-            return None, None, None
-        video_source_path = cropped
-        print(f"✓ Video cropped successfully")
-    else:
-        # クロップ不要の場合はコピー
-        shutil.copy2(raw_video_path, clip_video_path)
-        video_source_path = clip_video_path
 
-    # ステップ1: Whisper字幕生成
-    print(f"\n[Clip {clip_index + 1}] Generating subtitles with Whisper...")
-    try:
-        success = generate_subtitles_with_whisper(
-            video_source_path,
-            subs_clip_path,
-            model_size="large",
-            language="ja"
-        )
-        if not success:
-            print("  Note: Failed to generate subtitles")
-    except Exception as e:
-        print(f"✗ Error in subtitle generation: {e}")
+def _chat_chain(
+    config: Any,
+    clip_index: int,
+    chat_full_path: str,
+    chat_clip_path: str,
+    chat_overlay_path: str,
+    shared_fetches: Optional[dict] = None
+) -> Optional[str]:
+    """
+    チャット取得 → 区間抽出 → オーバーレイ生成を順に実行する（Whisperと並行して実行する用）
+
+    Args:
+        config: ClipConfig
+        clip_index: クリップ番号（0始まり、ログ表示用）
+        chat_full_path: 取得したチャットの保存先
+        chat_clip_path: 抽出したチャットの保存先
+        chat_overlay_path: オーバーレイ（ASS）の保存先
+        shared_fetches: 連鎖したクリップ間で共有するチャット取得結果（_fetch_chat_shared 参照）
+
+    Returns:
+        生成したオーバーレイのパス。チャットが無い場合などはNone
+    """
+    from kirinuki_processor.steps.step4_extract_chat import load_and_extract_chat
+    from kirinuki_processor.steps.step5_generate_overlay import generate_overlay_from_file, OverlayConfig
 
     # ステップ2: チャット取得
-    print(f"\n[Clip {clip_index + 1}] Fetching live chat from YouTube...")
     try:
-        success = fetch_chat(config.video_url, chat_full_path)
-        if not success:
+        if not _fetch_chat_shared(config.video_url, chat_full_path, shared_fetches):
             print("  Note: Chat replay not available")
             chat_full_path = None
     except Exception as e:
         print(f"✗ Error fetching chat: {e}")
         chat_full_path = None
 
+    # 各ステップは成功時に必ず出力ファイルを書くので、存在確認はせず戻り値で判断する
     # ステップ3: チャット抽出
-    if chat_full_path and os.path.exists(chat_full_path):
+    if chat_full_path:
         print(f"\n[Clip {clip_index + 1}] Extracting chat messages for clip...")
         try:
             count = load_and_extract_chat(
@@ -561,7 +996,7 @@ def process_single_clip(config: Any, clip_index: int) -> tuple:
         chat_clip_path = None
 
     # ステップ4: オーバーレイ生成
-    if chat_clip_path and os.path.exists(chat_clip_path):
+    if chat_clip_path:
         print(f"\n[Clip {clip_index + 1}] Generating chat overlay (ASS)...")
         try:
             overlay_config = OverlayConfig()
@@ -579,95 +1014,283 @@ def process_single_clip(config: Any, clip_index: int) -> tuple:
         print(f"\n[Clip {clip_index + 1}] Skipped overlay generation (no chat available)")
         chat_overlay_path = None
 
+    return chat_overlay_path
+
+
+def _start_whisper_preload(config: Any, compute_type: Optional[str] = None) -> threading.Thread:
+    """
+    Whisperモデルの読み込みをバックグラウンドで始める
+
+    最初のクリップのダウンロード中にモデルを読み込んでおき、Whisperの待ち時間を減らす。
+    常駐サーバーが起動していればサーバー側で、いなければこのプロセスで読み込む。
+
+    Args:
+        config: ClipConfig（WHISPER_MODELの指定を使う）
+        compute_type: faster-whisperのcompute_type（Noneの場合は自動選択）
+
+    Returns:
+        先読みを実行しているスレッド
+    """
+    def preload() -> None:
+        from kirinuki_processor.steps.step1_generate_subtitles import (
+            pick_whisper_model,
+            preload_whisper_model
+        )
+
+        model_size = config.whisper_model or pick_whisper_model()
+        if preload_model(model_size, compute_type=compute_type) is None:
+            preload_whisper_model(model_size, compute_type=compute_type)
+
+    thread = threading.Thread(target=preload, name="whisper-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def _prepare_clip_video(config: Any, clip_index: int, paths: PipelinePaths) -> Optional[str]:
+    """
+    クリップ動画をダウンロード（または既存ファイルを使用）し、クロップを適用する
+
+    Args:
+        config: ClipConfig オブジェクト
+        clip_index: クリップ番号（0始まり）
+        paths: クリップのファイルパス
+
+    Returns:
+        クロップ済み動画のパス。失敗した場合はNone
+    """
+    # 動画ファイルのパスを決定
+    if config.auto_download:
+        print(f"\n[Clip {clip_index + 1}] Downloading and clipping video from YouTube...")
+        try:
+            success = download_clip_for_config(config, paths.clip_video_raw)
+            if not success:
+                print(f"✗ Failed to download and clip video for clip {clip_index + 1}")
+                return None
+            raw_video_path = paths.clip_video_raw
+        except Exception as e:
+            print(f"✗ Error downloading clip {clip_index + 1}: {e}")
+            return None
+    else:
+        print(f"\n[Clip {clip_index + 1}] Using existing video file")
+        if not config.webm_path:
+            print("✗ WEBM_PATH is required when AUTO_DOWNLOAD=false")
+            return None
+        raw_video_path = config.webm_path
+
+    # クロップ処理を適用
+    if _has_crop(config):
+        print(f"\n[Clip {clip_index + 1}] Applying crop settings...")
+        print(f"  Top: {config.crop_top_percent}%, Bottom: {config.crop_bottom_percent}%")
+        print(f"  Left: {config.crop_left_percent}%, Right: {config.crop_right_percent}%")
+        cropped = apply_crop_or_copy(raw_video_path, paths.clip_video, config)
+        if not cropped:
+            print(f"✗ Failed to crop video for clip {clip_index + 1}")
+            return None
+        video_source_path = cropped
+        print(f"✓ Video cropped successfully")
+    else:
+        # クロップ不要の場合はリンク（作れなければコピー）
+        link_or_copy(raw_video_path, paths.clip_video)
+        video_source_path = paths.clip_video
+
+    return video_source_path
+
+
+def process_single_clip(
+    config: Any,
+    clip_index: int,
+    compute_type: Optional[str] = None,
+    shared_fetches: Optional[dict] = None
+) -> tuple:
+    """
+    単一のクリップを処理する（chained config用のヘルパー関数）
+
+    Args:
+        config: ClipConfig オブジェクト
+        clip_index: クリップ番号（0始まり）
+        compute_type: faster-whisperのcompute_type（Noneの場合は自動選択）
+        shared_fetches: 同じURLのチャット取得を1回にまとめるための辞書（任意）
+
+    Returns:
+        tuple: (video_path, subs_path, chat_overlay_path)（生成できなかったものはNone）
+    """
+    from kirinuki_processor.steps.step1_generate_subtitles import pick_whisper_model
+
+    # ファイルパスを定義
+    paths = PipelinePaths.from_config(config, clip_index)
+    subs_clip_path = paths.subs_clip
+    chat_full_path = paths.chat_full
+    chat_clip_path = paths.chat_clip
+    chat_overlay_path = paths.chat_overlay
+
+    _banner(f"Processing Clip {clip_index + 1}", leading_blank=True)
+
+    # ステップ2〜4（チャット取得・抽出・オーバーレイ生成）は動画を使わないので、
+    # 最初にワーカースレッドで開始し、ダウンロード・クロップ・Whisperと並行して進める
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        print(f"\n[Clip {clip_index + 1}] Fetching live chat from YouTube (in background)...")
+        chat_future = executor.submit(
+            _chat_chain, config, clip_index, chat_full_path, chat_clip_path, chat_overlay_path,
+            shared_fetches
+        )
+        video_source_path = _prepare_clip_video(config, clip_index, paths)
+        if video_source_path is None:
+            return None, None, None
+
+        # ステップ1: Whisper字幕生成（チャット処理と違いCPU/GPUを使うのでこのスレッドで実行）
+        print(f"\n[Clip {clip_index + 1}] Generating subtitles with Whisper...")
+        try:
+            with _WHISPER_LOCK:
+                success = generate_subtitles_cached(
+                    video_source_path,
+                    subs_clip_path,
+                    model_size=config.whisper_model or pick_whisper_model(),
+                    language="ja",
+                    compute_type=compute_type
+                )
+            if not success:
+                print("  Note: Failed to generate subtitles")
+                subs_clip_path = None
+        except Exception as e:
+            print(f"✗ Error in subtitle generation: {e}")
+            subs_clip_path = None
+
+        # ステップ2〜4: チャット処理の完了を待つ
+        try:
+            chat_overlay_path = chat_future.result()
+        except Exception as e:
+            print(f"✗ Error processing chat: {e}")
+            chat_overlay_path = None
+
     return video_source_path, subs_clip_path, chat_overlay_path
 
 
-def run_prepare_pipeline(config_path: str) -> bool:
+def _load_config_chain(config_path: str, verbose: bool = False) -> Optional[list]:
     """
-    素材準備パイプライン（字幕生成まで、動画合成は行わない）
-    NEXT_CONFIGが指定されている場合、連鎖的に複数のクリップを処理する
+    NEXT_CONFIGをたどって連鎖した設定をすべて読み込む
+
+    パスはrealpathで正規化してから循環参照を判定するため、
+    シンボリックリンクや相対パスの違いによる自己参照も検出できる。
+    各ファイルの読み込みは load_config_cached で更新が無ければ再利用する。
 
     Args:
-        config_path: 設定ファイルのパス
+        config_path: 最初の設定ファイルのパス
+        verbose: 読み込んだ設定の内容を表示するか
 
     Returns:
-        成功したかどうか
+        設定のリスト。読み込みに失敗した場合はNone
     """
-    print("=" * 60)
-    print("KIRINUKI Processor - Prepare Materials")
-    print("=" * 60)
-
-    # ステップ0: 設定読み込み（連鎖チェック）
-    print("\n[Step 0] Loading configuration...")
     configs = []
     current_config_path = config_path
     visited_configs = set()
 
-    # 連鎖設定をすべて読み込む
     while current_config_path:
         # 循環参照チェック
-        if current_config_path in visited_configs:
+        real_path = os.path.realpath(current_config_path)
+        if real_path in visited_configs:
             print(f"✗ Error: Circular reference detected in config chain: {current_config_path}")
-            return False
-        visited_configs.add(current_config_path)
+            return None
+        if len(configs) >= _MAX_CONFIG_CHAIN:
+            print(f"✗ Error: Config chain is longer than {_MAX_CONFIG_CHAIN} files")
+            return None
+        visited_configs.add(real_path)
 
-        # 設定ファイルを読み込み
         try:
-            config = load_config_from_file(current_config_path)
-            configs.append(config)
+            config = load_config_cached(current_config_path)
+        except Exception as e:
+            print(f"✗ Failed to load configuration {current_config_path}: {e}")
+            return None
+        configs.append(config)
+
+        if verbose:
             print(f"✓ Configuration loaded: {current_config_path}")
             print(f"  Video URL: {config.video_url}")
             print(f"  Start time: {config.start_time}")
             print(f"  End time: {config.end_time or 'Not specified'}")
-
-            # 次の設定ファイルをチェック
             if config.next_config:
                 print(f"  → Next config: {config.next_config}")
-                current_config_path = config.next_config
-            else:
-                current_config_path = None
-        except Exception as e:
-            print(f"✗ Failed to load configuration {current_config_path}: {e}")
-            return False
+
+        # 次の設定ファイル
+        current_config_path = config.next_config
+
+    return configs
+
+
+def run_prepare_pipeline(config_path: str, compute_type: Optional[str] = None) -> bool:
+    """
+    素材準備パイプライン（字幕生成まで、動画合成は行わない）
+    NEXT_CONFIGが指定されている場合、連鎖的に複数のクリップを処理する
+
+    Args:
+        config_path: 設定ファイルのパス
+        compute_type: faster-whisperのcompute_type（Noneの場合は自動選択）
+
+    Returns:
+        成功したかどうか
+    """
+    _banner("KIRINUKI Processor - Prepare Materials")
+
+    # ステップ0: 設定読み込み（連鎖チェック）
+    print("\n[Step 0] Loading configuration...")
+    configs = _load_config_chain(config_path, verbose=True)
+    if configs is None:
+        return False
 
     print(f"\n✓ Total clips to process: {len(configs)}")
 
     # 出力・一時ディレクトリを作成（最初のconfigの設定を使用）
     base_config = configs[0]
-    os.makedirs(base_config.output_dir, exist_ok=True)
-    os.makedirs(base_config.temp_dir, exist_ok=True)
-
-    # 各クリップを処理
-    all_clips = []
-    for i, config in enumerate(configs):
-        result = process_single_clip(config, i)
-        if result[0] is None:
-            print(f"✗ Failed to process clip {i + 1}")
-            return False
-        all_clips.append(result)
+    ensure_dir(base_config.output_dir)
+    ensure_dir(base_config.temp_dir)
+
+    # Whisperモデルを常駐サーバーに載せておく（2回目以降の実行ではモデル読み込みを省略）
+    # 初回の読み込みもダウンロードと並行して始めておく
+    ensure_whisper_server()
+    _start_whisper_preload(base_config, compute_type=compute_type)
+
+    # 各クリップを並行して処理（出力ファイルはクリップ番号で分かれているので衝突しない）
+    # 同じ動画から複数の区間を切り抜く場合、チャットは最初のクリップで1回だけ取得する
+    all_clips = [None] * len(configs)
+    shared_fetches = {}
+    with ThreadPoolExecutor(max_workers=min(len(configs), _MAX_PARALLEL_CLIPS)) as executor:
+        futures = {
+            executor.submit(
+                process_single_clip, config, i,
+                compute_type=compute_type, shared_fetches=shared_fetches
+            ): i
+            for i, config in enumerate(configs)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                all_clips[i] = future.result()
+            except Exception as e:
+                print(f"✗ Error processing clip {i + 1}: {e}")
+
+    failed = [i + 1 for i, result in enumerate(all_clips) if result is None or result[0] is None]
+    if failed:
+        print(f"✗ Failed to process clip(s): {', '.join(map(str, failed))}")
+        return False
 
     # 結果サマリー
-    print("\n" + "=" * 60)
-    print("✓ Preparation completed successfully!")
-    print(f"\nProcessed {len(all_clips)} clip(s):")
+    summary = ["✓ Preparation completed successfully!", f"\nProcessed {len(all_clips)} clip(s):"]
     for i, (video_path, subs_path, chat_path) in enumerate(all_clips):
-        suffix = "" if i == 0 else f"_{i}"
-        print(f"\nClip {i + 1}:")
-        print(f"  Video: clip{suffix}.webm")
-        if os.path.exists(subs_path):
-            print(f"  Subtitles: subs_clip{suffix}.srt")
-        if chat_path and os.path.exists(chat_path):
-            print(f"  Chat overlay: chat_overlay{suffix}.ass")
-
-    print("\n📝 Next steps:")
+        summary.append(f"\nClip {i + 1}:")
+        summary.append(f"  Video: {os.path.basename(video_path)}")
+        if subs_path:
+            summary.append(f"  Subtitles: {os.path.basename(subs_path)}")
+        if chat_path:
+            summary.append(f"  Chat overlay: {os.path.basename(chat_path)}")
+
+    summary.append("\n📝 Next steps:")
     if len(all_clips) > 1:
-        print(f"  1. Edit subtitles if needed (subs_clip.srt, subs_clip_1.srt, ...)")
-        print(f"  2. Run: python main.py compose {config_path}")
-        print(f"     → This will concatenate all {len(all_clips)} clips into one video")
+        summary.append(f"  1. Edit subtitles if needed (subs_clip.srt, subs_clip_1.srt, ...)")
+        summary.append(f"  2. Run: python main.py compose {config_path}")
+        summary.append(f"     → This will concatenate all {len(all_clips)} clips into one video")
     else:
-        print(f"  1. Edit subtitles: {os.path.join(base_config.temp_dir, 'subs_clip.srt')}")
-        print(f"  2. Run: python main.py compose {config_path}")
-    print("=" * 60)
+        summary.append(f"  1. Edit subtitles: {PipelinePaths.from_config(base_config).subs_clip}")
+        summary.append(f"  2. Run: python main.py compose {config_path}")
+    _banner(*summary, leading_blank=True)
 
     return True
 
@@ -688,14 +1311,17 @@ def run_resub_pipeline(config_path: str) -> bool:
     Returns:
         bool: 成功した場合True
     """
-    print("=" * 60)
-    print("KIRINUKI PROCESSOR - RESUB PIPELINE")
-    print("=" * 60)
+    from kirinuki_processor.steps.step1_generate_subtitles import (
+        generate_subtitles_with_whisper,
+        pick_whisper_model
+    )
+
+    _banner("KIRINUKI PROCESSOR - RESUB PIPELINE")
     print("\nThis will regenerate subtitles with Whisper")
     print("Make sure you have already run 'prepare' command.\n")
 
     # 設定ファイルを読み込み
-    config = load_config_from_file(config_path)
+    config = load_config_cached(config_path)
 
     # 一時ディレクトリを確認
     if not os.path.exists(config.temp_dir):
@@ -704,8 +1330,9 @@ def run_resub_pipeline(config_path: str) -> bool:
         return False
 
     # ファイルパスを定義
-    clip_video_path = os.path.join(config.temp_dir, "clip.webm")
-    subs_clip_path = os.path.join(config.temp_dir, "subs_clip.srt")
+    paths = PipelinePaths.from_config(config)
+    clip_video_path = paths.clip_video
+    subs_clip_path = paths.subs_clip
 
     # clip.webmの存在確認
     if not os.path.exists(clip_video_path):
@@ -719,7 +1346,7 @@ def run_resub_pipeline(config_path: str) -> bool:
         success = generate_subtitles_with_whisper(
             clip_video_path,
             subs_clip_path,
-            model_size="large",
+            model_size=config.whisper_model or pick_whisper_model(),
             language="ja"
         )
         if not success:
@@ -729,9 +1356,7 @@ def run_resub_pipeline(config_path: str) -> bool:
         print(f"✗ Error in Step 1: {e}")
         return False
 
-    print("\n" + "=" * 60)
-    print("RESUB PIPELINE COMPLETED!")
-    print("=" * 60)
+    _banner("RESUB PIPELINE COMPLETED!", leading_blank=True)
     print("\nNext steps:")
     print(f"  1. Check subtitles: {subs_clip_path}")
     print(f"  2. Run: python main.py compose {config_path}")
@@ -757,14 +1382,15 @@ def run_rechat_pipeline(config_path: str) -> bool:
     Returns:
         bool: 成功した場合True
     """
-    print("=" * 60)
-    print("KIRINUKI PROCESSOR - RECHAT PIPELINE")
-    print("=" * 60)
+    from kirinuki_processor.steps.step4_extract_chat import load_and_extract_chat
+    from kirinuki_processor.steps.step5_generate_overlay import generate_overlay_from_file, OverlayConfig
+
+    _banner("KIRINUKI PROCESSOR - RECHAT PIPELINE")
     print("\nThis will regenerate chat overlay with new CHAT_DELAY_SECONDS setting")
     print("Make sure you have already run 'prepare' command.\n")
 
     # 設定ファイルを読み込み
-    config = load_config_from_file(config_path)
+    config = load_config_cached(config_path)
 
     # 一時ディレクトリを確認
     if not os.path.exists(config.temp_dir):
@@ -773,9 +1399,10 @@ def run_rechat_pipeline(config_path: str) -> bool:
         return False
 
     # ファイルパスを定義
-    chat_full_path = os.path.join(config.temp_dir, "chat_full.json")
-    chat_clip_path = os.path.join(config.temp_dir, "chat_clip.json")
-    chat_overlay_path = os.path.join(config.temp_dir, "chat_overlay.ass")
+    paths = PipelinePaths.from_config(config)
+    chat_full_path = paths.chat_full
+    chat_clip_path = paths.chat_clip
+    chat_overlay_path = paths.chat_overlay
 
     # chat_full.jsonの存在確認
     if not os.path.exists(chat_full_path):
@@ -821,9 +1448,7 @@ def run_rechat_pipeline(config_path: str) -> bool:
     else:
         print("\n[Step 4] Skipped (no chat messages)")
 
-    print("\n" + "=" * 60)
-    print("RECHAT PIPELINE COMPLETED!")
-    print("=" * 60)
+    _banner("RECHAT PIPELINE COMPLETED!", leading_blank=True)
     print("\nNext step:")
     print(f"  python main.py compose {config_path}")
     print()
@@ -855,9 +1480,7 @@ def run_clear_pipeline(config_path: str, keep_videos: bool = False) -> bool:
     Returns:
         bool: 成功した場合True
     """
-    print("=" * 60)
-    print("KIRINUKI PROCESSOR - CLEAR TEMP FILES")
-    print("=" * 60)
+    _banner("KIRINUKI PROCESSOR - CLEAR TEMP FILES")
     print(f"\nThis will delete temporary files from {config_path}")
     if keep_videos:
         print("  Videos (clip*.webm) will be kept")
@@ -866,7 +1489,7 @@ def run_clear_pipeline(config_path: str, keep_videos: bool = False) -> bool:
     print()
 
     # 設定ファイルを読み込み
-    config = load_config_from_file(config_path)
+    config = load_config_cached(config_path)
 
     # 一時ディレクトリの存在確認
     if not os.path.exists(config.temp_dir):
@@ -879,6 +1502,7 @@ def run_clear_pipeline(config_path: str, keep_videos: bool = False) -> bool:
         "subs_clip*.srt",
         "subs_clip*.ass",
         "chat_full*.json",
+        "chat_full*.json.src",
         "chat_clip*.json",
         "chat_overlay*.ass",
         "title_bar.ass",
@@ -894,20 +1518,26 @@ def run_clear_pipeline(config_path: str, keep_videos: bool = False) -> bool:
 
     deleted_count = 0
 
-    for pattern in patterns_to_delete:
-        full_pattern = os.path.join(config.temp_dir, pattern)
-        matched_files = glob.glob(full_pattern)
-        for file_path in matched_files:
-            try:
-                os.remove(file_path)
-                print(f"✓ Deleted: {os.path.basename(file_path)}")
-                deleted_count += 1
-            except Exception as e:
-                print(f"✗ Failed to delete {os.path.basename(file_path)}: {e}")
+    # ディレクトリは1回だけ走査し、全パターンをまとめた正規表現で判定する
+    # （globと同様に隠しファイルは対象外）
+    delete_re = re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns_to_delete))
+    with os.scandir(config.temp_dir) as entries:
+        targets = sorted(
+            entry.path for entry in entries
+            if not entry.name.startswith(".")
+            and not entry.is_dir(follow_symlinks=False)
+            and delete_re.match(entry.name)
+        )
+
+    for file_path in targets:
+        try:
+            os.remove(file_path)
+            print(f"✓ Deleted: {os.path.basename(file_path)}")
+            deleted_count += 1
+        except Exception as e:
+            print(f"✗ Failed to delete {os.path.basename(file_path)}: {e}")
 
-    print("\n" + "=" * 60)
-    print("CLEAR COMPLETED!")
-    print("=" * 60)
+    _banner("CLEAR COMPLETED!", leading_blank=True)
     print(f"\nDeleted {deleted_count} file(s)")
 
     if keep_videos:
@@ -918,6 +1548,35 @@ def run_clear_pipeline(config_path: str, keep_videos: bool = False) -> bool:
     return True
 
 
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    大きなファイルをカーネル内でコピーする（メタデータはコピーしない）
+
+    Linuxではcopy_file_rangeを使い、同じファイルシステム上ならreflink等で
+    データを実際には複製しない。使えない場合や小さなファイルはcopyfileに任せる。
+
+    Args:
+        src: コピー元のパス
+        dst: コピー先のパス
+    """
+    size = os.path.getsize(src)
+    if size >= _FAST_COPY_THRESHOLD and hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            # ファイルシステムが対応していない場合など
+            pass
+    shutil.copyfile(src, dst)
+
+
 def run_output_pipeline(config_path: str) -> bool:
     """
     出力パイプライン（完成動画と設定ファイルをタイトル名のフォルダに保存）
@@ -933,13 +1592,11 @@ def run_output_pipeline(config_path: str) -> bool:
     Returns:
         bool: 成功した場合True
     """
-    print("=" * 60)
-    print("KIRINUKI PROCESSOR - OUTPUT PIPELINE")
-    print("=" * 60)
+    _banner("KIRINUKI PROCESSOR - OUTPUT PIPELINE")
     print("\nThis will copy final.mp4, description.txt, and config to a titled folder\n")
 
     # 設定ファイルを読み込み
-    config = load_config_from_file(config_path)
+    config = load_config_cached(config_path)
 
     # タイトルチェック
     if not config.title:
@@ -958,21 +1615,21 @@ def run_output_pipeline(config_path: str) -> bool:
         return False
 
     # タイトル名からフォルダ名を作成（ファイルシステムで使えない文字を置換）
-    import re
-    safe_title = re.sub(r'[<>:"/\\|?*]', '_', config.title)
+    safe_title = _UNSAFE_FILENAME_RE.sub('_', config.title)
     output_folder = os.path.join(config.output_dir, safe_title)
 
     # フォルダ作成
-    os.makedirs(output_folder, exist_ok=True)
+    ensure_dir(output_folder)
     print(f"✓ Created output folder: {output_folder}")
 
     # 1. final.mp4をコピー
     dest_mp4 = os.path.join(output_folder, "final.mp4")
-    shutil.copy2(final_mp4_path, dest_mp4)
+    _fast_copy(final_mp4_path, dest_mp4)
     print(f"✓ Copied: final.mp4")
 
     # 2. description.txtをコピー（存在する場合）
-    if os.path.exists(description_path):
+    has_description = os.path.exists(description_path)
+    if has_description:
         dest_description = os.path.join(output_folder, "description.txt")
         shutil.copy2(description_path, dest_description)
         print(f"✓ Copied: description.txt")
@@ -982,14 +1639,12 @@ def run_output_pipeline(config_path: str) -> bool:
     shutil.copy2(config_path, dest_config)
     print(f"✓ Copied: config.txt")
 
-    print("\n" + "=" * 60)
-    print("OUTPUT PIPELINE COMPLETED!")
-    print("=" * 60)
+    _banner("OUTPUT PIPELINE COMPLETED!", leading_blank=True)
     print(f"\nOutput folder: {output_folder}")
     print("Files saved:")
     print(f"  - final.mp4")
     print(f"  - config.txt")
-    if os.path.exists(description_path):
+    if has_description:
         print(f"  - description.txt")
     print()
 
@@ -1007,29 +1662,16 @@ def run_compose_pipeline(config_path: str) -> bool:
     Returns:
         成功したかどうか
     """
-    print("=" * 60)
-    print("KIRINUKI Processor - Compose Video")
-    print("=" * 60)
+    from kirinuki_processor.steps.step6_compose_video import compose_video, detect_hw_encoder
+    from kirinuki_processor.steps.step_title_bar import generate_title_bar
+
+    _banner("KIRINUKI Processor - Compose Video")
 
     # 設定読み込み（連鎖チェック）
     print("\n[Loading configuration...]")
-    configs = []
-    current_config_path = config_path
-    visited_configs = set()
-
-    while current_config_path:
-        if current_config_path in visited_configs:
-            print(f"✗ Error: Circular reference detected")
-            return False
-        visited_configs.add(current_config_path)
-
-        try:
-            config = load_config_from_file(current_config_path)
-            configs.append(config)
-            current_config_path = config.next_config
-        except Exception as e:
-            print(f"✗ Failed to load configuration: {e}")
-            return False
+    configs = _load_config_chain(config_path)
+    if configs is None:
+        return False
 
     base_config = configs[0]
     print(f"✓ Loaded {len(configs)} config(s)")
@@ -1042,32 +1684,32 @@ def run_compose_pipeline(config_path: str) -> bool:
     chat_overlay_paths = []
 
     print(f"\nChecking files for {clip_count} clip(s)...")
+    present = _snapshot_dir(base_config.temp_dir)
     for i in range(clip_count):
-        suffix = "" if i == 0 else f"_{i}"
+        paths = PipelinePaths.from_config(base_config, i)
 
-        # 動画ファイル
-        clip_video_path = os.path.join(base_config.temp_dir, f"clip{suffix}.webm")
-        if not os.path.exists(clip_video_path):
-            print(f"✗ Video file not found: {clip_video_path}")
-            print("  Please run 'python main.py prepare' first")
-            return False
-        video_paths.append(clip_video_path)
+        # 動画ファイル（fullパイプラインでクロップを合成時に行った場合はclip.webmが無いので、ここで作る）
+        if os.path.basename(paths.clip_video) not in present:
+            if os.path.basename(paths.clip_video_raw) not in present:
+                print(f"✗ Video file not found: {paths.clip_video}")
+                print("  Please run 'python main.py prepare' first")
+                return False
+            if not apply_crop_or_copy(paths.clip_video_raw, paths.clip_video, configs[i]):
+                return False
+        video_paths.append(paths.clip_video)
 
         # 字幕ファイル（SRT）
-        subs_srt = os.path.join(base_config.temp_dir, f"subs_clip{suffix}.srt")
-        if os.path.exists(subs_srt):
-            subs_paths_srt.append(subs_srt)
+        if os.path.basename(paths.subs_clip) in present:
+            subs_paths_srt.append(paths.subs_clip)
         else:
             subs_paths_srt.append(None)
 
         # 字幕ファイル（ASS）
-        subs_ass = os.path.join(base_config.temp_dir, f"subs_clip{suffix}.ass")
-        subs_paths_ass.append(subs_ass)
+        subs_paths_ass.append(paths.subs_clip_ass)
 
         # チャットオーバーレイ
-        chat_overlay = os.path.join(base_config.temp_dir, f"chat_overlay{suffix}.ass")
-        if os.path.exists(chat_overlay):
-            chat_overlay_paths.append(chat_overlay)
+        if os.path.basename(paths.chat_overlay) in present:
+            chat_overlay_paths.append(paths.chat_overlay)
         else:
             chat_overlay_paths.append(None)
 
@@ -1088,7 +1730,7 @@ def run_compose_pipeline(config_path: str) -> bool:
 
         # 字幕をマージ（SRT）
         merged_subs_srt = os.path.join(base_config.temp_dir, "subs_clip_merged.srt")
-        valid_subs_srt = [s for s in subs_paths_srt if s and os.path.exists(s)]
+        valid_subs_srt = [s for s in subs_paths_srt if s]
         if valid_subs_srt:
             print("  Merging subtitles...")
             success = merge_subtitle_files(valid_subs_srt, merged_subs_srt)
@@ -1101,10 +1743,10 @@ def run_compose_pipeline(config_path: str) -> bool:
 
         # チャットオーバーレイをマージ（ASS）
         merged_chat_overlay = os.path.join(base_config.temp_dir, "chat_overlay_merged.ass")
-        valid_chat_overlays = [c for c in chat_overlay_paths if c and os.path.exists(c)]
-        if valid_chat_overlays:
+        if any(chat_overlay_paths):
             print("  Merging chat overlays...")
-            success = merge_ass_overlays(valid_chat_overlays, merged_chat_overlay, video_paths)
+            # オーバーレイの無いクリップもNoneのまま渡し、その長さ分のオフセットを保つ
+            success = merge_ass_overlays(chat_overlay_paths, merged_chat_overlay, video_paths)
             if success:
                 chat_overlay_path = merged_chat_overlay
             else:
@@ -1123,46 +1765,28 @@ def run_compose_pipeline(config_path: str) -> bool:
     print(f"  Video: {video_source_path}")
 
     # 字幕ファイルの処理（SRT→ASS変換）
-    subs_clip_path_ass = None
+    # 存在確認は上のスナップショット（単一クリップ）とマージ結果（複数クリップ）で済んでいる
     subtitle_path = None
+    has_srt = subs_clip_path_srt is not None
 
-    if subs_clip_path_srt and os.path.exists(subs_clip_path_srt):
+    if has_srt:
         # マージされた字幕 or 単一字幕のASS変換
         if clip_count > 1:
             subs_clip_path_ass = os.path.join(base_config.temp_dir, "subs_clip_merged.ass")
         else:
             subs_clip_path_ass = os.path.join(base_config.temp_dir, "subs_clip.ass")
+        subtitle_path = _ensure_styled_ass(subs_clip_path_srt, subs_clip_path_ass, base_config.subtitle_style)
 
-        try:
-            bold_variant = subs_clip_path_ass.replace(".ass", "_bold.ass")
-            needs_regen = (
-                not os.path.exists(subs_clip_path_ass)
-                or (base_config.subtitle_style == "bold" and not os.path.exists(bold_variant))
-                or os.path.getmtime(subs_clip_path_ass) < os.path.getmtime(subs_clip_path_srt)
-                or (os.path.exists(bold_variant) and os.path.getmtime(bold_variant) < os.path.getmtime(subs_clip_path_srt))
-            )
-            if needs_regen:
-                print("  Updating styled subtitles from edited SRT...")
-                convert_srt_to_ass(subs_clip_path_srt, subs_clip_path_ass)
-        except Exception as e:
-            print(f"  Warning: Failed to regenerate ASS from SRT: {e}")
-
-    if subs_clip_path_ass and os.path.exists(subs_clip_path_ass):
-        subtitle_candidate = subs_clip_path_ass
-        if base_config.subtitle_style == "bold":
-            bold_path = subs_clip_path_ass.replace(".ass", "_bold.ass")
-            if os.path.exists(bold_path):
-                subtitle_candidate = bold_path
-        subtitle_path = subtitle_candidate
+    if subtitle_path:
         print(f"  Subtitles: {subtitle_path} (styled)")
-    elif subs_clip_path_srt and os.path.exists(subs_clip_path_srt):
+    elif has_srt:
         subtitle_path = subs_clip_path_srt
         print(f"  Subtitles: {subs_clip_path_srt}")
     else:
         print("  Subtitles: (none)")
 
     overlay_path = None
-    if chat_overlay_path and os.path.exists(chat_overlay_path):
+    if chat_overlay_path:
         overlay_path = chat_overlay_path
         print(f"  Chat overlay: {chat_overlay_path}")
     else:
@@ -1194,88 +1818,97 @@ def run_compose_pipeline(config_path: str) -> bool:
         logo_path = None
         print(f"  Logo file not found: {logo_path}")
 
-    # ステップ5: 動画合成
-    print("\n[Step 5] Composing final video...")
-    try:
-        # オーバーレイを結合（chat + title）
-        overlays = []
-        if overlay_path:
-            overlays.append(overlay_path)
-        if title_overlay_path:
-            overlays.append(title_overlay_path)
-
-        # すべてのクリップが既にStep0でクロップ済みのため、compose時は再クロップしない
-        crop_top = crop_bottom = crop_left = crop_right = 0.0
-
-        success = compose_video(
-            video_source_path,
-            final_output_path,
-            subtitle_path=subtitle_path,
-            overlay_path=overlay_path,
-            title_overlay_path=title_overlay_path,
-            logo_path=logo_path,
-            crop_top_percent=crop_top,
-            crop_bottom_percent=crop_bottom,
-            crop_left_percent=crop_left,
-            crop_right_percent=crop_right
-        )
-        if not success:
-            print("✗ Failed to compose video")
-            return False
-    except Exception as e:
-        print(f"✗ Error in Step 5: {e}")
-        return False
-
     # ステップ6: YouTube説明欄生成（字幕が存在する場合）
+    # 説明欄生成は動画合成と依存関係がないため、ネットワーク待ちをFFmpegのエンコード中に隠す
     description_output_path = os.path.join(base_config.output_dir, "description.txt")
-    if subs_clip_path_srt and os.path.exists(subs_clip_path_srt):
-        print("\n[Step 6] Generating YouTube description...")
-        try:
-            success = generate_youtube_description(
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        description_future = None
+        if has_srt:
+            from kirinuki_processor.steps.step7_generate_description import generate_youtube_description
+            print("\n[Step 6] Generating YouTube description (in background)...")
+            description_future = executor.submit(
+                generate_youtube_description,
                 subs_clip_path_srt,
                 description_output_path,
                 prompt_template_path="data/input/setumei",
                 video_url=base_config.video_url
             )
-            if success:
-                print(f"  Description: {description_output_path}")
+        else:
+            print("\n[Step 6] Skipped (no subtitles available)")
+
+        # ステップ5: 動画合成
+        print("\n[Step 5] Composing final video...")
+        try:
+            # 字幕 → チャット → タイトルバーの順に重ねる
+            overlays = [path for path in (subtitle_path, overlay_path, title_overlay_path) if path]
+
+            # すべてのクリップが既にStep0でクロップ済みのため、compose時は再クロップしない
+            crop_top = crop_bottom = crop_left = crop_right = 0.0
+
+            success = compose_video(
+                video_source_path,
+                final_output_path,
+                overlays=overlays,
+                logo_path=logo_path,
+                crop_top_percent=crop_top,
+                crop_bottom_percent=crop_bottom,
+                crop_left_percent=crop_left,
+                crop_right_percent=crop_right,
+                hwenc=detect_hw_encoder(),
+                quiet=True
+            )
+            if not success:
+                print("✗ Failed to compose video")
+                return False
         except Exception as e:
-            print(f"  Note: Failed to generate description: {e}")
-    else:
-        print("\n[Step 6] Skipped (no subtitles available)")
+            print(f"✗ Error in Step 5: {e}")
+            return False
+
+        # 説明欄生成の完了を待つ
+        has_description = False
+        if description_future is not None:
+            try:
+                has_description = bool(description_future.result())
+                if has_description:
+                    print(f"  Description: {description_output_path}")
+            except Exception as e:
+                print(f"  Note: Failed to generate description: {e}")
 
-    print("\n" + "=" * 60)
-    print("✓ Composition completed successfully!")
-    print(f"  Final output: {final_output_path}")
-    if os.path.exists(description_output_path):
-        print(f"  Description: {description_output_path}")
-    print("=" * 60)
+    # 今回生成できた場合は確認不要。生成しなかった場合だけ以前のファイルがあるか確認する
+    summary = ["✓ Composition completed successfully!", f"  Final output: {final_output_path}"]
+    if has_description or os.path.exists(description_output_path):
+        summary.append(f"  Description: {description_output_path}")
+    _banner(*summary, leading_blank=True)
 
     return True
 
 
-def run_full_pipeline(config_path: str, skip_steps: list = None) -> bool:
+def run_full_pipeline(config_path: str, skip_steps: list = None, compute_type: Optional[str] = None) -> bool:
     """
     全ステップを実行するパイプライン
 
     Args:
         config_path: 設定ファイルのパス
         skip_steps: スキップするステップのリスト（例: [1, 3]）
+        compute_type: faster-whisperのcompute_type（Noneの場合は自動選択）
 
     Returns:
         成功したかどうか
     """
+    from kirinuki_processor.steps.step1_generate_subtitles import pick_whisper_model
+    from kirinuki_processor.steps.step4_extract_chat import load_and_extract_chat
+    from kirinuki_processor.steps.step5_generate_overlay import generate_overlay_from_file, OverlayConfig
+    from kirinuki_processor.steps.step6_compose_video import compose_video, detect_hw_encoder
+
     if skip_steps is None:
         skip_steps = []
 
-    print("=" * 60)
-    print("KIRINUKI Processor - Full Pipeline")
-    print("=" * 60)
+    _banner("KIRINUKI Processor - Full Pipeline")
 
     # ステップ0: 設定読み込み
     print("\n[Step 0] Loading configuration...")
     try:
-        config = load_config_from_file(config_path)
+        config = load_config_cached(config_path)
         print(f"✓ Configuration loaded")
         print(f"  Video URL: {config.video_url}")
         print(f"  Start time: {config.start_time}")
@@ -1288,88 +1921,116 @@ def run_full_pipeline(config_path: str, skip_steps: list = None) -> bool:
         return False
 
     # 出力・一時ディレクトリを作成
-    os.makedirs(config.output_dir, exist_ok=True)
-    os.makedirs(config.temp_dir, exist_ok=True)
+    ensure_dir(config.output_dir)
+    ensure_dir(config.temp_dir)
 
     # ファイルパスを定義
-    clip_video_path = os.path.join(config.temp_dir, "clip.webm")
-    clip_video_raw_path = os.path.join(config.temp_dir, "clip_raw.webm")
-    subs_full_path = os.path.join(config.temp_dir, "subs_full.srt")
-    subs_clip_path = os.path.join(config.temp_dir, "subs_clip.srt")
-    chat_full_path = os.path.join(config.temp_dir, "chat_full.json")
-    chat_clip_path = os.path.join(config.temp_dir, "chat_clip.json")
-    chat_overlay_path = os.path.join(config.temp_dir, "chat_overlay.ass")
+    paths = PipelinePaths.from_config(config)
+    clip_video_path = paths.clip_video
+    clip_video_raw_path = paths.clip_video_raw
+    subs_clip_path = paths.subs_clip
+    chat_full_path = paths.chat_full
+    chat_clip_path = paths.chat_clip
+    chat_overlay_path = paths.chat_overlay
     final_output_path = os.path.join(config.output_dir, "final.mp4")
 
-    # 動画ファイルのパスを決定（raw→crop→clip.webm に統一）
-    if config.auto_download:
-        if 0 not in skip_steps:
-            print("\n[Step 0] Downloading and clipping video from YouTube...")
-            try:
-                success = download_and_clip_video(
-                    config.video_url,
-                    config.start_time,
-                    config.end_time,
-                    clip_video_raw_path,
-                    download_full=False
-                )
-                if not success:
-                    print("✗ Failed to download and clip video")
-                    return False
-            except Exception as e:
-                print(f"✗ Error in Step 0: {e}")
-                return False
+    # ステップ2: チャット取得
+    # チャットはURLだけに依存するため、ダウンロード・Whisperと並行して取得する
+    chat_future = None
+    with ThreadPoolExecutor(max_workers=1) as chat_executor:
+        if 2 not in skip_steps and _chat_fetched_from(chat_full_path, config.video_url):
+            print(f"\n[Step 2] Reusing existing {os.path.basename(chat_full_path)}")
+        elif 2 not in skip_steps:
+            print("\n[Step 2] Fetching live chat from YouTube (in background)...")
+            chat_future = chat_executor.submit(_fetch_chat_shared, config.video_url, chat_full_path, None)
         else:
-            print("\n[Step 0] Skipped download (assuming raw clip already exists)")
-        raw_video_path = clip_video_raw_path
-    else:
-        print("\n[Step 0] Using existing video file")
-        if not config.webm_path:
-            print("✗ WEBM_PATH is required when AUTO_DOWNLOAD=false")
-            return False
-        raw_video_path = config.webm_path
+            print("\n[Step 2] Skipped")
 
-    # クロップ適用（skipしていてもクロップは行う）
-    cropped = apply_crop_or_copy(raw_video_path, clip_video_path, config)
-    if not cropped:
-        return False
-    video_source_path = cropped
+        # 動画ファイルのパスを決定（raw→crop→clip.webm に統一）
+        if config.auto_download:
+            if 0 not in skip_steps:
+                print("\n[Step 0] Downloading and clipping video from YouTube...")
+                try:
+                    success = download_clip_for_config(config, clip_video_raw_path)
+                    if not success:
+                        print("✗ Failed to download and clip video")
+                        return False
+                except Exception as e:
+                    print(f"✗ Error in Step 0: {e}")
+                    return False
+            else:
+                print("\n[Step 0] Skipped download (assuming raw clip already exists)")
+            raw_video_path = clip_video_raw_path
+        else:
+            print("\n[Step 0] Using existing video file")
+            if not config.webm_path:
+                print("✗ WEBM_PATH is required when AUTO_DOWNLOAD=false")
+                return False
+            raw_video_path = config.webm_path
 
-    # ステップ1: Whisper字幕生成
-    if 1 not in skip_steps:
-        print("\n[Step 1] Generating subtitles with Whisper...")
-        try:
-            success = generate_subtitles_with_whisper(
-                video_source_path,
-                subs_clip_path,
-                model_size="large",
-                language="ja"
+        # クロップ適用（skipしていてもクロップは行う）
+        # クロップ済みの新しいclip.webmがあれば再利用する。無ければクロップはStep5の合成と
+        # 同じFFmpegで行い、クロップのためだけのVP9再エンコードを省く（Whisperはクロップ不要）
+        crop_args = {}
+        if _reusable_output(clip_video_path, raw_video_path, config_path):
+            video_source_path = clip_video_path
+        elif _has_crop(config):
+            print("\n[Crop] Crop will be applied while composing (single encode)")
+            remove_if_exists(clip_video_path)
+            video_source_path = raw_video_path
+            crop_args = dict(
+                crop_top_percent=config.crop_top_percent,
+                crop_bottom_percent=config.crop_bottom_percent,
+                crop_left_percent=config.crop_left_percent,
+                crop_right_percent=config.crop_right_percent,
+                crop_scale=(1920, 1080)
             )
-            if not success:
-                print("  Note: Failed to generate subtitles, will proceed without them")
+        else:
+            cropped = apply_crop_or_copy(raw_video_path, clip_video_path, config)
+            if not cropped:
+                return False
+            video_source_path = cropped
+
+        # ステップ1: Whisper字幕生成（同じ音声の文字起こしはキャッシュから再利用される）
+        if 1 not in skip_steps:
+            print("\n[Step 1] Generating subtitles with Whisper...")
+            try:
+                success = generate_subtitles_cached(
+                    video_source_path,
+                    subs_clip_path,
+                    model_size=config.whisper_model or pick_whisper_model(),
+                    language="ja",
+                    compute_type=compute_type
+                )
+                if not success:
+                    print("  Note: Failed to generate subtitles, will proceed without them")
+                    subs_clip_path = None
+            except Exception as e:
+                print(f"✗ Error in Step 1: {e}")
                 subs_clip_path = None
-        except Exception as e:
-            print(f"✗ Error in Step 1: {e}")
-            subs_clip_path = None
-    else:
-        print("\n[Step 1] Skipped")
+        else:
+            print("\n[Step 1] Skipped")
 
-    # ステップ2: チャット取得
-    if 2 not in skip_steps:
-        print("\n[Step 2] Fetching live chat from YouTube...")
+    # withを抜けた時点でチャット取得は完了している
+    if chat_future is not None:
         try:
-            success = fetch_chat(config.video_url, chat_full_path)
-            if not success:
-                print("  Note: Chat replay not available, will proceed without it")
+            success = chat_future.result()
+            if success:
+                print("\n[Step 2] ✓ Live chat fetched")
+            else:
+                print("\n[Step 2] Note: Chat replay not available, will proceed without it")
                 chat_full_path = None
         except Exception as e:
             print(f"✗ Error in Step 2: {e}")
             chat_full_path = None
-    else:
-        print("\n[Step 2] Skipped")
+
+    # ここから先は「パスがNoneでなければファイルが存在する」として扱う
+    present = _snapshot_dir(config.temp_dir)
+    subs_clip_path = subs_clip_path if subs_clip_path and os.path.basename(subs_clip_path) in present else None
+    chat_full_path = chat_full_path if chat_full_path and os.path.basename(chat_full_path) in present else None
 
     # ステップ3: チャット抽出
-    if 3 not in skip_steps and chat_full_path and os.path.exists(chat_full_path):
+    if 3 not in skip_steps and chat_full_path:
         print("\n[Step 3] Extracting chat messages for clip...")
         try:
             count = load_and_extract_chat(
@@ -1389,9 +2050,11 @@ def run_full_pipeline(config_path: str, skip_steps: list = None) -> bool:
     else:
         print("\n[Step 3] Skipped (no chat available)")
         chat_clip_path = None
+    present = _snapshot_dir(config.temp_dir)
+    chat_clip_path = chat_clip_path if chat_clip_path and os.path.basename(chat_clip_path) in present else None
 
     # ステップ4: オーバーレイ生成
-    if 4 not in skip_steps and chat_clip_path and os.path.exists(chat_clip_path):
+    if 4 not in skip_steps and chat_clip_path:
         print("\n[Step 4] Generating chat overlay (ASS)...")
         try:
             overlay_config = OverlayConfig()
@@ -1408,23 +2071,16 @@ def run_full_pipeline(config_path: str, skip_steps: list = None) -> bool:
     else:
         print("\n[Step 4] Skipped (no chat available)")
         chat_overlay_path = None
+    present = _snapshot_dir(config.temp_dir)
+    chat_overlay_path = chat_overlay_path if chat_overlay_path and os.path.basename(chat_overlay_path) in present else None
 
     subtitle_for_compose = None
-    if subs_clip_path and os.path.exists(subs_clip_path):
-        subs_clip_path_ass = subs_clip_path.replace(".srt", ".ass")
-        try:
-            needs_regen = (not os.path.exists(subs_clip_path_ass) or
-                           os.path.getmtime(subs_clip_path_ass) < os.path.getmtime(subs_clip_path))
-            if needs_regen:
-                print("  Updating styled subtitles from edited SRT...")
-                convert_srt_to_ass(subs_clip_path, subs_clip_path_ass)
-        except Exception as e:
-            print(f"  Warning: Failed to regenerate ASS from SRT: {e}")
-
-        if os.path.exists(subs_clip_path_ass):
-            subtitle_for_compose = subs_clip_path_ass
-        else:
-            subtitle_for_compose = subs_clip_path
+    if subs_clip_path:
+        subtitle_for_compose = _ensure_styled_ass(
+            subs_clip_path,
+            subs_clip_path.replace(".srt", ".ass"),
+            config.subtitle_style
+        ) or subs_clip_path
 
     # ステップ5: 動画合成
     if 5 not in skip_steps:
@@ -1433,8 +2089,10 @@ def run_full_pipeline(config_path: str, skip_steps: list = None) -> bool:
             success = compose_video(
                 video_source_path,
                 final_output_path,
-                subtitle_path=subtitle_for_compose,
-                overlay_path=chat_overlay_path if chat_overlay_path and os.path.exists(chat_overlay_path) else None
+                overlays=[path for path in (subtitle_for_compose, chat_overlay_path) if path],
+                hwenc=detect_hw_encoder(),
+                quiet=True,
+                **crop_args
             )
             if not success:
                 print("✗ Failed to compose video")
@@ -1445,10 +2103,7 @@ def run_full_pipeline(config_path: str, skip_steps: list = None) -> bool:
     else:
         print("\n[Step 6] Skipped")
 
-    print("\n" + "=" * 60)
-    print("✓ Pipeline completed successfully!")
-    print(f"  Final output: {final_output_path}")
-    print("=" * 60)
+    _banner("✓ Pipeline completed successfully!", f"  Final output: {final_output_path}", leading_blank=True)
 
     return True
 
@@ -1459,40 +2114,44 @@ def run_crop_step(config_path: str) -> bool:
     clip_raw.webmが無ければStep0同様にダウンロードしてからクロップする。
     """
     try:
-        config = load_config_from_file(config_path)
+        config = load_config_cached(config_path)
     except Exception as e:
         print(f"✗ Failed to load configuration: {e}")
         return False
 
-    os.makedirs(config.temp_dir, exist_ok=True)
-    clip_raw_path = os.path.join(config.temp_dir, "clip_raw.webm")
-    clip_cropped_path = os.path.join(config.temp_dir, "clip.webm")
+    ensure_dir(config.temp_dir)
+    paths = PipelinePaths.from_config(config)
+    clip_raw_path = paths.clip_video_raw
+    clip_cropped_path = paths.clip_video
+
+    # ソース動画を準備（存在確認はstat1回。中断されたダウンロードの空ファイルは無いものとして扱う）
+    try:
+        have_raw = os.stat(clip_raw_path).st_size > 0
+    except FileNotFoundError:
+        have_raw = False
 
-    # ソース動画を準備
-    if os.path.exists(clip_raw_path):
+    if have_raw:
         print(f"✓ Found existing raw clip: {clip_raw_path}")
         raw_video_path = clip_raw_path
     else:
         if config.auto_download:
             print("\n[Step0.5] Downloading video section (Step0 equivalent)...")
-            success = download_and_clip_video(
-                config.video_url,
-                config.start_time,
-                config.end_time,
-                clip_raw_path,
-                download_full=False
-            )
+            success = download_clip_for_config(config, clip_raw_path)
             if not success:
                 print("✗ Failed to download video")
                 return False
             raw_video_path = clip_raw_path
         else:
-            if not config.webm_path or not os.path.exists(config.webm_path):
+            # WEBM_PATHは存在確認せずにコピーを試み、無ければそのエラーで判定する
+            if not config.webm_path:
                 print("✗ clip_raw.webm not found and WEBM_PATH is invalid. Please run step0 or set WEBM_PATH.")
                 return False
             raw_video_path = config.webm_path
-            import shutil
-            shutil.copy2(raw_video_path, clip_raw_path)
+            try:
+                shutil.copy2(raw_video_path, clip_raw_path)
+            except FileNotFoundError:
+                print("✗ clip_raw.webm not found and WEBM_PATH is invalid. Please run step0 or set WEBM_PATH.")
+                return False
 
     print("\n[Step0.5] Applying crop...")
     print(f"  Top: {config.crop_top_percent}%, Bottom: {config.crop_bottom_percent}%")
@@ -1551,6 +2210,8 @@ def load_short_config(config_path: str) -> dict:
     config = {
         'INPUT_VIDEO': 'data/output/final.mp4',
         'OUTPUT': 'data/output/short.mp4',
+        'SHORT_PARALLEL': '1',  # シーンを並列生成する（メモリが少ない環境では0）
+        'SHORT_HWACCEL': '1',  # NVENC / Quick Sync / VideoToolboxが使えればハードウェアでエンコードする
         'scenes': []  # 複数シーンを格納
     }
     config.update(SHORT_OVERLAY_DEFAULTS)
@@ -1558,44 +2219,39 @@ def load_short_config(config_path: str) -> dict:
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
-    scene_data = {}  # SCENE1_START, SCENE1_END などを一時保存
+    scene_data = defaultdict(dict)  # {シーン番号: {'start': ..., 'end': ...}}
 
-    with open(config_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
+    # 一括で読み込み、1行ごとにpartitionで1回だけ分割する
+    with open(config_path, 'rb') as f:
+        data = f.read().decode('utf-8')
 
-            if '=' in line:
-                key, value = line.split('=', 1)
-                key = key.strip()
-                value = value.strip()
+    for line in data.splitlines():
+        line = line.strip()
+        if not line or line[0] == '#':
+            continue
+
+        key, sep, value = line.partition('=')
+        if not sep:
+            continue
+        key = key.strip()
+        value = value.strip()
 
-                # SCENEn_START, SCENEn_END を検出
-                if key.startswith('SCENE') and ('_START' in key or '_END' in key):
-                    scene_data[key] = value
-                else:
-                    config[key] = value
+        # SCENEn_START, SCENEn_END を検出
+        match = _SCENE_KEY_RE.match(key)
+        if match:
+            scene_data[int(match.group(1))][match.group(2).lower()] = value
+        else:
+            config[key] = value
 
     # シーンデータを整理
     if scene_data:
-        # SCENEの番号を抽出してソート
-        scene_numbers = set()
-        for key in scene_data.keys():
-            # SCENE1_START → 1 を抽出
-            match = re.match(r'SCENE(\d+)_', key)
-            if match:
-                scene_numbers.add(int(match.group(1)))
-
-        # 番号順にシーンを構築
-        for num in sorted(scene_numbers):
-            start_key = f'SCENE{num}_START'
-            end_key = f'SCENE{num}_END'
-
-            if start_key in scene_data and end_key in scene_data:
+        # 番号順にシーンを構築（開始・終了の両方があるものだけ）
+        for num in sorted(scene_data):
+            scene = scene_data[num]
+            if 'start' in scene and 'end' in scene:
                 config['scenes'].append({
-                    'start': scene_data[start_key],
-                    'end': scene_data[end_key]
+                    'start': scene['start'],
+                    'end': scene['end']
                 })
     else:
         # 従来の形式（START_TIME, END_TIME）もサポート
@@ -1650,14 +2306,9 @@ def _auto_wrap_text(text: str, max_chars: int) -> str:
         if not segment:
             result_lines.append('')
             continue
-        line = ''
-        for ch in segment:
-            line += ch
-            if len(line) >= max_chars:
-                result_lines.append(line)
-                line = ''
-        if line:
-            result_lines.append(line)
+        # 固定文字数ごとにスライスする（1行につき1回の文字列生成で済む）
+        for i in range(0, len(segment), max_chars):
+            result_lines.append(segment[i:i + max_chars])
     return '\n'.join(result_lines)
 
 
@@ -1705,36 +2356,140 @@ def build_overlay_settings(config: dict) -> dict:
     overlay['top_lines'] = overlay['top_text'].split('\n') if overlay['top_text'] else []
     overlay['bottom_lines'] = overlay['bottom_text'].split('\n') if overlay['bottom_text'] else []
 
-    overlay['top_line_colors'] = {}
-    for idx, _ in enumerate(overlay['top_lines'], start=1):
-        key = f'TOP_TEXT_LINE{idx}_COLOR'
-        color = _clean_str_value(config.get(key))
-        if color:
-            overlay['top_line_colors'][idx] = color
-
-    overlay['bottom_line_colors'] = {}
-    for idx, _ in enumerate(overlay['bottom_lines'], start=1):
-        key = f'BOTTOM_TEXT_LINE{idx}_COLOR'
-        color = _clean_str_value(config.get(key))
-        if color:
-            overlay['bottom_line_colors'][idx] = color
+    # 行ごとの色指定は設定を1回走査して上下まとめて拾い、実在する行の分だけ残す
+    line_colors = {'TOP': {}, 'BOTTOM': {}}
+    for key, value in config.items():
+        match = _LINE_COLOR_KEY_RE.match(key)
+        if match:
+            color = _clean_str_value(value)
+            if color:
+                line_colors[match.group(1)][int(match.group(2))] = color
+    overlay['top_line_colors'] = {
+        idx: color for idx, color in line_colors['TOP'].items() if idx <= len(overlay['top_lines'])
+    }
+    overlay['bottom_line_colors'] = {
+        idx: color for idx, color in line_colors['BOTTOM'].items() if idx <= len(overlay['bottom_lines'])
+    }
 
     return overlay
 
 
-def run_short_pipeline(config_path: str) -> bool:
+def _generate_short_scenes_separately(
+    input_video: str,
+    output_path: str,
+    scenes: list,
+    overlay_settings: dict,
+    parallel: bool = True,
+    hwenc: Optional[str] = None,
+    threads: Optional[int] = None
+) -> bool:
+    """
+    シーンごとにショート動画を生成してから連結する（従来方式）
+
+    Args:
+        input_video: 入力動画のパス
+        output_path: 出力動画のパス
+        scenes: {'start': ..., 'end': ...} のリスト
+        overlay_settings: build_overlay_settings() の戻り値
+        parallel: 全シーンを1回のFFmpeg実行でまとめて生成するか（Falseなら1シーンずつ）
+        hwenc: ハードウェアエンコーダ名（Noneでlibx264）
+        threads: FFmpegのスレッド数（Noneで自動）
+
+    Returns:
+        成功した場合True
+    """
+    from shorts import (
+        generate_short_video,
+        generate_shorts_multi,
+        build_short_filter_chain,
+        build_short_cuda_graph,
+        probe_input_video
+    )
+
+    # 解像度の取得とテキスト描画フィルターの構築は全シーン共通なので1回だけ行う
+    width, height, _ = probe_input_video(input_video)
+    filter_chain = build_short_filter_chain(width, height, overlay_settings)
+
+    # 一時ディレクトリを作成（複数の設定を並列処理しても衝突しないよう実行ごとに専用のディレクトリを使う）
+    ensure_dir('data/temp')
+    temp_dir = tempfile.mkdtemp(prefix='short_', dir='data/temp')
+
+    scene_files = [os.path.join(temp_dir, f'short_scene_{i}.mp4') for i in range(1, len(scenes) + 1)]
+    # NVENCでは出力ごとにセッションを使うので、上限を超えるシーン数なら1シーンずつ生成する
+    if hwenc == 'h264_nvenc' and len(scenes) > _MAX_NVENC_SESSIONS:
+        parallel = False
+
+    try:
+        if parallel and len(scenes) > 1:
+            # 全シーンを1回のFFmpeg実行（シーンごとの入力と出力）で書き出す。各入力はシーンの区間だけをデコードする
+            for i, scene in enumerate(scenes, 1):
+                print(f"\n[Scene {i}/{len(scenes)}] Generating: {scene['start']} - {scene['end']}")
+            jobs = [(scene['start'], scene['end'], scene_files[i]) for i, scene in enumerate(scenes)]
+            if not generate_shorts_multi(input_video, jobs, filter_chain, hwenc=hwenc, threads=threads):
+                print("✗ Failed to generate scenes")
+                return False
+        else:
+            cuda_graph = None
+            if hwenc == 'h264_nvenc' and filter_chain:
+                cuda_graph = build_short_cuda_graph(input_video, overlay_settings)
+            for i, scene in enumerate(scenes):
+                print(f"\n[Scene {i + 1}/{len(scenes)}] Generating: {scene['start']} - {scene['end']}")
+                if not generate_short_video(
+                    input_video,
+                    scene_files[i],
+                    scene['start'],
+                    scene['end'],
+                    threads=threads,
+                    filter_chain=filter_chain,
+                    hwenc=hwenc,
+                    cuda_graph=cuda_graph
+                ):
+                    print(f"✗ Failed to generate scene {i + 1}")
+                    return False
+
+        # 複数シーンを連結
+        if len(scene_files) == 1:
+            # シーンが1つだけの場合は移動する（同じファイルシステムならrenameだけで済む）
+            try:
+                os.replace(scene_files[0], output_path)
+            except OSError:
+                # 別のファイルシステムなどでrenameできない場合はコピー
+                shutil.copy2(scene_files[0], output_path)
+            print(f"\n✓ Short video created: {output_path}")
+        else:
+            # 複数シーンを連結
+            print(f"\n[Concatenating {len(scene_files)} scenes...]")
+            success = concatenate_videos(scene_files, output_path)
+            if not success:
+                print("✗ Failed to concatenate scenes")
+                return False
+            print(f"✓ Scenes concatenated: {output_path}")
+    finally:
+        # 一時ディレクトリごと削除
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return True
+
+
+def run_short_pipeline(
+    config_path: str,
+    legacy_scene_pipeline: bool = False,
+    threads: Optional[int] = None
+) -> bool:
     """
     ショート動画生成パイプライン（複数シーン対応）
 
     Args:
         config_path: 設定ファイルのパス
+        legacy_scene_pipeline: 複数シーンでもシーンごとに生成して連結する（従来方式）
+        threads: FFmpegのスレッド数（複数のショートを同時に生成する場合に指定、Noneで自動）
 
     Returns:
         成功した場合True
     """
-    print("=" * 60)
-    print("KIRINUKI PROCESSOR - SHORT VIDEO GENERATOR")
-    print("=" * 60)
+    from shorts import generate_multi_scene_short
+
+    _banner("KIRINUKI PROCESSOR - SHORT VIDEO GENERATOR")
 
     # 設定読み込み
     try:
@@ -1769,61 +2524,44 @@ def run_short_pipeline(config_path: str) -> bool:
 
     # 出力ディレクトリを作成
     output_path = config['OUTPUT']
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    ensure_parent_dir(output_path)
 
-    # 一時ディレクトリを作成
-    temp_dir = 'data/temp'
-    os.makedirs(temp_dir, exist_ok=True)
-
-    # 各シーンを個別に生成
-    scene_files = []
+    scenes = config['scenes']
+    hwenc = None
+    if _parse_bool_value(config.get('SHORT_HWACCEL'), True):
+        from kirinuki_processor.steps.step6_compose_video import detect_hw_encoder
+        hwenc = detect_hw_encoder()
     try:
-        for i, scene in enumerate(config['scenes'], 1):
-            scene_output = os.path.join(temp_dir, f'short_scene_{i}.mp4')
-            print(f"\n[Scene {i}/{len(config['scenes'])}] Generating: {scene['start']} - {scene['end']}")
-
-            success = generate_short_video(
+        if len(scenes) >= 2 and not legacy_scene_pipeline:
+            # 複数シーンは1回のFFmpegで切り出し・連結・テキスト描画まで行う
+            print(f"\n[Generating {len(scenes)} scenes in a single pass...]")
+            success = generate_multi_scene_short(
                 input_video,
-                scene_output,
-                scene['start'],
-                scene['end'],
-                overlay_settings=overlay_settings
+                output_path,
+                scenes,
+                overlay_settings=overlay_settings,
+                hwenc=hwenc,
+                threads=threads
             )
-
-            if not success:
-                print(f"✗ Failed to generate scene {i}")
-                return False
-
-            scene_files.append(scene_output)
-
-        # 複数シーンを連結
-        if len(scene_files) == 1:
-            # シーンが1つだけの場合はそのままコピー
-            shutil.copy2(scene_files[0], output_path)
-            print(f"\n✓ Short video created: {output_path}")
         else:
-            # 複数シーンを連結
-            print(f"\n[Concatenating {len(scene_files)} scenes...]")
-            success = concatenate_videos(scene_files, output_path)
-            if not success:
-                print("✗ Failed to concatenate scenes")
-                return False
-            print(f"✓ Scenes concatenated: {output_path}")
-
+            success = _generate_short_scenes_separately(
+                input_video,
+                output_path,
+                scenes,
+                overlay_settings,
+                parallel=_parse_bool_value(config.get('SHORT_PARALLEL'), True),
+                hwenc=hwenc,
+                threads=threads
+            )
     except Exception as e:
         print(f"✗ Error generating short video: {e}")
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        # 一時ファイルを削除
-        for scene_file in scene_files:
-            if os.path.exists(scene_file):
-                os.remove(scene_file)
-
-    print("\n" + "=" * 60)
-    print("✓ SHORT VIDEO GENERATION COMPLETED!")
-    print("=" * 60)
+    if not success:
+        return False
+
+    _banner("✓ SHORT VIDEO GENERATION COMPLETED!", leading_blank=True)
     print(f"\nOutput: {output_path}")
     print(f"Total scenes: {len(config['scenes'])}")
     print()
@@ -1831,6 +2569,81 @@ def run_short_pipeline(config_path: str) -> bool:
     return True
 
 
+def _short_nvenc_sessions(config_path: str, legacy_scene_pipeline: bool) -> int:
+    """
+    ショート1本の生成で同時に使うNVENCセッション数を見積もる
+
+    従来方式でシーンをまとめて生成する場合はシーンごとに1セッション、
+    それ以外は1セッション（SHORT_HWACCEL=0なら0）。
+
+    Args:
+        config_path: ショート設定ファイルのパス
+        legacy_scene_pipeline: 複数シーンでもシーンごとに生成して連結するか
+
+    Returns:
+        セッション数（設定を読めない場合は1）
+    """
+    try:
+        config = load_short_config(config_path)
+    except Exception:
+        return 1
+    if not _parse_bool_value(config.get('SHORT_HWACCEL'), True):
+        return 0
+    scenes = len(config['scenes'])
+    if (legacy_scene_pipeline and 1 < scenes <= _MAX_NVENC_SESSIONS
+            and _parse_bool_value(config.get('SHORT_PARALLEL'), True)):
+        return scenes
+    return 1
+
+
+def run_short_batch(config_paths: List[str], legacy_scene_pipeline: bool = False) -> bool:
+    """
+    複数のショート設定をまとめて生成する
+
+    ショートごとのFFmpegは互いに独立しているので、CPU（またはNVENC）が空かないように
+    並行して実行する。
+
+    Args:
+        config_paths: ショート設定ファイルのパスのリスト
+        legacy_scene_pipeline: 複数シーンでもシーンごとに生成して連結する（従来方式）
+
+    Returns:
+        すべて成功した場合True
+    """
+    if len(config_paths) == 1:
+        return run_short_pipeline(config_paths[0], legacy_scene_pipeline=legacy_scene_pipeline)
+
+    workers = min(len(config_paths), _MAX_PARALLEL_SHORTS)
+    from kirinuki_processor.steps.step6_compose_video import detect_hw_encoder
+    if detect_hw_encoder() == 'h264_nvenc':
+        # 同時に動くショートのセッション数の合計がNVENCの上限を超えないようにする
+        sessions = max(_short_nvenc_sessions(path, legacy_scene_pipeline) for path in config_paths)
+        if sessions:
+            workers = max(1, min(workers, _MAX_NVENC_SESSIONS // sessions))
+    # 同時に動くFFmpegでCPUコアを分け合う（既定ではそれぞれがコア数ぶんのスレッドを使う）
+    threads = max(1, (os.cpu_count() or 2) // workers) if workers > 1 else None
+
+    results = [False] * len(config_paths)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_short_pipeline, path, legacy_scene_pipeline, threads): i
+            for i, path in enumerate(config_paths)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                print(f"✗ Error generating short {config_paths[i]}: {e}")
+
+    failed = [path for path, ok in zip(config_paths, results) if not ok]
+    if failed:
+        print(f"✗ Failed to generate short(s): {', '.join(failed)}")
+        return False
+    print(f"✓ Generated {len(config_paths)} short video(s)")
+    return True
+
+
 def run_single_step(step_num: float, args: argparse.Namespace) -> bool:
     """
     単一ステップを実行
@@ -1861,12 +2674,15 @@ def run_single_step(step_num: float, args: argparse.Namespace) -> bool:
         return success
 
     elif step_num == 1:
-        # Whisper字幕生成
+        # Whisper字幕生成（常駐サーバー経由）
+        from kirinuki_processor.steps.step1_generate_subtitles import generate_subtitles_with_whisper
+        ensure_whisper_server()
         success = generate_subtitles_with_whisper(
             args.input,
             args.output,
             model_size=args.model if hasattr(args, 'model') else "large",
-            language=args.language if hasattr(args, 'language') else "ja"
+            language=args.language if hasattr(args, 'language') else "ja",
+            compute_type=getattr(args, 'compute_type', None)
         )
         return success
 
@@ -1884,6 +2700,7 @@ def run_single_step(step_num: float, args: argparse.Namespace) -> bool:
             )
         else:
             # ルールベースで修正
+            from kirinuki_processor.steps.step1_5_fix_subtitles import fix_subtitle_file
             success = fix_subtitle_file(
                 args.input,
                 args.output,
@@ -1893,11 +2710,13 @@ def run_single_step(step_num: float, args: argparse.Namespace) -> bool:
 
     elif step_num == 2:
         # チャット取得
+        from kirinuki_processor.steps.step3_fetch_chat import fetch_chat
         success = fetch_chat(args.url, args.output)
         return success
 
     elif step_num == 3:
         # チャット抽出
+        from kirinuki_processor.steps.step4_extract_chat import load_and_extract_chat
         count = load_and_extract_chat(
             args.input,
             args.output,
@@ -1909,6 +2728,7 @@ def run_single_step(step_num: float, args: argparse.Namespace) -> bool:
 
     elif step_num == 4:
         # オーバーレイ生成
+        from kirinuki_processor.steps.step5_generate_overlay import generate_overlay_from_file, OverlayConfig
         config = OverlayConfig()
         count = generate_overlay_from_file(
             args.input,
@@ -1918,17 +2738,21 @@ def run_single_step(step_num: float, args: argparse.Namespace) -> bool:
         return count > 0
 
     elif step_num == 5:
-        # 動画合成
+        # 動画合成（字幕・オーバーレイが無く、コーデックが出力形式に合えば再エンコードせずコピーする）
+        from kirinuki_processor.steps.step6_compose_video import compose_video, detect_hw_encoder
         success = compose_video(
             args.video,
             args.output,
-            subtitle_path=args.subtitle if hasattr(args, 'subtitle') else None,
-            overlay_path=args.overlay if hasattr(args, 'overlay') else None
+            overlays=[getattr(args, 'subtitle', None), getattr(args, 'overlay', None)],
+            video_codec="auto",
+            hwenc=detect_hw_encoder(),
+            quiet=True
         )
         return success
 
     elif step_num == 6:
         # YouTube説明欄生成
+        from kirinuki_processor.steps.step7_generate_description import generate_youtube_description
         success = generate_youtube_description(
             args.input,
             args.output,
@@ -1953,6 +2777,7 @@ def main():
     # 素材準備パイプライン
     prepare_parser = subparsers.add_parser("prepare", help="Prepare materials (download, subtitles, chat) - stops before composing video")
     prepare_parser.add_argument("config", help="Configuration file path")
+    prepare_parser.add_argument("--compute-type", choices=["int8", "int8_float16", "int16", "float16", "float32"], help="faster-whisper compute type (default: auto)")
 
     # 字幕再生成パイプライン
     resub_parser = subparsers.add_parser("resub", help="Regenerate subtitles only (useful when Whisper subtitles have issues)")
@@ -1978,6 +2803,7 @@ def main():
     # フルパイプライン実行（prepare→composeの順に全ステップ実行）
     pipeline_parser = subparsers.add_parser("run", help="Run full pipeline (prepare then compose)")
     pipeline_parser.add_argument("config", help="Configuration file path")
+    pipeline_parser.add_argument("--compute-type", choices=["int8", "int8_float16", "int16", "float16", "float32"], help="faster-whisper compute type (default: auto)")
 
     # サンプル設定ファイル作成
     sample_parser = subparsers.add_parser("init", help="Create sample config file")
@@ -1987,9 +2813,13 @@ def main():
         help="Output path for sample config (default: config.txt)"
     )
 
+    # 常駐Whisperサーバー停止
+    subparsers.add_parser("whisper-shutdown", help="Stop the resident Whisper server started by prepare/step1")
+
     # ショート動画生成パイプライン
     short_parser = subparsers.add_parser("short", help="Generate vertical short video from clip.webm or concatenated.webm")
-    short_parser.add_argument("config", help="Short config file path (e.g., short_config.txt)")
+    short_parser.add_argument("config", nargs="+", help="Short config file path(s) (e.g., short_config.txt); multiple configs are generated in parallel")
+    short_parser.add_argument("--legacy-scene-pipeline", action="store_true", help="Render each scene separately and concatenate (previous behavior)")
 
     # 個別ステップ実行用のサブコマンド
     # Step 0
@@ -2010,6 +2840,7 @@ def main():
     step1_parser.add_argument("-o", "--output", required=True, help="Output SRT file")
     step1_parser.add_argument("-m", "--model", default="large", choices=["tiny", "base", "small", "medium", "large"], help="Whisper model size (default: large)")
     step1_parser.add_argument("-l", "--language", default="ja", help="Language code (default: ja)")
+    step1_parser.add_argument("--compute-type", choices=["int8", "int8_float16", "int16", "float16", "float32"], help="faster-whisper compute type (default: auto)")
 
     # Step 1.5 (字幕修正)
     step1_5_parser = subparsers.add_parser("step1.5", help="Fix subtitles")
@@ -2060,7 +2891,7 @@ def main():
     # コマンド実行
     try:
         if args.command == "prepare":
-            success = run_prepare_pipeline(args.config)
+            success = run_prepare_pipeline(args.config, compute_type=args.compute_type)
             return 0 if success else 1
 
         elif args.command == "resub":
@@ -2084,15 +2915,22 @@ def main():
             return 0 if success else 1
 
         elif args.command == "run":
-            success = run_full_pipeline(args.config, [])
+            success = run_full_pipeline(args.config, [], compute_type=args.compute_type)
             return 0 if success else 1
 
         elif args.command == "init":
             create_sample_config(args.output)
             return 0
 
+        elif args.command == "whisper-shutdown":
+            if shutdown_whisper_server():
+                print("✓ Whisper server stopped")
+            else:
+                print("Whisper server is not running")
+            return 0
+
         elif args.command == "short":
-            success = run_short_pipeline(args.config)
+            success = run_short_batch(args.config, legacy_scene_pipeline=args.legacy_scene_pipeline)
             return 0 if success else 1
 
         elif args.command == "step0.5":
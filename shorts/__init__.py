@@ -2,8 +2,20 @@
 ショート動画生成パッケージ
 """
 
-from .short_generator import generate_short_video
+from .short_generator import (
+    generate_short_video,
+    generate_multi_scene_short,
+    generate_shorts_multi,
+    build_short_filter_chain,
+    build_short_cuda_graph,
+    probe_input_video
+)
 
 __all__ = [
-    'generate_short_video'
+    'generate_short_video',
+    'generate_multi_scene_short',
+    'generate_shorts_multi',
+    'build_short_filter_chain',
+    'build_short_cuda_graph',
+    'probe_input_video'
 ]
@@ -3,10 +3,74 @@
 ショート動画生成モジュール - final.mp4から時間指定で切り出して縦型動画を生成
 """
 
+import hashlib
+import json
 import os
+import re
 import subprocess
+import tempfile
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# "hh:mm:ss" / "mm:ss" / "ss"（秒は小数可）にマッチする時刻文字列パターン
+_TIME_RE = re.compile(r'^\s*(?:(?:(\d+):)?(\d+):)?(\d+(?:\.\d+)?)\s*$')
+
+# ストリームコピーで切り出すときに、開始時刻とキーフレームのずれを許す幅（秒、約1フレーム）
+_KEYFRAME_TOLERANCE = 0.02
+
+# libx264のプリセットと品質（ショートは数十秒なので速度を優先する。環境変数で上書き可）
+# veryfastはmediumより数倍速く、CRFを1下げて画質の差を埋める
+_X264_PRESET = 'veryfast'
+_X264_CRF = '22'
+
+# ハードウェアエンコーダごとのエンコードオプション（libx264 の crf 23 と同程度の品質）
+_HW_ENCODER_ARGS = {
+    # -b:v 0 で品質指定（-cq）を優先させる
+    'h264_nvenc': ['-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-b:v', '0'],
+    'h264_qsv': ['-c:v', 'h264_qsv', '-preset', 'veryfast', '-global_quality', '23'],
+    # VideoToolboxは品質指定に対応しない環境があるため、合成（step6）と同じくビットレートで指定する
+    'h264_videotoolbox': ['-c:v', 'h264_videotoolbox', '-b:v', '8M'],
+}
+
+# ハードウェアデコードのオプション（デコード結果はCPUフィルター用にシステムメモリへ戻す）
+_HWACCEL_INPUT_ARGS = {
+    'h264_nvenc': ['-hwaccel', 'cuda'],
+    'h264_videotoolbox': ['-hwaccel', 'videotoolbox'],
+}
+
+# これより長いfilter_complexはコマンドライン引数ではなくファイルで渡す（文字数）
+# Windowsのコマンドライン長の上限（32767文字）に余裕を持たせた値
+_FILTER_SCRIPT_THRESHOLD = 8192
+
+# FFmpeg失敗時に表示するstderrの末尾の行数（それより前の出力は読み捨てる）
+_FFMPEG_STDERR_TAIL_LINES = 40
+
+# NVENC使用時にGPU上でscale・合成を行うためのCUDAデバイス指定（デコード・フィルターで同じデバイスを使う）
+_CUDA_DEVICE_ARGS = [
+    '-init_hw_device', 'cuda=cu', '-filter_hw_device', 'cu',
+    '-hwaccel', 'cuda', '-hwaccel_device', 'cu', '-hwaccel_output_format', 'cuda'
+]
+
+# drawtextのテキストでエスケープが必要な文字（1回のtranslateで置き換える）
+_DRAWTEXT_ESCAPES = str.maketrans({
+    '\\': r'\\\\',
+    ':': r'\:',
+    "'": r"\'",
+    '%': r'\%',
+    '[': r'\[',
+    ']': r'\]'
+})
+
+# フィルター式で区切り文字になり得る記号
+_FILTER_EXPR_ESCAPES = str.maketrans({
+    '\\': r'\\\\',
+    ':': r'\:',
+    ',': r'\,'
+})
 
 
 def parse_time_to_seconds(time_str: str) -> float:
@@ -19,50 +83,63 @@ def parse_time_to_seconds(time_str: str) -> float:
     Returns:
         秒数
     """
-    parts = time_str.split(':')
-    if len(parts) == 3:
-        h, m, s = map(float, parts)
-        return h * 3600 + m * 60 + s
-    elif len(parts) == 2:
-        m, s = map(float, parts)
-        return m * 60 + s
-    else:
-        return float(parts[0])
+    m = _TIME_RE.match(time_str)
+    if m is None:
+        raise ValueError(f"Invalid time format: {time_str}")
+    hours, minutes, seconds = m.groups()
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60 + float(seconds)
 
 
 def escape_drawtext_text(text: str) -> str:
     """
     drawtextフィルター用に文字列をエスケープ
     """
-    replacements = {
-        '\\': r'\\\\',
-        ':': r'\:',
-        "'": r"\'",
-        '%': r'\%',
-        '[': r'\[',
-        ']': r'\]'
-    }
-    escaped = text
-    for original, replacement in replacements.items():
-        escaped = escaped.replace(original, replacement)
-    return escaped
+    return text.translate(_DRAWTEXT_ESCAPES)
 
 
 def escape_filter_expr(expr: str) -> str:
     """
     FFmpegフィルター式で区切り文字になり得る記号をエスケープ
     """
-    replacements = {
-        '\\': r'\\\\',
-        ':': r'\:',
-        ',': r'\,'
-    }
-    escaped = expr
-    for original, replacement in replacements.items():
-        escaped = escaped.replace(original, replacement)
-    return escaped
+    return expr.translate(_FILTER_EXPR_ESCAPES)
+
+
+@lru_cache(maxsize=32)
+def _font_is_file(font: str) -> bool:
+    """フォント指定がファイルパスかどうか（同じフォントの存在確認は1回だけ行う）"""
+    return Path(font).exists()
+
+
+@lru_cache(maxsize=32)
+def _match_font_file(font: str) -> Optional[str]:
+    """
+    フォント名（fontconfigのパターン）に対応するフォントファイルを1回だけ調べる
+
+    drawtextに font= を渡すと、FFmpegを起動するたびにdrawtextごとにfontconfigの
+    初期化と検索が行われる。ファイルパスに解決して fontfile= で渡せばそれを省ける。
+    ただしdrawtextの fontfile= は常にファイル内の先頭の書体を使うため、
+    .ttc（NotoSansCJKなど）の2番目以降の書体に一致した場合は解決しない（font= で渡す）。
 
+    Returns:
+        フォントファイルのパス。fc-match が無い・見つからない・先頭以外の書体の場合はNone
+    """
+    try:
+        result = subprocess.run(
+            ['fc-match', '--format=%{file}:%{index}', font],
+            capture_output=True,
+            text=True
+        )
+    except OSError:
+        return None
+    path, _, index = result.stdout.strip().rpartition(':')
+    if result.returncode != 0 or not path or not os.path.isfile(path):
+        return None
+    if index not in ('', '0'):
+        return None
+    return path
 
+
+@lru_cache(maxsize=256)
 def build_drawtext_filter(
     text: str,
     y_expr: str,
@@ -76,6 +153,8 @@ def build_drawtext_filter(
 ) -> str:
     """
     drawtextフィルター文字列を構築
+
+    同じ引数の結果はキャッシュする（複数のショートで同じテキスト・スタイルを使う場合）。
     """
     parts = [
         f"text='{escape_drawtext_text(text)}'",
@@ -87,10 +166,10 @@ def build_drawtext_filter(
     ]
 
     if font:
-        # パスが存在する場合はfontfileとして扱う
-        font_path = Path(font)
-        if font_path.exists():
-            parts.append(f"fontfile='{escape_drawtext_text(str(font_path))}'")
+        # パスが存在する場合はfontfileとして扱い、フォント名は事前にファイルへ解決しておく
+        font_file = str(Path(font)) if _font_is_file(font) else _match_font_file(font)
+        if font_file:
+            parts.append(f"fontfile='{escape_drawtext_text(font_file)}'")
         else:
             parts.append(f"font='{escape_drawtext_text(font)}'")
 
@@ -102,12 +181,610 @@ def build_drawtext_filter(
     return "drawtext=" + ":".join(parts)
 
 
+def probe_input_video(input_video: str) -> Tuple[int, int, bool]:
+    """
+    入力動画の解像度と音声の有無を取得
+
+    同じファイル（パス・更新時刻・サイズが一致）の結果はキャッシュを返す。
+
+    Args:
+        input_video: 入力動画ファイルのパス
+
+    Returns:
+        (幅, 高さ, 音声ストリームがあるか)
+    """
+    info = _probe_input_streams(input_video)
+    return info['width'], info['height'], info['has_audio']
+
+
+def _probe_input_streams(input_video: str) -> Dict[str, object]:
+    """
+    入力動画のストリーム情報を1回のffprobeでまとめて取得（キャッシュあり）
+
+    Returns:
+        width, height, has_audio, frame_rate（"30000/1001" 形式）,
+        duration（秒、取得できなければNone）の辞書
+    """
+    st = os.stat(input_video)
+    return _probe_input_video(os.path.abspath(input_video), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=64)
+def _probe_input_video(input_video: str, mtime_ns: int, size: int) -> Dict[str, object]:
+    """ffprobeの実行本体（mtime_ns/sizeはキャッシュキー用）"""
+    cmd_probe = [
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries', 'stream=codec_type,width,height,r_frame_rate:format=duration',
+        '-of', 'json',
+        input_video
+    ]
+    result = subprocess.run(cmd_probe, capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout)
+    streams = data.get('streams', [])
+    video = next(s for s in streams if s.get('codec_type') == 'video')
+    try:
+        duration = float(data.get('format', {})['duration'])
+    except (KeyError, TypeError, ValueError):
+        duration = None
+    return {
+        'width': int(video['width']),
+        'height': int(video['height']),
+        'has_audio': any(s.get('codec_type') == 'audio' for s in streams),
+        'frame_rate': video.get('r_frame_rate') or '30',
+        'duration': duration,
+    }
+
+
+# 上部・下部テキストの既定のスタイル（overlay_settingsに無い場合）
+_TEXT_BLOCK_DEFAULT_FONTSIZE = {'top': 72, 'bottom': 64}
+
+
+@dataclass(frozen=True)
+class _TextBlock:
+    """
+    上部・下部テキスト1つ分の設定
+
+    overlay_settings（辞書）から型変換も含めて1回だけ取り出し、フィルター構築中は
+    属性として参照する。
+    """
+    __slots__ = (
+        'lines', 'colors', 'font', 'fontsize', 'box', 'box_color', 'box_border', 'offset_y'
+    )
+
+    lines: Tuple[str, ...]
+    colors: Tuple[str, ...]
+    font: str
+    fontsize: int
+    box: bool
+    box_color: str
+    box_border: int
+    offset_y: int
+
+    @classmethod
+    def from_settings(cls, overlay_settings: Dict[str, object], side: str) -> Optional['_TextBlock']:
+        """
+        overlay_settings の top_* / bottom_* から設定を取り出す
+
+        Args:
+            overlay_settings: 上下テキストやスタイル設定
+            side: 'top' または 'bottom'
+
+        Returns:
+            テキストが無ければNone
+        """
+        text = overlay_settings.get(f'{side}_text')
+        if not text:
+            return None
+        lines = tuple(str(line) for line in (overlay_settings.get(f'{side}_lines') or str(text).split('\n')))
+        line_colors = overlay_settings.get(f'{side}_line_colors', {})
+        default_color = str(overlay_settings.get(f'{side}_color', 'white'))
+        return cls(
+            lines=lines,
+            colors=tuple(line_colors.get(idx + 1, default_color) for idx in range(len(lines))),
+            font=str(overlay_settings.get(f'{side}_font') or ''),
+            fontsize=int(overlay_settings.get(f'{side}_fontsize', _TEXT_BLOCK_DEFAULT_FONTSIZE[side])),
+            box=bool(overlay_settings.get(f'{side}_box', True)),
+            box_color=str(overlay_settings.get(f'{side}_box_color', 'black@0.6')),
+            box_border=int(overlay_settings.get(f'{side}_box_border', 24)),
+            offset_y=int(overlay_settings.get(f'{side}_offset_y', 0))
+        )
+
+
+def _build_text_block_filters(block: _TextBlock, y_expr: str) -> List[str]:
+    """
+    上部・下部テキスト（複数行）のdrawtextフィルターを構築
+
+    1行ずつdrawtextを並べる。改行で結合した1つのdrawtextにすると、ボックスが
+    ブロック全体で1つになり、行送りもフォントの行の高さに依存して変わってしまう。
+
+    Args:
+        block: テキストの設定
+        y_expr: テキストブロックの縦位置の式
+
+    Returns:
+        drawtextフィルターのリスト
+    """
+    if block.offset_y:
+        y_expr = f"({y_expr})-({block.offset_y})"
+    line_spacing = max(6, int(block.fontsize * 0.15))
+    style = dict(
+        font=block.font,
+        fontsize=block.fontsize,
+        box=block.box,
+        box_color=block.box_color,
+        box_border=block.box_border,
+        text_align="center"
+    )
+
+    line_height = block.fontsize + line_spacing + (block.box_border * 2)
+    total_offset = ((len(block.lines) - 1) * line_height) / 2
+    filters = []
+    for idx, line_text in enumerate(block.lines):
+        if not line_text:
+            continue
+        line_y_expr = y_expr
+        shift = -total_offset + idx * line_height
+        if shift:
+            line_y_expr = f"({y_expr})+({shift})"
+        filters.append(
+            build_drawtext_filter(
+                text=line_text,
+                y_expr=line_y_expr,
+                color=block.colors[idx],
+                **style
+            )
+        )
+    return filters
+
+
+def _short_canvas_geometry(width: int, height: int) -> Tuple[int, int, int]:
+    """1080幅に収めた時の高さと上下のパディングを返す"""
+    scaled_height = int(1080 * height / width)
+    pad_top = (1920 - scaled_height) // 2
+    pad_bottom = 1920 - scaled_height - pad_top
+    return scaled_height, pad_top, pad_bottom
+
+
+def _build_overlay_text_filters(
+    pad_top: int,
+    pad_bottom: int,
+    overlay_settings: Optional[Dict[str, object]] = None
+) -> List[str]:
+    """
+    1080x1920キャンバスの上下にテキストを描画するdrawtextフィルターを構築
+
+    Args:
+        pad_top: 上部の余白（px）
+        pad_bottom: 下部の余白（px）
+        overlay_settings: 上下テキストやスタイル設定
+
+    Returns:
+        drawtextフィルターのリスト（テキストが無ければ空）
+    """
+    filters = []
+    overlay_settings = overlay_settings or {}
+
+    # 上部テキスト
+    top = _TextBlock.from_settings(overlay_settings, 'top')
+    if top:
+        top_y = f"max(20,({pad_top}-text_h)/2)" if pad_top > 0 else "20"
+        filters.extend(_build_text_block_filters(top, top_y))
+
+    # 下部テキスト
+    bottom = _TextBlock.from_settings(overlay_settings, 'bottom')
+    if bottom:
+        if pad_bottom > 0:
+            bottom_y = f"{1920 - pad_bottom}+max(20,({pad_bottom}-text_h)/2)"
+        else:
+            bottom_y = "h-text_h-20"
+        filters.extend(_build_text_block_filters(bottom, bottom_y))
+
+    return filters
+
+
+def build_short_filter_chain(
+    width: int,
+    height: int,
+    overlay_settings: Optional[Dict[str, object]] = None
+) -> str:
+    """
+    縦型キャンバスへのscale・padと上下テキスト描画のフィルターチェーンを構築
+
+    Args:
+        width: 元動画の幅
+        height: 元動画の高さ
+        overlay_settings: 上下テキストやスタイル設定
+
+    Returns:
+        カンマ区切りのフィルターチェーン
+        （入力が既に1080x1920でテキストも無く、変換が不要な場合は空文字列）
+    """
+    scaled_height, pad_top, pad_bottom = _short_canvas_geometry(width, height)
+    text_filters = _build_overlay_text_filters(pad_top, pad_bottom, overlay_settings)
+
+    if width == 1080 and height == 1920 and not text_filters:
+        # scale・padとも何もしないので、フィルター自体が不要
+        return ""
+    return ",".join([
+        f'scale=1080:{scaled_height}',
+        f'pad=1080:1920:0:{pad_top}:black',
+        *text_filters
+    ])
+
+
+@lru_cache(maxsize=1)
+def _cuda_filters_available() -> bool:
+    """FFmpegにscale_cuda・overlay_cudaフィルターが組み込まれているか"""
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-filters'], capture_output=True, text=True)
+    except OSError:
+        return False
+    names = {fields[1] for fields in map(str.split, result.stdout.splitlines()) if len(fields) > 2}
+    return {'scale_cuda', 'overlay_cuda'} <= names
+
+
+def _render_text_layer(text_filters: List[str]) -> Optional[str]:
+    """
+    上下テキストを透明な1080x1920のPNGに1回だけ描画する
+
+    テキストは動画の間ずっと同じなので、フレームごとにdrawtextを実行せず
+    この画像を重ねれば済む。同じ内容の画像が既にあれば再利用する。
+
+    Args:
+        text_filters: _build_overlay_text_filters の戻り値
+
+    Returns:
+        PNGのパス。描画に失敗した場合はNone
+    """
+    chain = ','.join([*text_filters, 'format=rgba'])
+    digest = hashlib.blake2b(chain.encode('utf-8'), digest_size=8).hexdigest()
+    layer_path = os.path.join(tempfile.gettempdir(), f'kirinuki-short-text-{digest}.png')
+    if os.path.exists(layer_path):
+        return layer_path
+
+    # 並列生成で同じ画像を同時に描画しても壊れないよう、別名で書いてから置き換える
+    fd, tmp_path = tempfile.mkstemp(suffix='.png', dir=os.path.dirname(layer_path))
+    os.close(fd)
+    cmd = [
+        'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'color=c=black@0.0:s=1080x1920,format=rgba',
+        '-vf', chain,
+        '-frames:v', '1',
+        tmp_path
+    ]
+    returncode, _ = _run_ffmpeg(cmd)
+    if returncode != 0:
+        os.remove(tmp_path)
+        return None
+    os.replace(tmp_path, layer_path)
+    return layer_path
+
+
+def build_short_cuda_graph(
+    input_video: str,
+    overlay_settings: Optional[Dict[str, object]] = None
+) -> Optional[Tuple[List[str], str]]:
+    """
+    NVENC用に、scaleとキャンバスへの合成をGPU上で行うfilter_complexを構築
+
+    CPUのscale・pad・drawtextを使うと、デコードしたフレームを一度システムメモリに
+    戻してからNVENCへ送り直すことになる。黒背景への配置はoverlay_cudaで行い、
+    上下テキストは事前に描画した透明PNGを重ねるので、フレームはGPU上から出ない。
+
+    Args:
+        input_video: 入力動画ファイルのパス
+        overlay_settings: 上下テキストやスタイル設定
+
+    Returns:
+        (テキスト画像の入力オプション, filter_complex)。出力は [out_v]。
+        CUDAフィルターが使えない場合やテキスト画像の描画に失敗した場合はNone
+    """
+    if not _cuda_filters_available():
+        return None
+
+    info = _probe_input_streams(input_video)
+    scaled_height, pad_top, pad_bottom = _short_canvas_geometry(info['width'], info['height'])
+    text_filters = _build_overlay_text_filters(pad_top, pad_bottom, overlay_settings)
+
+    graph = [
+        f"color=c=black:s=1080x1920:r={info['frame_rate']},format=yuv420p,hwupload_cuda[bg]",
+        f'[0:v]scale_cuda=1080:{scaled_height}:format=yuv420p[v]',
+    ]
+    if not text_filters:
+        graph.append(f'[bg][v]overlay_cuda=x=0:y={pad_top}:shortest=1[out_v]')
+        return [], ';'.join(graph)
+
+    layer_path = _render_text_layer(text_filters)
+    if layer_path is None:
+        return None
+    graph.extend([
+        f'[bg][v]overlay_cuda=x=0:y={pad_top}:shortest=1[base]',
+        '[1:v]format=yuva420p,hwupload_cuda[text]',
+        '[base][text]overlay_cuda=x=0:y=0[out_v]',
+    ])
+    return ['-loop', '1', '-i', layer_path], ';'.join(graph)
+
+
+def _video_encoder_args(hwenc: Optional[str] = None) -> List[str]:
+    """
+    動画エンコードのオプションを返す
+
+    Args:
+        hwenc: ハードウェアエンコーダ名（NVENC / Quick Sync / VideoToolbox、それ以外はlibx264）
+            libx264のプリセット・CRFは KIRINUKI_SHORT_X264_PRESET / KIRINUKI_SHORT_X264_CRF で上書きできる
+
+    Returns:
+        -c:v 以降のエンコードオプション
+    """
+    if hwenc in _HW_ENCODER_ARGS:
+        return list(_HW_ENCODER_ARGS[hwenc])
+    preset = os.environ.get('KIRINUKI_SHORT_X264_PRESET') or _X264_PRESET
+    crf = os.environ.get('KIRINUKI_SHORT_X264_CRF') or _X264_CRF
+    return ['-c:v', 'libx264', '-preset', preset, '-crf', crf]
+
+
+def _filter_thread_args(threads: Optional[int] = None) -> List[str]:
+    """
+    フィルター処理のスレッド数のオプションを返す
+
+    FFmpegの既定ではフィルターもCPUコア数ぶんのスレッドを使うため、複数の
+    FFmpegを同時に動かすときは1プロセスあたりのスレッド数に揃えて奪い合いを防ぐ。
+
+    Args:
+        threads: 1プロセスあたりのスレッド数（Noneなら指定しない）
+
+    Returns:
+        -i の前に置くグローバルオプション
+    """
+    if not threads:
+        return []
+    return ['-filter_threads', str(threads), '-filter_complex_threads', str(threads)]
+
+
+def _output_args(output_video: str) -> List[str]:
+    """
+    出力ファイルの直前に置くマルチプレクサのオプションを返す
+
+    MP4/MOVはmoovを先頭に置き（アップロード後すぐ再生・処理できる）、
+    複数出力や重いフィルターでパケットが溜まっても失敗しないようキューを広げる。
+
+    Args:
+        output_video: 出力動画ファイルのパス
+
+    Returns:
+        出力ファイルの前に置くオプション
+    """
+    args = ['-max_muxing_queue_size', '9999']
+    if output_video.lower().endswith(('.mp4', '.m4v', '.mov')):
+        args[:0] = ['-movflags', '+faststart']
+    return args
+
+
+def _hwaccel_input_args(hwenc: Optional[str] = None) -> List[str]:
+    """
+    入力側のハードウェアデコードオプションを返す
+
+    drawtextなどはCPUフィルターなので、デコード結果はシステムメモリに戻す
+    （-hwaccel_output_format は付けない）。
+
+    Args:
+        hwenc: ハードウェアエンコーダ名
+
+    Returns:
+        -i の前に置くオプション
+    """
+    return list(_HWACCEL_INPUT_ARGS.get(hwenc, []))
+
+
+def _run_ffmpeg(cmd: List[str]) -> Tuple[int, str]:
+    """
+    FFmpegを実行し、stderrは末尾の数行だけを保持する
+
+    stderrを全部メモリに溜めず1行ずつ読み捨てるので、長いエンコードで
+    ログが多くてもメモリ使用量は増えない（stdoutは捨てるのでパイプ詰まりも起きない）。
+
+    Args:
+        cmd: 実行するコマンド
+
+    Returns:
+        (終了コード, stderrの末尾)
+    """
+    tail = deque(maxlen=_FFMPEG_STDERR_TAIL_LINES)
+    with subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors='replace'
+    ) as proc:
+        for line in proc.stderr:
+            tail.append(line)
+    return proc.returncode, ''.join(tail)
+
+
+def _run_with_encoder_fallback(build_cmd: Callable[[Optional[str]], List[str]], hwenc: Optional[str]) -> bool:
+    """
+    FFmpegを実行し、ハードウェアエンコードに失敗した場合はlibx264でやり直す
+
+    Args:
+        build_cmd: エンコーダ名（Noneでlibx264）を受け取りコマンドを返す関数
+        hwenc: 最初に試すハードウェアエンコーダ名
+
+    Returns:
+        成功した場合True
+    """
+    encoders = [hwenc, None] if hwenc in _HW_ENCODER_ARGS else [None]
+    for encoder in encoders:
+        returncode, stderr_tail = _run_ffmpeg(build_cmd(encoder))
+        if returncode == 0:
+            return True
+        if encoder:
+            print(f"  Hardware encoder {encoder} failed, retrying with libx264...")
+            continue
+        print(f"✗ FFmpeg error: {stderr_tail}")
+    return False
+
+
+def _starts_on_keyframe(input_video: str, start_time: str) -> bool:
+    """
+    開始時刻が映像のキーフレーム上にあるか（ストリームコピーで正確に切り出せるか）
+
+    Args:
+        input_video: 入力動画ファイルのパス
+        start_time: 開始時刻
+
+    Returns:
+        開始位置のキーフレームとの差が1フレーム未満ならTrue
+    """
+    start = parse_time_to_seconds(start_time)
+    if start <= 0:
+        return True
+    # 開始時刻の直前のキーフレームへシークし、そのキーフレームの時刻だけを読む
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-skip_frame', 'nokey',
+        '-read_intervals', f'{start}%+#1',
+        '-show_entries', 'frame=pts_time,best_effort_timestamp_time',
+        '-of', 'csv=p=0',
+        input_video
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return False
+    for value in result.stdout.replace('\n', ',').split(','):
+        try:
+            return abs(float(value) - start) < _KEYFRAME_TOLERANCE
+        except ValueError:
+            continue
+    return False
+
+
+def _scene_duration(input_video: str, start_time: str, end_time: str) -> Optional[float]:
+    """
+    シーンの長さ（秒）を入力動画の終端に収まるように計算する
+
+    Args:
+        input_video: 入力動画ファイルのパス
+        start_time: 開始時刻
+        end_time: 終了時刻
+
+    Returns:
+        シーンの長さ。範囲が不正、または開始時刻が入力動画の終端以降ならNone
+    """
+    start = parse_time_to_seconds(start_time)
+    duration = parse_time_to_seconds(end_time) - start
+    if duration <= 0:
+        print(f"✗ Invalid time range: {start_time} - {end_time}")
+        return None
+    # 長さは解像度と同じffprobeの結果（キャッシュ済み）から取る
+    input_duration = _probe_input_streams(input_video)['duration']
+    if input_duration is not None:
+        if start >= input_duration:
+            print(f"✗ Scene starts after the end of the input ({input_duration:.3f}s): {start_time}")
+            return None
+        duration = min(duration, input_duration - start)
+    return duration
+
+
+def _run_short_ffmpeg(
+    input_video: str,
+    output_video: str,
+    start_time: str,
+    end_time: str,
+    filter_chain: str,
+    threads: Optional[int] = None,
+    hwenc: Optional[str] = None,
+    cuda_graph: Optional[Tuple[List[str], str]] = None
+) -> bool:
+    """
+    FFmpegで時間切り出し + スケール + パディング + テキスト描画を実行
+
+    Args:
+        input_video: 入力動画ファイルのパス
+        output_video: 出力動画ファイルのパス
+        start_time: 開始時刻
+        end_time: 終了時刻
+        filter_chain: -vf に渡すフィルターチェーン
+        threads: FFmpegのスレッド数（Noneで自動）
+        hwenc: ハードウェアエンコーダ名（Noneでlibx264）
+        cuda_graph: build_short_cuda_graph の戻り値（NVENC使用時にGPU上で処理する）
+
+    Returns:
+        成功した場合True
+    """
+    # 入力側でシークし、長さ（-t）も入力オプションで指定する（開始時刻からの長さを1回だけ計算）
+    duration = _scene_duration(input_video, start_time, end_time)
+    if duration is None:
+        return False
+    input_args = ['-ss', start_time, '-t', f'{duration:.3f}', '-i', input_video]
+
+    if not filter_chain:
+        # 変換が不要で開始位置がキーフレームなら、再エンコードせず切り出すだけで済む
+        if _starts_on_keyframe(input_video, start_time):
+            cmd = [
+                'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+                *input_args,
+                '-map', '0:v:0', '-map', '0:a:0?',
+                '-c', 'copy',
+                *_output_args(output_video),
+                output_video
+            ]
+            returncode, _ = _run_ffmpeg(cmd)
+            if returncode == 0:
+                print(f"✓ Short video generated (stream copy): {output_video}")
+                return True
+        # キーフレーム以外から始まる場合は正確に切るため再エンコードする
+        filter_chain = 'null'
+
+    if hwenc == 'h264_nvenc' and cuda_graph:
+        text_inputs, graph = cuda_graph
+        cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error', *_CUDA_DEVICE_ARGS]
+        cmd.extend(_filter_thread_args(threads))
+        cmd.extend(input_args)
+        cmd.extend(text_inputs)
+        cmd.extend(['-filter_complex', graph, '-map', '[out_v]', '-map', '0:a:0?'])
+        cmd.extend(_video_encoder_args(hwenc))
+        cmd.extend(['-c:a', 'aac', '-b:a', '128k'])
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        cmd.extend(_output_args(output_video))
+        cmd.append(output_video)
+        returncode, _ = _run_ffmpeg(cmd)
+        if returncode == 0:
+            print(f"✓ Short video generated (CUDA filters): {output_video}")
+            return True
+        print("  CUDA filters failed, retrying with CPU filters...")
+
+    def build_cmd(encoder: Optional[str]) -> List[str]:
+        cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error']
+        cmd.extend(_filter_thread_args(threads))
+        cmd.extend(_hwaccel_input_args(encoder))
+        cmd.extend(input_args)
+        cmd.extend(['-vf', filter_chain])
+        cmd.extend(_video_encoder_args(encoder))
+        cmd.extend(['-c:a', 'aac', '-b:a', '128k'])
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        cmd.extend(_output_args(output_video))
+        cmd.append(output_video)
+        return cmd
+
+    if not _run_with_encoder_fallback(build_cmd, hwenc):
+        return False
+
+    print(f"✓ Short video generated: {output_video}")
+    return True
+
+
 def generate_short_video(
     input_video: str,
     output_video: str,
     start_time: str,
     end_time: str,
-    overlay_settings: Optional[Dict[str, object]] = None
+    overlay_settings: Optional[Dict[str, object]] = None,
+    threads: Optional[int] = None,
+    filter_chain: Optional[str] = None,
+    hwenc: Optional[str] = None,
+    cuda_graph: Optional[Tuple[List[str], str]] = None
 ) -> bool:
     """
     final.mp4から時間指定で切り出して縦型ショート動画を生成
@@ -124,22 +801,24 @@ def generate_short_video(
         start_time: 開始時刻（hh:mm:ss）
         end_time: 終了時刻（hh:mm:ss）
         overlay_settings: 上下テキストやスタイル設定
+        threads: FFmpegのスレッド数（並列生成時の過剰なスレッド数を防ぐ、Noneで自動）
+        filter_chain: 構築済みのフィルターチェーン（build_short_filter_chain の戻り値）
+            同じ入力から複数シーンを作る場合に、解像度の取得とテキスト描画の構築を省く
+        hwenc: ハードウェアエンコーダ名（detect_hw_encoder の戻り値、失敗時はlibx264）
+        cuda_graph: 構築済みのGPU用フィルター（build_short_cuda_graph の戻り値、filter_chainと併せて渡す）
 
     Returns:
         成功した場合True
     """
     try:
+        if filter_chain is not None:
+            print(f"\nGenerating short video: {start_time} - {end_time} → {output_video}")
+            return _run_short_ffmpeg(
+                input_video, output_video, start_time, end_time, filter_chain, threads, hwenc, cuda_graph
+            )
+
         # 動画の解像度を取得
-        cmd_probe = [
-            'ffprobe',
-            '-v', 'error',
-            '-select_streams', 'v:0',
-            '-show_entries', 'stream=width,height',
-            '-of', 'csv=p=0',
-            input_video
-        ]
-        result = subprocess.run(cmd_probe, capture_output=True, text=True, check=True)
-        width, height = map(int, result.stdout.strip().split(','))
+        width, height, _ = probe_input_video(input_video)
 
         print("=" * 60)
         print("Short Video Generator")
@@ -167,121 +846,16 @@ def generate_short_video(
         print(f"  3. Add padding: top={pad_top}px, bottom={pad_bottom}px")
         print(f"  4. Final size: 1080x1920")
 
-        # フィルターチェーンを準備
-        filters = [
-            f'scale=1080:{scaled_height}',
-            f'pad=1080:1920:0:{pad_top}:black'
-        ]
-
-        overlay_settings = overlay_settings or {}
-
-        # 上部テキスト
-        top_text = overlay_settings.get('top_text')
-        if top_text:
-            if pad_top > 0:
-                top_y = f"max(20,({pad_top}-text_h)/2)"
-            else:
-                top_y = "20"
-            top_offset = int(overlay_settings.get('top_offset_y', 0))
-            if top_offset:
-                top_y = f"({top_y})-({top_offset})"
-            top_lines = overlay_settings.get('top_lines') or str(top_text).split('\n')
-            top_line_colors = overlay_settings.get('top_line_colors', {})
-            line_spacing = max(6, int(int(overlay_settings.get('top_fontsize', 72)) * 0.15))
-            box_border = int(overlay_settings.get('top_box_border', 24))
-            line_height = int(overlay_settings.get('top_fontsize', 72)) + line_spacing + (box_border * 2)
-            total_offset = ((len(top_lines) - 1) * line_height) / 2 if top_lines else 0
-            for idx, line_text in enumerate(top_lines):
-                line_color = top_line_colors.get(idx + 1, str(overlay_settings.get('top_color', 'white')))
-                line_y_expr = top_y
-                if len(top_lines) > 1:
-                    shift = -total_offset + idx * line_height
-                    if shift:
-                        line_y_expr = f"({top_y})+({shift})"
-                if not line_text:
-                    continue
-                filters.append(
-                    build_drawtext_filter(
-                        text=str(line_text),
-                        y_expr=line_y_expr,
-                        font=str(overlay_settings.get('top_font') or ''),
-                        fontsize=int(overlay_settings.get('top_fontsize', 72)),
-                        color=line_color,
-                        box=bool(overlay_settings.get('top_box', True)),
-                        box_color=str(overlay_settings.get('top_box_color', 'black@0.6')),
-                        box_border=box_border,
-                        text_align="center"
-                    )
-                )
-
-        # 下部テキスト
-        bottom_text = overlay_settings.get('bottom_text')
-        if bottom_text:
-            if pad_bottom > 0:
-                base_y = 1920 - pad_bottom
-                bottom_y = f"{base_y}+max(20,({pad_bottom}-text_h)/2)"
-            else:
-                bottom_y = "h-text_h-20"
-            bottom_offset = int(overlay_settings.get('bottom_offset_y', 0))
-            if bottom_offset:
-                bottom_y = f"({bottom_y})-({bottom_offset})"
-
-            bottom_lines = overlay_settings.get('bottom_lines') or str(bottom_text).split('\n')
-            bottom_line_colors = overlay_settings.get('bottom_line_colors', {})
-            bottom_fontsize = int(overlay_settings.get('bottom_fontsize', 64))
-            bottom_line_spacing = max(6, int(bottom_fontsize * 0.15))
-            bottom_box_border = int(overlay_settings.get('bottom_box_border', 24))
-            bottom_line_height = bottom_fontsize + bottom_line_spacing + (bottom_box_border * 2)
-            bottom_total_offset = ((len(bottom_lines) - 1) * bottom_line_height) / 2 if bottom_lines else 0
-
-            for idx, line_text in enumerate(bottom_lines):
-                line_color = bottom_line_colors.get(idx + 1, str(overlay_settings.get('bottom_color', 'white')))
-                line_y_expr = bottom_y
-                if len(bottom_lines) > 1:
-                    shift = -bottom_total_offset + idx * bottom_line_height
-                    if shift:
-                        line_y_expr = f"({bottom_y})+({shift})"
-                if not line_text:
-                    continue
-                filters.append(
-                    build_drawtext_filter(
-                        text=str(line_text),
-                        y_expr=line_y_expr,
-                        font=str(overlay_settings.get('bottom_font') or ''),
-                        fontsize=bottom_fontsize,
-                        color=line_color,
-                        box=bool(overlay_settings.get('bottom_box', True)),
-                        box_color=str(overlay_settings.get('bottom_box_color', 'black@0.6')),
-                        box_border=bottom_box_border,
-                        text_align="center"
-                    )
-                )
-
-        filter_chain = ",".join(filters)
-
-        # FFmpegで時間切り出し + スケール + パディング + テキスト描画
-        cmd = [
-            'ffmpeg', '-y',
-            '-ss', start_time,
-            '-to', end_time,
-            '-i', input_video,
-            '-vf', filter_chain,
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-crf', '23',
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            output_video
-        ]
+        filter_chain = build_short_filter_chain(width, height, overlay_settings)
+        if hwenc == 'h264_nvenc' and filter_chain:
+            cuda_graph = build_short_cuda_graph(input_video, overlay_settings)
 
         print(f"\nGenerating short video...")
-        result = subprocess.run(cmd, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            print(f"✗ FFmpeg error: {result.stderr}")
+        if not _run_short_ffmpeg(
+            input_video, output_video, start_time, end_time, filter_chain, threads, hwenc, cuda_graph
+        ):
             return False
 
-        print(f"✓ Short video generated: {output_video}")
         print("\n" + "=" * 60)
         print("✓ Short video generation completed!")
         print("=" * 60)
@@ -296,3 +870,237 @@ def generate_short_video(
         import traceback
         traceback.print_exc()
         return False
+
+
+def generate_shorts_multi(
+    input_video: str,
+    jobs: List[Tuple[str, str, str]],
+    filter_chain: str,
+    hwenc: Optional[str] = None,
+    threads: Optional[int] = None
+) -> bool:
+    """
+    同じ入力から複数のショートを1回のFFmpeg実行（複数出力）で生成
+
+    シーンごとに入力を開き、入力側の -ss/-t でそのシーンの区間だけをシーク・デコードする。
+    （1つの入力を出力側の -ss で切り出すと、各出力が最初のシーンから自分の開始位置まで
+    デコードとフィルター処理を繰り返すため、離れたシーンほど無駄が大きくなる）
+
+    Args:
+        input_video: 入力動画ファイルのパス
+        jobs: (開始時刻, 終了時刻, 出力ファイルのパス) のリスト
+        filter_chain: 各出力に適用するフィルターチェーン（build_short_filter_chain の戻り値）
+        hwenc: ハードウェアエンコーダ名（detect_hw_encoder の戻り値、失敗時はlibx264）
+        threads: FFmpegのスレッド数（他のFFmpegと同時に動かす場合に指定、Noneで自動）
+
+    Returns:
+        成功した場合True
+    """
+    ranges = []
+    for start_time, end_time, output_video in jobs:
+        duration = _scene_duration(input_video, start_time, end_time)
+        if duration is None:
+            return False
+        ranges.append((parse_time_to_seconds(start_time), duration, output_video))
+
+    def build_cmd(encoder: Optional[str]) -> List[str]:
+        cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error']
+        cmd.extend(_filter_thread_args(threads))
+        for start, duration, _ in ranges:
+            cmd.extend(_hwaccel_input_args(encoder))
+            cmd.extend(['-ss', f'{start:.3f}', '-t', f'{duration:.3f}', '-i', input_video])
+        for i, (_, _, output_video) in enumerate(ranges):
+            cmd.extend([
+                '-map', f'{i}:v:0', '-map', f'{i}:a:0?',
+                '-vf', filter_chain or 'null'
+            ])
+            cmd.extend(_video_encoder_args(encoder))
+            cmd.extend(['-c:a', 'aac', '-b:a', '128k'])
+            if threads:
+                cmd.extend(['-threads', str(threads)])
+            cmd.extend(_output_args(output_video))
+            cmd.append(output_video)
+        return cmd
+
+    print(f"\nGenerating {len(jobs)} short video(s) in a single ffmpeg run...")
+    if not _run_with_encoder_fallback(build_cmd, hwenc):
+        return False
+
+    for _, _, output_video in jobs:
+        print(f"✓ Short video generated: {output_video}")
+    return True
+
+
+def build_short_filtergraph(
+    scenes: List[Dict[str, str]],
+    width: int,
+    height: int,
+    overlay_settings: Optional[Dict[str, object]] = None,
+    with_audio: bool = True
+) -> str:
+    """
+    複数シーンをtrimで切り出して連結し、縦型に整えるfilter_complexを構築
+
+    出力ラベルは映像が [out_v]、音声が [out_a]（with_audio時のみ）。
+
+    Args:
+        scenes: {'start': ..., 'end': ...} のリスト
+        width: 元動画の幅
+        height: 元動画の高さ
+        overlay_settings: 上下テキストやスタイル設定
+        with_audio: 音声も切り出して連結するか
+
+    Returns:
+        filter_complex文字列
+    """
+    parts = []
+    concat_inputs = []
+    for i, scene in enumerate(scenes):
+        start = parse_time_to_seconds(scene['start'])
+        end = parse_time_to_seconds(scene['end'])
+        parts.append(f"[0:v]trim=start={start}:end={end},setpts=PTS-STARTPTS[v{i}]")
+        concat_inputs.append(f"[v{i}]")
+        if with_audio:
+            parts.append(f"[0:a]atrim=start={start}:end={end},asetpts=PTS-STARTPTS[a{i}]")
+            concat_inputs.append(f"[a{i}]")
+
+    # 上下テキストは全シーン共通なので、連結後に1回だけ描画する
+    audio_count = 1 if with_audio else 0
+    audio_label = "[out_a]" if with_audio else ""
+    parts.append(f"{''.join(concat_inputs)}concat=n={len(scenes)}:v=1:a={audio_count}[cat_v]{audio_label}")
+    parts.append(f"[cat_v]{build_short_filter_chain(width, height, overlay_settings) or 'null'}[out_v]")
+    return ";".join(parts)
+
+
+def _copy_scenes_with_concat(input_video: str, output_video: str, scenes: List[Dict[str, str]]) -> bool:
+    """
+    複数シーンを再エンコードせず、1回のFFmpeg実行で切り出して連結する
+
+    concatデマルチプレクサに同じ入力を inpoint / outpoint 付きで並べる。
+    各シーンの開始位置がキーフレーム上にある場合だけ正確に切り出せる。
+
+    Args:
+        input_video: 入力動画ファイルのパス
+        output_video: 出力動画ファイルのパス
+        scenes: {'start': ..., 'end': ...} のリスト
+
+    Returns:
+        成功した場合True
+    """
+    path = os.path.abspath(input_video).replace("'", "'\\''")
+    entries = []
+    for scene in scenes:
+        start = parse_time_to_seconds(scene['start'])
+        duration = _scene_duration(input_video, scene['start'], scene['end'])
+        if duration is None:
+            return False
+        entries.append(f"file '{path}'\ninpoint {start:.3f}\noutpoint {start + duration:.3f}\n")
+
+    # 連結リストは一時ファイルに書かず、標準入力から渡す
+    cmd = [
+        'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+        '-f', 'concat',
+        '-safe', '0',
+        '-protocol_whitelist', 'file,pipe',
+        '-i', 'pipe:0',
+        '-map', '0:v:0', '-map', '0:a:0?',
+        '-c', 'copy',
+        *_output_args(output_video),
+        output_video
+    ]
+    result = subprocess.run(
+        cmd,
+        input=''.join(entries).encode('utf-8'),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    return result.returncode == 0
+
+
+def generate_multi_scene_short(
+    input_video: str,
+    output_video: str,
+    scenes: List[Dict[str, str]],
+    overlay_settings: Optional[Dict[str, object]] = None,
+    hwenc: Optional[str] = None,
+    threads: Optional[int] = None
+) -> bool:
+    """
+    複数シーンのショート動画を1回のFFmpeg実行で生成
+
+    シーンごとに中間ファイルを作って連結する方式と比べ、入力のデコードと
+    エンコードが1回ずつで済む。
+
+    Args:
+        input_video: 入力動画ファイルのパス（final.mp4）
+        output_video: 出力動画ファイルのパス
+        scenes: {'start': ..., 'end': ...} のリスト
+        overlay_settings: 上下テキストやスタイル設定
+        hwenc: ハードウェアエンコーダ名（detect_hw_encoder の戻り値、失敗時はlibx264）
+        threads: FFmpegのスレッド数（他のFFmpegと同時に動かす場合に指定、Noneで自動）
+
+    Returns:
+        成功した場合True
+    """
+    script_path = None
+    try:
+        width, height, has_audio = probe_input_video(input_video)
+        if any(_scene_duration(input_video, scene['start'], scene['end']) is None for scene in scenes):
+            return False
+        print(f"\nInput: {input_video}")
+        print(f"  Size: {width}x{height}")
+        print(f"Output: {output_video}")
+        print(f"  Size: 1080x1920 (vertical), {len(scenes)} scenes in one pass")
+
+        # 変換が不要で全シーンがキーフレームから始まるなら、再エンコードせず切り出して連結する
+        if not build_short_filter_chain(width, height, overlay_settings) and all(
+            _starts_on_keyframe(input_video, scene['start']) for scene in scenes
+        ):
+            if _copy_scenes_with_concat(input_video, output_video, scenes):
+                print(f"✓ Short video generated (stream copy): {output_video}")
+                return True
+
+        filtergraph = build_short_filtergraph(
+            scenes, width, height, overlay_settings, with_audio=has_audio
+        )
+        if len(filtergraph) > _FILTER_SCRIPT_THRESHOLD:
+            # シーンが多いとフィルターグラフが長くなり、コマンドラインの長さ制限に当たるためファイルで渡す
+            fd, script_path = tempfile.mkstemp(suffix='.filter')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(filtergraph)
+            graph_args = ['-filter_complex_script', script_path]
+        else:
+            graph_args = ['-filter_complex', filtergraph]
+
+        def build_cmd(encoder: Optional[str]) -> List[str]:
+            cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error']
+            cmd.extend(_filter_thread_args(threads))
+            cmd.extend(_hwaccel_input_args(encoder))
+            cmd.extend(['-i', input_video, *graph_args, '-map', '[out_v]'])
+            if has_audio:
+                cmd.extend(['-map', '[out_a]'])
+            cmd.extend(_video_encoder_args(encoder))
+            cmd.extend(['-c:a', 'aac', '-b:a', '128k'])
+            if threads:
+                cmd.extend(['-threads', str(threads)])
+            cmd.extend(_output_args(output_video))
+            cmd.append(output_video)
+            return cmd
+
+        if not _run_with_encoder_fallback(build_cmd, hwenc):
+            return False
+
+        print(f"✓ Short video generated: {output_video}")
+        return True
+
+    except Exception as e:
+        print(f"✗ Error generating short video: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if script_path:
+            try:
+                os.remove(script_path)
+            except FileNotFoundError:
+                pass